@@ -1,2 +1,3 @@
 from .build import *
+from .diagnostic import *
 from .run import *
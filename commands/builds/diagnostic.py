@@ -0,0 +1,42 @@
+import sublime
+import sublime_plugin
+from ...core import (
+    BuildSystem,
+    StatusManager
+)
+
+
+class JavatarNextDiagnosticCommand(sublime_plugin.WindowCommand):
+
+    """
+    A command to go to the next diagnostic from the recent build
+    """
+
+    def run(self, severity=None):
+        """
+        Go to the next diagnostic after the cursor in the current file
+
+        @param severity: a severity of diagnostics to go to (error, warning
+            or note), or None for all diagnostics
+        """
+        file_path = None
+        line = 0
+        view = self.window.active_view()
+        if view and view.file_name() and view.sel():
+            file_path = view.file_name()
+            line = view.rowcol(view.sel()[0].begin())[0] + 1
+        diagnostic = BuildSystem().diagnostics.get_next_diagnostic(
+            file_path, line, severity
+        )
+        if not diagnostic:
+            StatusManager().show_status("No build diagnostic", target="build")
+            return
+        self.window.open_file(
+            "%s:%s:%s" % (
+                diagnostic["file"],
+                diagnostic["line"],
+                diagnostic["column"] or 1
+            ),
+            sublime.ENCODED_POSITION
+        )
+        StatusManager().show_status(diagnostic["message"], target="build")
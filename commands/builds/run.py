@@ -7,12 +7,11 @@ from ...core import (
     DependencyManager,
     GenericShell,
     JavaUtils,
-    JavaStructure,
     JDKManager,
     Logger,
     Macro,
+    MainClassIndex,
     MultiThreadProgress,
-    RE,
     Settings,
     StateProperty
 )
@@ -57,27 +56,16 @@ class JavatarRunCommand(sublime_plugin.WindowCommand):
         if not failed:
             self.run(skip_build=True)
 
-    def get_runnable_files(self, dir_path=None):
+    def get_runnable_files(self, dir_paths=None):
         """
-        Returns a list of runnable file paths in specified directory and its
-            sub-directory
+        Returns a list of runnable file paths in specified directories and
+            its sub-directories
 
-        @param dir_path: a directory path
+        @param dir_paths: a list of directory paths
         """
-        if not dir_path:
+        if not dir_paths:
             return []
-        files = []
-        for name in os.listdir(dir_path):
-            path_name = os.path.join(dir_path, name)
-            if (os.path.isdir(path_name) and
-                    name not in Settings().get_sublime(
-                        "folder_exclude_patterns", []
-                    )):
-                files += self.get_runnable_files(path_name)
-            elif (os.path.isfile(path_name) and
-                    self.is_main_class(path_name)):
-                files.append(path_name)
-        return files
+        return MainClassIndex().get_main_files(dir_paths)
 
     def is_main_class(self, file_path):
         """
@@ -85,20 +73,7 @@ class JavatarRunCommand(sublime_plugin.WindowCommand):
 
         @param file_path: a file path to be validated
         """
-        if not StateProperty().is_java(file_path):
-            return False
-
-        for cl in JavaStructure().classes_in_file(file_path):
-            for method in JavaStructure().methods_in_class(cl):
-                if method["name"] != "main":
-                    continue
-                elif len(method["params"]) != 1:
-                    continue
-                elif not RE().get("string_type_match", "^String\\b").search(
-                        method["params"][0]["type"]):
-                    continue
-                return True
-        return False
+        return MainClassIndex().is_main_class(file_path)
 
     def trim_extension(self, file_path):
         """
@@ -244,10 +219,10 @@ class JavatarRunCommand(sublime_plugin.WindowCommand):
                 self.run_program(self.window.active_view().file_name())
                 return
 
-        self.runnable_files = []
         # Check the whole project
-        for source_folder in StateProperty().get_source_folders():
-            self.runnable_files += self.get_runnable_files(source_folder)
+        self.runnable_files = self.get_runnable_files(
+            StateProperty().get_source_folders()
+        )
         if len(self.runnable_files) > 1:
             self.window.show_quick_panel(
                 [
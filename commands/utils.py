@@ -3,7 +3,6 @@ import sublime_plugin
 import sys
 from imp import reload
 import hashlib
-from ..parser.GrammarParser import GrammarParser
 from ..core import (
     ActionHistory,
     JavaStructure,
@@ -42,7 +41,7 @@ class JavatarUtilsCommand(sublime_plugin.TextCommand):
         @param edit: edit object from Sublime Text buffer
         @param util_type: utility selector
         @param text: text to be used with edit object
-        @param region: replace region (use with replace utility)
+        @param region: replace region (use with replace and erase utility)
         @param dest: command description (use on dest method)
         """
         if util_type == "insert":
@@ -53,6 +52,10 @@ class JavatarUtilsCommand(sublime_plugin.TextCommand):
             if isinstance(region, list) or isinstance(region, tuple):
                 region = sublime.Region(region[0], region[1])
             self.view.replace(edit, region, text)
+        elif util_type == "erase":
+            if isinstance(region, list) or isinstance(region, tuple):
+                region = sublime.Region(region[0], region[1])
+            self.view.erase(edit, region)
         elif util_type == "clear":
             self.view.erase(edit, sublime.Region(0, self.view.size()))
         elif util_type == "set_read_only":
@@ -132,9 +135,7 @@ class JavatarUtilsCommand(sublime_plugin.TextCommand):
         @param selector: scope selector (refer to GrammarParser's selector)
         """
         try:
-            scope = GrammarParser(sublime.decode_value(sublime.load_resource(
-                "Packages/Javatar/grammars/Java8.javatar-grammar"
-            )))
+            scope = JavaStructure().create_parser()
             parse_output = scope.parse_grammar(self.view.substr(
                 sublime.Region(0, self.view.size())
             ))
@@ -1,18 +1,31 @@
 from .action_history import *
+from .artifact_registry import *
 from .browse_dialog import *
+from .build_cache import *
+from .build_fingerprint import *
 from .build_system import *
+from .class_path_scanner import *
+from .compile_server import *
+from .dependency_graph import *
 from .dependency_manager import *
+from .diagnostic_parser import *
 from .dict import *
 from .event_handler import *
+from .file_discovery import *
 from .generic_shell import *
+from .helper_server import *
 from .helper_service import *
 from .java_structure import *
 from .java_utils import *
 from. jdk_manager import *
+from .jdk_probe import *
 from .json_panel import *
 from .logger import *
 from .macro import *
+from .main_class_index import *
 from .plugin_manager import *
+from .process_runner import *
+from .project_index import *
 from .project_restoration import *
 from .regex import *
 from .settings import *
@@ -0,0 +1,74 @@
+import hashlib
+import os
+import threading
+
+
+class _ArtifactRegistry:
+
+    """
+    A registry of file digests which will be reused until the file's
+        size or modification time has been changed
+    """
+
+    @classmethod
+    def instance(cls):
+        if not hasattr(cls, "_instance"):
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all recorded artifacts
+        """
+        with self.lock:
+            # File path -> {"size": size, "mtime": mtime, "digest": digest}
+            self.artifacts = {}
+
+    def get_digest(self, path):
+        """
+        Returns a SHA-256 digest of a specified file, or None if the file
+            cannot be read
+
+        File will be read only when it is not recorded or it has been changed
+
+        @param path: a path to the file
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self.lock:
+            artifact = self.artifacts.get(path)
+            if (artifact and artifact["size"] == stat.st_size and
+                    artifact["mtime"] == stat.st_mtime):
+                return artifact["digest"]
+        try:
+            artifact_file = open(path, "rb")
+            digest = hashlib.sha256(artifact_file.read()).hexdigest()
+            artifact_file.close()
+        except OSError:
+            return None
+        with self.lock:
+            self.artifacts[path] = {
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                "digest": digest
+            }
+        return digest
+
+    def is_verified(self, path, digest):
+        """
+        Returns whether a specified file has a specified digest
+
+        @param path: a path to the file
+        @param digest: an expected SHA-256 digest
+        """
+        return self.get_digest(path) == digest
+
+
+def ArtifactRegistry():
+    return _ArtifactRegistry.instance()
@@ -0,0 +1,74 @@
+import os
+import threading
+from .state_property import StateProperty
+
+
+class BuildCache:
+
+    """
+    An in-memory build cache which will be loaded once and written back
+        to the cache file on flush
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cache = StateProperty().load_cache()
+        self.changed = False
+
+    def get_section(self, name):
+        """
+        Returns a dict stored in the build cache under a specified name
+
+        Modifications to the returned dict must be followed by mark_changed
+
+        @param name: a section name
+        """
+        with self.lock:
+            if name not in self.cache:
+                self.cache[name] = {}
+            return self.cache[name]
+
+    def get_build_durations(self):
+        """
+        Returns a dict of file path and its recent build duration in seconds
+        """
+        with self.lock:
+            return dict(self.cache.get("build_durations", {}))
+
+    def set_build_duration(self, file_path, duration):
+        """
+        Records a build duration of a specified file
+
+        @param file_path: a file path
+        @param duration: a build duration in seconds
+        """
+        with self.lock:
+            if "build_durations" not in self.cache:
+                self.cache["build_durations"] = {}
+            self.cache["build_durations"][file_path] = duration
+            self.changed = True
+
+    def remove_missing_build_durations(self):
+        """
+        Removes build durations of files which are no longer exists
+        """
+        with self.lock:
+            durations = self.cache.get("build_durations", {})
+            for file_path in list(durations):
+                if not os.path.exists(file_path):
+                    del durations[file_path]
+                    self.changed = True
+
+    def mark_changed(self):
+        with self.lock:
+            self.changed = True
+
+    def flush(self):
+        """
+        Writes the build cache to the cache file if it has been changed
+        """
+        with self.lock:
+            if not self.changed:
+                return
+            StateProperty().save_cache(self.cache)
+            self.changed = False
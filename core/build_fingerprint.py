@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import threading
+from .artifact_registry import ArtifactRegistry
+
+
+class BuildFingerprint:
+
+    """
+    Build fingerprints of Java source files, stored within a build cache
+
+    A fingerprint is made from a source digest and a build environment
+        digest (compiler, build arguments and dependencies), a file only
+        needs to be built when its fingerprint is changed or its class file
+        is missing
+    """
+
+    SECTION = "build_fingerprints"
+
+    def __init__(self, build_cache, environment=None, output_location=None):
+        """
+        @param build_cache: a build cache to store the fingerprints
+        @param environment: a dict of build settings which affect the
+            build outputs
+        @param output_location: a build output location, or None if class
+            files are placed next to the source files
+        """
+        self.build_cache = build_cache
+        self.environment = self.get_environment_digest(environment or {})
+        self.output_location = output_location
+        self.lock = threading.Lock()
+        # Class path -> {
+        #     "mtime": mtime, "size": size, "digest": source digest,
+        #     "environment": environment digest
+        # }
+        self.fingerprints = build_cache.get_section(self.SECTION)
+
+    def get_environment_digest(self, environment):
+        """
+        Returns a digest of a specified build environment
+
+        Files in "dependencies" will be identified by its digest
+
+        @param environment: a dict of build settings
+        """
+        environment = dict(environment)
+        dependencies = []
+        for dependency in environment.get("dependencies", []):
+            if os.path.isfile(dependency):
+                dependencies.append(
+                    [dependency, ArtifactRegistry().get_digest(dependency)]
+                )
+            else:
+                dependencies.append([dependency, None])
+        environment["dependencies"] = dependencies
+        return hashlib.sha256(
+            json.dumps(environment, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def get_class_file(self, file_path, class_path):
+        """
+        Returns a path to a class file of a specified source file
+
+        @param file_path: a Java file path
+        @param class_path: a full class path of the file
+        """
+        if self.output_location:
+            return os.path.join(
+                self.output_location, *class_path.split(".")
+            ) + ".class"
+        return os.path.splitext(file_path)[0] + ".class"
+
+    def is_changed(self, file_path, class_path):
+        """
+        Returns whether a specified file needs to be built or not
+
+        Source file will be read only when its size or modification time
+            has been changed
+
+        @param file_path: a Java file path
+        @param class_path: a full class path of the file
+        """
+        with self.lock:
+            fingerprint = self.fingerprints.get(class_path)
+        if (not fingerprint or
+                fingerprint["environment"] != self.environment or
+                not os.path.isfile(self.get_class_file(file_path, class_path))):
+            return True
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return True
+        if (fingerprint["mtime"] == stat.st_mtime and
+                fingerprint["size"] == stat.st_size):
+            return False
+        if ArtifactRegistry().get_digest(file_path) != fingerprint["digest"]:
+            return True
+        # Touched but unchanged, skip the digest on the next check
+        self.update(file_path, class_path)
+        return False
+
+    def update(self, file_path, class_path):
+        """
+        Records a fingerprint of a specified file which has been built
+
+        @param file_path: a Java file path
+        @param class_path: a full class path of the file
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        digest = ArtifactRegistry().get_digest(file_path)
+        with self.lock:
+            self.fingerprints[class_path] = {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "digest": digest,
+                "environment": self.environment
+            }
+        self.build_cache.mark_changed()
+
+    def remove(self, class_path):
+        """
+        Forgets a fingerprint of a specified class so it will be built again
+            in the next build
+
+        @param class_path: a full class path
+        """
+        with self.lock:
+            if class_path not in self.fingerprints:
+                return
+            del self.fingerprints[class_path]
+        self.build_cache.mark_changed()
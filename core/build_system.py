@@ -1,20 +1,284 @@
 import sublime
+import heapq
+import json
 import os
+import queue
+import threading
 import time
 import math
+from contextlib import contextmanager
 from .action_history import ActionHistory
+from .build_cache import BuildCache
+from .build_fingerprint import BuildFingerprint
+from .dependency_graph import DependencyGraph
+from .diagnostic_parser import DiagnosticIndex
+from .file_discovery import FileDiscovery
 from .java_utils import JavaUtils
 from .settings import Settings
-from .state_property import StateProperty
 from .status_manager import StatusManager
 from .thread_progress import MultiThreadProgress
 
 
+class BuildScheduler:
+
+    """
+    A bounded pool of builder threads which build the queued file batches
+    """
+
+    def __init__(self, controller, batches, max_workers=1, macro_data=None):
+        """
+        @param controller: a build system to report the batch results to
+        @param batches: a list of file path lists to be built
+        @param max_workers: a maximum number of concurrent builder threads
+        @param macro_data: a macro data to pass to the builders
+        """
+        from ..threads import BuilderThread
+        self.controller = controller
+        self.batches = queue.Queue()
+        for batch in batches:
+            self.batches.put(batch)
+        self.cancelled = threading.Event()
+        self.workers = [
+            BuilderThread(self, macro_data, index)
+            for index in range(max(1, min(max_workers, len(batches))))
+        ]
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+
+    def next_batch(self):
+        """
+        Returns a next file batch to be built, or None if there is no batch
+            left or the build has been cancelled
+        """
+        if self.cancelled.is_set():
+            return None
+        try:
+            return self.batches.get_nowait()
+        except queue.Empty:
+            return None
+
+    def on_batch_complete(self, files, elapse_time, data, ret):
+        """
+        A callback for the builder thread when a file batch has been built
+
+        @param files: a list of built file paths
+        @param elapse_time: a total time to build the files
+        @param data: a returned data from the process
+        @param ret: a return code from the process
+        """
+        self.controller.on_builder_complete(
+            len(files), elapse_time, data, ret, files
+        )
+
+    def on_batch_output(self, files, records):
+        """
+        A callback for the builder thread when the build output is parsed
+
+        @param files: a list of file paths being built
+        @param records: a list of diagnostic records
+        """
+        if self.cancelled.is_set():
+            return
+        self.controller.on_builder_output(records, files)
+
+    def cancel(self):
+        """
+        Stops all builder threads and its running processes
+        """
+        self.cancelled.set()
+        for worker in self.workers:
+            worker.cancel()
+
+
+class BuildPartitioner:
+
+    """
+    Partitions source files into build batches with similar build durations
+        while keeping the files in the same package together
+    """
+
+    def __init__(self, durations=None):
+        """
+        @param durations: a dict of file path and its recent build duration
+        """
+        self.durations = durations or {}
+
+    def get_costs(self, files):
+        """
+        Returns a dict of file path and its estimated build duration
+
+        Files without build duration will be estimated from its size
+
+        @param files: a list of file paths
+        """
+        sizes = {}
+        for file_path in files:
+            try:
+                sizes[file_path] = os.path.getsize(file_path)
+            except OSError:
+                sizes[file_path] = 0
+        known_files = [
+            file_path for file_path in files if file_path in self.durations
+        ]
+        known_size = sum(sizes[file_path] for file_path in known_files)
+        rate = None
+        if known_size > 0:
+            rate = sum(
+                self.durations[file_path] for file_path in known_files
+            ) / known_size
+        costs = {}
+        for file_path in files:
+            if file_path in self.durations:
+                costs[file_path] = self.durations[file_path]
+            elif rate is not None:
+                costs[file_path] = sizes[file_path] * rate
+            else:
+                costs[file_path] = sizes[file_path]
+        return costs
+
+    def partition(self, files, total_batches):
+        """
+        Returns a list of file batches, longest batch first
+
+        @param files: a list of file paths
+        @param total_batches: a maximum number of batches
+        """
+        if not files:
+            return []
+        total_batches = max(1, min(total_batches, len(files)))
+        costs = self.get_costs(files)
+        target_cost = sum(costs.values()) / total_batches
+
+        packages = {}
+        for file_path in files:
+            package = os.path.dirname(file_path)
+            if package in packages:
+                packages[package].append(file_path)
+            else:
+                packages[package] = [file_path]
+
+        # Split only the packages that are too large for one batch
+        chunks = []
+        for package_files in packages.values():
+            chunk = []
+            chunk_cost = 0
+            for file_path in package_files:
+                if chunk and chunk_cost + costs[file_path] > target_cost:
+                    chunks.append((chunk_cost, chunk))
+                    chunk = []
+                    chunk_cost = 0
+                chunk.append(file_path)
+                chunk_cost += costs[file_path]
+            chunks.append((chunk_cost, chunk))
+
+        # Longest chunk first into the shortest batch
+        chunks.sort(key=lambda chunk: chunk[0], reverse=True)
+        batches = [(0, index, []) for index in range(total_batches)]
+        for chunk_cost, chunk in chunks:
+            batch_cost, index, batch = heapq.heappop(batches)
+            heapq.heappush(
+                batches, (batch_cost + chunk_cost, index, batch + chunk)
+            )
+        batches.sort(key=lambda batch: batch[0], reverse=True)
+        return [batch for _, _, batch in batches if batch]
+
+
+class BuildTelemetry:
+
+    """
+    A recorder of build phase timings which can be written as a build
+        report in JSON lines format
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.start_time = time.time()
+        self.build_id = "%.6f" % (self.start_time)
+        self.events = []
+        # Phase -> {"count": count, "elapse_time": total elapse time}
+        self.phases = {}
+
+    @contextmanager
+    def measure(self, phase, **data):
+        """
+        Records an elapse time of the code block as a specified phase
+
+        @param phase: a phase name
+        @param data: an additional data to record
+        """
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.add_event(phase, time.time() - start_time, **data)
+
+    def add_event(self, phase, elapse_time, **data):
+        """
+        Records an elapse time of a specified phase
+
+        @param phase: a phase name
+        @param elapse_time: an elapse time of the phase
+        @param data: an additional data to record
+        """
+        event = dict(data)
+        event["phase"] = phase
+        event["elapse_time"] = elapse_time
+        with self.lock:
+            self.events.append(event)
+            if phase not in self.phases:
+                self.phases[phase] = {"count": 0, "elapse_time": 0}
+            self.phases[phase]["count"] += 1
+            self.phases[phase]["elapse_time"] += elapse_time
+
+    def get_summary(self, **data):
+        """
+        Returns a summary of the build
+
+        @param data: an additional data to include in the summary
+        """
+        summary = dict(data)
+        with self.lock:
+            summary["phase"] = "build"
+            summary["elapse_time"] = time.time() - self.start_time
+            summary["phases"] = {
+                phase: dict(totals)
+                for phase, totals in self.phases.items()
+            }
+        return summary
+
+    def write_report(self, report_path, **data):
+        """
+        Appends all recorded events and a build summary to a report file,
+            one JSON object per line
+
+        @param report_path: a path to the report file
+        @param data: an additional data to include in the summary
+        """
+        summary = self.get_summary(**data)
+        with self.lock:
+            events = self.events + [summary]
+        report_dir = os.path.dirname(report_path)
+        if report_dir and not os.path.isdir(report_dir):
+            os.makedirs(report_dir)
+        with open(report_path, "a") as report_file:
+            for event in events:
+                event = dict(event)
+                event["build"] = self.build_id
+                report_file.write(json.dumps(event, sort_keys=True) + "\n")
+
+
 class _BuildSystem:
     """
     A multi-thread build system
     """
 
+    RESULT_FILE_REGEX = (
+        "^(.+?):([0-9]+):(?:([0-9]+):)?" +
+        "\\s*(?:error|warning|note):\\s*(.*)$"
+    )
+
     @classmethod
     def instance(cls):
         if not hasattr(cls, "_instance"):
@@ -23,6 +287,8 @@ class _BuildSystem:
 
     def __init__(self):
         self.log_view = None
+        self.log_lock = threading.Lock()
+        self.diagnostics = DiagnosticIndex()
         self.reset()
 
     def reset(self):
@@ -31,26 +297,108 @@ class _BuildSystem:
         """
         self.failed = False
         self.building = False
-        self.builders = []
+        self.scheduler = None
         self.create_log = False
         self.finish_callback = None
         self.cancel_callback = None
+        self.build_cache = None
+        self.build_fingerprint = None
+        self.telemetry = None
+        self.total_progress = 0
 
-    def create_builder(self, files=None, macro_data=None):
+    def get_build_cache(self):
         """
-        Creates and run a builder thread for specified files
+        Returns a build cache of current build, load it if not loaded
+        """
+        if not self.build_cache:
+            self.build_cache = BuildCache()
+        return self.build_cache
 
-        @param files: a list of file paths
+    def get_build_fingerprint(self):
         """
-        if not files:
+        Returns build fingerprints of current build environment
+        """
+        if not self.build_fingerprint:
+            from .dependency_manager import DependencyManager
+            from .jdk_manager import JDKManager
+            from .macro import Macro
+            from .state_property import StateProperty
+            executable = JDKManager().get_executable("build")
+            executable_time = None
+            if executable and os.path.exists(executable):
+                executable_time = os.path.getmtime(executable)
+            output_location = Macro().parse(
+                Settings().get("build_output_location")
+            )
+            self.build_fingerprint = BuildFingerprint(
+                self.get_build_cache(),
+                environment={
+                    "executable": [executable, executable_time],
+                    "build_arguments": Settings().get("build_arguments", ""),
+                    "output_location": output_location,
+                    "source_folders": StateProperty().get_source_folders(),
+                    "dependencies": [
+                        dependency[0]
+                        for dependency
+                        in DependencyManager().get_dependencies()
+                    ]
+                },
+                output_location=output_location or None
+            )
+        return self.build_fingerprint
+
+    def get_telemetry(self):
+        """
+        Returns a telemetry of current build, create one if not created
+        """
+        if not self.telemetry:
+            self.telemetry = BuildTelemetry()
+        return self.telemetry
+
+    def write_build_report(self, status):
+        """
+        Writes a build report of current build if build report is enabled
+
+        @param status: a build status
+        """
+        from .logger import Logger
+        from .macro import Macro
+        report_path = Macro().parse(Settings().get("build_report_location"))
+        if not report_path or not self.telemetry:
             return
-        from ..threads import BuilderThread
-        macro_data = macro_data or {}
-        builder = BuilderThread(self, files, macro_data, files)
-        self.progress.add(builder, "")
+        try:
+            self.telemetry.write_report(
+                report_path,
+                status=status,
+                files=self.total_progress
+            )
+        except OSError as e:
+            Logger().warning("Build report cannot be written: %s" % (e))
+
+    def flush_build_cache(self):
+        """
+        Writes the build cache of current build to the cache file
+        """
+        if self.build_cache:
+            self.build_cache.flush()
+
+    def create_scheduler(self, batches, macro_data=None):
+        """
+        Creates and run a build scheduler for specified file batches
+
+        @param batches: a list of file path lists
+        """
+        self.scheduler = BuildScheduler(
+            self,
+            batches,
+            max_workers=Settings().get("builder_threads", 1),
+            macro_data=macro_data
+        )
+        for worker in self.scheduler.workers:
+            self.progress.add(worker, "")
+        self.scheduler.start()
         if not self.progress.running:
             self.progress.run()
-        self.builders.append(builder)
 
     def on_builder_complete(self, total_files, elapse_time, data, ret, params):
         """
@@ -67,8 +415,17 @@ class _BuildSystem:
         ):
             self.cancel_build()
             return
+        self.get_telemetry().add_event(
+            "compile",
+            elapse_time,
+            files=total_files,
+            output_size=len(data) if data else 0,
+            return_code=ret
+        )
+        self.record_durations(params, elapse_time)
         if ret != 0:
             self.failed = True
+            self.remove_cache_for_files(params)
         else:
             self.update_cache_for_files(params)
         self.current_progress += total_files
@@ -79,7 +436,35 @@ class _BuildSystem:
             self.current_progress * 100 / self.total_progress
         ))
 
-        if data:
+    def on_builder_output(self, records, files):
+        """
+        A callback for the builder thread when the build output is parsed
+
+        @param records: a list of diagnostic records
+        @param files: a list of file paths being built
+        """
+        if self.create_log and (
+            not self.log_view or not self.log_view.id()
+        ):
+            self.cancel_build()
+            return
+        for record in records:
+            self.diagnostics.add(record)
+        self.add_log("".join(record["text"] for record in records))
+
+    def add_log(self, text):
+        """
+        Appends a text to the build log, creates a build log if needed
+
+        @param text: a text to append
+        """
+        if not text:
+            return
+        with self.get_telemetry().measure("log_rendering"):
+            self.render_log(text)
+
+    def render_log(self, text):
+        with self.log_lock:
             if not self.create_log and not self.log_view:
                 target_group, target_index = Settings().get_view_index(
                     "build_log_target_group"
@@ -95,19 +480,23 @@ class _BuildSystem:
                 self.log_view.set_syntax_file(
                     "Packages/Javatar/syntax/JavaCompilationError.tmLanguage"
                 )
+                self.log_view.settings().set(
+                    "result_file_regex", self.RESULT_FILE_REGEX
+                )
                 # Prevent view access while creating which cause
                 #    double view to create
                 time.sleep(Settings().get("build_log_delay"))
-            self.log_view.set_scratch(True)
-            self.log_view.run_command("javatar_utils", {
-                "util_type": "add",
-                "text": data
-            })
+        self.log_view.set_scratch(True)
+        self.log_view.run_command("javatar_utils", {
+            "util_type": "add",
+            "text": text
+        })
 
     def on_build_complete(self):
         """
         A callback when the build process is finish
         """
+        self.flush_build_cache()
         if self.create_log and (
             not self.log_view or not self.log_view.id()
         ):
@@ -117,16 +506,20 @@ class _BuildSystem:
                 "javatar.core.build_system.on_build_complete",
                 "Building Cancelled"
             )
+            self.write_build_report("cancelled")
             if self.cancel_callback:
                 self.cancel_callback()
             return
 
         if self.failed:
             message = "Building Failed [{0:.2f}s]"
+            self.write_build_report("failed")
         elif self.create_log:
             message = "Building Finished with Warning [{0:.2f}s]"
+            self.write_build_report("warning")
         else:
             message = "Building Finished [{0:.2f}s]"
+            self.write_build_report("success")
 
         time_diff = time.time() - self.start_time
         StatusManager().show_notification(message.format(time_diff))
@@ -148,8 +541,8 @@ class _BuildSystem:
         """
         if not self.building:
             return
-        for builder in self.builders:
-            builder.cancel()
+        if self.scheduler:
+            self.scheduler.cancel()
         self.building = False
 
     def trim_extension(self, file_path):
@@ -164,44 +557,107 @@ class _BuildSystem:
                 return file_path[:-len(ext)]
         return file_path
 
+    def get_class_path(self, file_path):
+        """
+        Returns a full class path of the specified file
+
+        @param file_path: a Java file path
+        """
+        return JavaUtils().to_package(
+            self.trim_extension(file_path)
+        ).as_class_path()
+
     def update_cache_for_files(self, files):
+        """
+        Records fingerprints of the specified files which have been built
+
+        @param files: a list of file paths
+        """
         if Settings().get("always_rebuild"):
             return
-        cache = StateProperty().load_cache()
-        if "build_cache" not in cache:
-            cache["build_cache"] = {}
+        build_fingerprint = self.get_build_fingerprint()
+        for file_path in files:
+            build_fingerprint.update(file_path, self.get_class_path(file_path))
+
+    def record_durations(self, files, elapse_time):
+        """
+        Records build duration of each file by its size
+
+        @param files: a list of built file paths
+        @param elapse_time: a total time to build the files
+        """
+        sizes = {}
+        for file_path in files:
+            try:
+                sizes[file_path] = os.path.getsize(file_path)
+            except OSError:
+                sizes[file_path] = 0
+        total_size = sum(sizes.values())
+        build_cache = self.get_build_cache()
         for file_path in files:
-            modified_time = int(os.path.getmtime(file_path))
-            full_class_path = JavaUtils().to_package(
-                self.trim_extension(file_path)
-            ).as_class_path()
-            cache["build_cache"][full_class_path] = modified_time
-        StateProperty().save_cache(cache)
+            if total_size > 0:
+                duration = elapse_time * sizes[file_path] / total_size
+            else:
+                duration = elapse_time / len(files)
+            build_cache.set_build_duration(file_path, duration)
+
+    def remove_cache_for_files(self, files):
+        """
+        Forgets the specified files in the build cache so they will be built
+            again in the next build
+
+        @param files: a list of file paths
+        """
+        build_fingerprint = self.get_build_fingerprint()
+        for file_path in files:
+            build_fingerprint.remove(self.get_class_path(file_path))
+
+    def get_files_to_build(self, files):
+        """
+        Returns a list of changed files and the files that depend on them
+
+        @param files: a list of file paths
+        """
+        changed_files = [
+            file_path
+            for file_path in files
+            if self.is_file_changed(file_path)
+        ]
+        if not Settings().get("incremental_build"):
+            return changed_files
+        graph = DependencyGraph(self.get_build_cache())
+        for file_path in files:
+            graph.update_file(file_path, self.get_class_path(file_path))
+        changed_class_paths = graph.remove_missing_files() + [
+            graph.files[file_path]["class_path"]
+            for file_path in changed_files
+        ]
+        dependents = graph.get_dependents(changed_class_paths)
+        return changed_files + [
+            file_path
+            for file_path in files
+            if file_path in dependents and file_path not in changed_files
+        ]
 
     def is_file_changed(self, file_path):
         """
-        Returns whether the specified file path has been modified or not
+        Returns whether the specified file path has to be built or not
 
         @param file_path: a file path to check (must exists)
         """
         if Settings().get("always_rebuild"):
             return True
-        modified_time = int(os.path.getmtime(file_path))
-        cache = StateProperty().load_cache()
-        if "build_cache" not in cache:
-            cache["build_cache"] = {}
-        full_class_path = JavaUtils().to_package(
-            self.trim_extension(file_path)
-        ).as_class_path()
-        if full_class_path not in cache["build_cache"]:
-            return True
-        return cache["build_cache"][full_class_path] != modified_time
+        return self.get_build_fingerprint().is_changed(
+            file_path, self.get_class_path(file_path)
+        )
 
-    def build_files(self, files=None, window=None):
+    def build_files(self, files=None, window=None, telemetry=None):
         """
         Calculate and assigns file paths to builder threads
 
         @param files: a list of file paths
+        @param telemetry: a telemetry to record the build to, or None to
+            create a new one
         """
         self.log_view = None
         self.window = window or sublime.active_window()
@@ -210,14 +666,15 @@ class _BuildSystem:
         if not files:
             return "No class to build"
         self.start_time = time.time()
+        self.diagnostics.clear()
+        self.build_cache = BuildCache()
+        self.telemetry = telemetry or BuildTelemetry()
         if not Settings().get("always_rebuild"):
-            files = [
-                file_path
-                for file_path in files
-                if self.is_file_changed(file_path)
-            ]
+            with self.telemetry.measure("change_detection", files=len(files)):
+                files = self.get_files_to_build(files)
             if not files:
                 self.on_build_complete()
+                return None
 
         from .jdk_manager import JDKManager
         macro_data = {}
@@ -233,9 +690,11 @@ class _BuildSystem:
         )
         self.current_progress = 0
         self.total_progress = len(files)
-        per_thread = math.ceil(
-            len(files) / Settings().get("builder_threads", 1)
-        )
+        batch_size = Settings().get("parallel_builds", 0)
+        if batch_size < 1:
+            total_batches = Settings().get("builder_threads", 1)
+        else:
+            total_batches = math.ceil(len(files) / batch_size)
         self.progress.set_message("Building %s of %s file%s... %.2f%%" % (
             self.current_progress,
             self.total_progress,
@@ -243,9 +702,12 @@ class _BuildSystem:
             self.current_progress * 100 / self.total_progress
             if self.total_progress > 0 else 0
         ))
-        while files:
-            self.create_builder(files[:per_thread], macro_data=macro_data)
-            files = files[per_thread:]
+        with self.telemetry.measure("batching"):
+            build_cache = self.get_build_cache()
+            build_cache.remove_missing_build_durations()
+            partitioner = BuildPartitioner(build_cache.get_build_durations())
+            batches = partitioner.partition(files, total_batches)
+        self.create_scheduler(batches, macro_data=macro_data)
         return None
 
     def build_dir(self, dir_path=None, window=None):
@@ -256,7 +718,10 @@ class _BuildSystem:
         """
         if not dir_path:
             return False
-        return self.build_files(self.get_files(dir_path), window=window)
+        telemetry = BuildTelemetry()
+        with telemetry.measure("discovery"):
+            files = self.get_files(dir_path)
+        return self.build_files(files, window=window, telemetry=telemetry)
 
     def build_dirs(self, dir_paths=None, window=None):
         """
@@ -266,12 +731,14 @@ class _BuildSystem:
         """
         if not dir_paths:
             return False
+        telemetry = BuildTelemetry()
         files = []
-        for dir_path in dir_paths:
-            files += self.get_files(dir_path)
+        with telemetry.measure("discovery"):
+            for dir_path in dir_paths:
+                files += self.get_files(dir_path)
         if not files:
             return False
-        return self.build_files(files, window=window)
+        return self.build_files(files, window=window, telemetry=telemetry)
 
     def get_files(self, dir_path=None):
         """
@@ -282,18 +749,7 @@ class _BuildSystem:
         """
         if not dir_path:
             return []
-        files = []
-        for name in os.listdir(dir_path):
-            path_name = os.path.join(dir_path, name)
-            if (os.path.isdir(path_name) and
-                    name not in Settings().get_sublime(
-                        "folder_exclude_patterns", []
-                    )):
-                files += self.get_files(path_name)
-            elif (os.path.isfile(path_name) and
-                    JavaUtils().is_java_file(path_name)):
-                files.append(path_name)
-        return files
+        return FileDiscovery().get_files(dir_path, JavaUtils().is_java_file)
 
 
 def BuildSystem():
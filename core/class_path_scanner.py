@@ -0,0 +1,210 @@
+import os
+import threading
+import zipfile
+from .dependency_manager import DependencyManager
+from .file_discovery import FileDiscovery
+from .logger import Logger
+from .settings import Settings
+
+
+class _ClassPathScanner:
+
+    """
+    A class path reader which lists classes from JAR files and class folders
+        without running a Java helper
+    """
+
+    @classmethod
+    def instance(cls):
+        if not hasattr(cls, "_instance"):
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all scanned class paths
+        """
+        with self.lock:
+            # Class path -> {"stamp": stamp, "classes": {name: class paths}}
+            self.class_paths = {}
+
+    def get_class_paths(self):
+        """
+        Returns a list of class paths (dependencies and Java runtime file)
+            to be scanned, or None if Java runtime file is not found
+        """
+        from .jdk_manager import JDKManager
+        runtime_path = JDKManager().get_runtime_file("runtime")
+        if not runtime_path:
+            return None
+        return [
+            dependency[0]
+            for dependency
+            in DependencyManager().get_dependencies()
+        ] + [runtime_path]
+
+    def to_class_path(self, entry_name):
+        """
+        Returns a class path from a class file entry, or None if the entry is
+            not a top-level class
+
+        @param entry_name: a slash-separated path to the class file
+        """
+        if not entry_name.endswith(".class"):
+            return None
+        names = entry_name[:-6].split("/")
+        if ("$" in names[-1] or "-" in names[-1] or
+                (names[0] == "META-INF" and len(names) > 1)):
+            return None
+        return ".".join(names)
+
+    def list_entries(self, class_path):
+        """
+        Returns a generator of class file entries in a specified class path
+
+        JAR files will be read from its central directory only
+
+        @param class_path: a path to JAR file or class folder
+        """
+        if os.path.isdir(class_path):
+            for root, dir_names, file_names in FileDiscovery().walk(
+                    class_path, exclude=False):
+                relative_dir = os.path.relpath(root, class_path)
+                for file_name in file_names:
+                    yield "/".join(
+                        [
+                            name
+                            for name in relative_dir.split(os.sep)
+                            if name != "."
+                        ] + [file_name]
+                    )
+        else:
+            jar_file = zipfile.ZipFile(class_path)
+            try:
+                for entry in jar_file.infolist():
+                    yield entry.filename
+            finally:
+                jar_file.close()
+
+    def get_stamp(self, class_path):
+        """
+        Returns a stamp which will be changed when a class is added or
+            removed from a specified class path
+
+        A class folder is stamped by the modification time of all of its
+            sub-directories, since adding a class to a package only changes
+            its own directory
+
+        @param class_path: a path to JAR file or class folder
+        """
+        if not os.path.isdir(class_path):
+            return os.path.getmtime(class_path)
+        return [
+            [current_dir, os.path.getmtime(current_dir)]
+            for current_dir, _, _ in FileDiscovery().walk(
+                class_path, exclude=False
+            )
+        ]
+
+    def scan_class_path(self, class_path):
+        """
+        Returns a dict of class name and a list of its class paths from
+            a specified class path, or None if it cannot be read
+
+        Results will be reused until the class path has been modified
+
+        @param class_path: a path to JAR file or class folder
+        """
+        try:
+            stamp = self.get_stamp(class_path)
+        except OSError:
+            return None
+        with self.lock:
+            cache = self.class_paths.get(class_path)
+            if cache and cache["stamp"] == stamp:
+                return cache["classes"]
+        classes = {}
+        try:
+            for entry_name in self.list_entries(class_path):
+                full_class_path = self.to_class_path(entry_name)
+                if not full_class_path:
+                    continue
+                class_name = full_class_path.split(".")[-1]
+                if class_name in classes:
+                    classes[class_name].append(full_class_path)
+                else:
+                    classes[class_name] = [full_class_path]
+        except (OSError, zipfile.BadZipFile) as e:
+            Logger().warning(
+                "Cannot scan class path %s: %s" % (class_path, str(e))
+            )
+            return None
+        with self.lock:
+            self.class_paths[class_path] = {
+                "stamp": stamp,
+                "classes": classes
+            }
+        return classes
+
+    def is_excluded(self, class_path, exclusion):
+        for package in exclusion:
+            if class_path.startswith(package):
+                return True
+        return False
+
+    def get_packages(self):
+        """
+        Returns a sorted list of packages within class paths,
+            or None if any class path cannot be read
+        """
+        class_paths = self.get_class_paths()
+        if class_paths is None:
+            return None
+        exclusion = Settings().get("java_exclude_packages", [])
+        packages = set()
+        for class_path in class_paths:
+            classes = self.scan_class_path(class_path)
+            if classes is None:
+                return None
+            for full_class_paths in classes.values():
+                for full_class_path in full_class_paths:
+                    if not self.is_excluded(full_class_path, exclusion):
+                        packages.add(full_class_path.rpartition(".")[0])
+        packages.discard("")
+        return sorted(packages)
+
+    def get_class_paths_for_classes(self, class_names):
+        """
+        Returns a dict of class name and a list of its class paths,
+            or None if any class path cannot be read
+
+        @param class_names: a list of class names
+        """
+        class_paths = self.get_class_paths()
+        if class_paths is None:
+            return None
+        exclusion = Settings().get("java_exclude_packages", [])
+        found_class_paths = {}
+        for class_path in class_paths:
+            classes = self.scan_class_path(class_path)
+            if classes is None:
+                return None
+            for class_name in class_names:
+                if class_name not in classes:
+                    continue
+                for full_class_path in classes[class_name]:
+                    if self.is_excluded(full_class_path, exclusion):
+                        continue
+                    if class_name not in found_class_paths:
+                        found_class_paths[class_name] = []
+                    if full_class_path not in found_class_paths[class_name]:
+                        found_class_paths[class_name].append(full_class_path)
+        return found_class_paths
+
+
+def ClassPathScanner():
+    return _ClassPathScanner.instance()
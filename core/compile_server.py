@@ -0,0 +1,105 @@
+import shlex
+import threading
+from .helper_server import HelperServer
+from .logger import Logger
+from .settings import Settings
+
+
+class _CompileServer:
+
+    """
+    A manager for long-lived compiler processes which compile the file
+        batches without starting a new compiler for every batch
+
+    Compile server uses the same protocol as a helper server, each request
+        is a line of compiler arguments and each response is the compiler
+        output follows by an end line with a return code
+
+    Each builder thread uses its own compile server, so the batches are
+        built as parallel as the build commands
+    """
+
+    @classmethod
+    def instance(cls):
+        if not hasattr(cls, "_instance"):
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # (Server arguments, output location, cwd, worker) -> HelperServer
+        self.servers = {}
+        self.unsupported_keys = set()
+
+    def compile(self, args, compiler_args, output_location=None, cwd=None,
+                worker=0):
+        """
+        Returns an output of the compilation in the same format as
+            GenericBlockShell, or None if compile server cannot be used
+
+        @param args: a list of arguments to start a compile server
+        @param compiler_args: a list of compiler arguments
+        @param output_location: a build output location, each location will
+            use its own compile server
+        @param cwd: a working directory of the compile server
+        @param worker: an index of the builder thread
+        """
+        key = (tuple(args), output_location, cwd)
+        server_key = key + (worker,)
+        with self.lock:
+            if key in self.unsupported_keys:
+                return None
+            if server_key not in self.servers:
+                self.servers[server_key] = HelperServer(
+                    args,
+                    idle_timeout=Settings().get(
+                        "compile_server_idle_timeout", 0
+                    ),
+                    encoding=Settings().get("encoding", "utf-8"),
+                    cwd=cwd
+                )
+            server = self.servers[server_key]
+        output = server.query(
+            " ".join([shlex.quote(arg) for arg in compiler_args]),
+            timeout=Settings().get("compile_server_timeout") or None
+        )
+        if output is None and not server.abandoned:
+            Logger().warning(
+                "Compile server is not available, fallback to build command"
+            )
+            with self.lock:
+                self.unsupported_keys.add(key)
+                if self.servers.get(server_key) is server:
+                    del self.servers[server_key]
+        return output
+
+    def cancel(self, worker=0):
+        """
+        Abandons the running compilation of a specified builder thread by
+            killing its compile servers
+
+        @param worker: an index of the builder thread
+        """
+        with self.lock:
+            servers = [
+                server
+                for server_key, server in self.servers.items()
+                if server_key[3] == worker
+            ]
+        for server in servers:
+            server.abandon()
+
+    def shutdown(self):
+        """
+        Stops all running compile servers
+        """
+        with self.lock:
+            servers = list(self.servers.values())
+            self.servers = {}
+            self.unsupported_keys = set()
+        for server in servers:
+            server.shutdown()
+
+
+def CompileServer():
+    return _CompileServer.instance()
@@ -0,0 +1,168 @@
+import os
+import re
+
+
+class DependencyGraph:
+
+    """
+    A graph of Java source files and the classes they are referenced to,
+        stored within a build cache
+    """
+
+    SECTION = "dependency_graph"
+    # Comments and literals are matched first so its content will be ignored
+    COMMENT_PATTERN = re.compile(
+        "//[^\\n]*|/\\*.*?\\*/|\"(?:\\\\.|[^\"\\\\\\n])*\"|" +
+        "'(?:\\\\.|[^'\\\\\\n])*'",
+        re.DOTALL
+    )
+    PACKAGE_PATTERN = re.compile("\\bpackage\\s+([\\w$.\\s]+?)\\s*;")
+    IMPORT_PATTERN = re.compile(
+        "\\bimport\\s+(?:static\\s+)?([\\w$.\\s]+?)(\\s*\\.\\s*\\*)?\\s*;"
+    )
+    # Type names are expected to be started with an upper-case letter
+    TYPE_NAME_PATTERN = re.compile("(?<![\\w$])[A-Z][\\w$]*")
+    QUALIFIED_NAME_PATTERN = re.compile(
+        "[A-Za-z_$][\\w$]*(?:\\s*\\.\\s*[A-Za-z_$][\\w$]*)+"
+    )
+    SPACES_PATTERN = re.compile("\\s+")
+
+    def __init__(self, build_cache):
+        """
+        @param build_cache: a build cache to store the graph
+        """
+        self.build_cache = build_cache
+        # File path -> {
+        #     "mtime": mtime, "class_path": class path, "package": package,
+        #     "imports": imports, "wildcards": wildcard imports,
+        #     "names": type names and package segments
+        # }
+        self.files = build_cache.get_section(self.SECTION)
+
+    def read_references(self, file_path):
+        """
+        Returns a package, imports and referenced names from a Java file
+
+        Referenced names are identifiers which can name a type and the
+            leading segments of qualified names, so the graph may contains
+            more dependencies than the actual ones
+
+        @param file_path: a Java file path
+        """
+        java_file = open(file_path, "r")
+        source_code = java_file.read()
+        java_file.close()
+        source_code = self.COMMENT_PATTERN.sub(" ", source_code)
+        package = self.PACKAGE_PATTERN.search(source_code)
+        imports = []
+        wildcards = []
+        names = set(self.TYPE_NAME_PATTERN.findall(source_code))
+        for qualified_name in self.QUALIFIED_NAME_PATTERN.findall(
+                source_code):
+            qualified_name = self.SPACES_PATTERN.sub("", qualified_name)
+            names.update(qualified_name.split(".")[:-1])
+        for import_match in self.IMPORT_PATTERN.finditer(source_code):
+            name = self.SPACES_PATTERN.sub("", import_match.group(1))
+            if import_match.group(2):
+                wildcards.append(name)
+            else:
+                imports.append(name)
+        return {
+            "package": (
+                self.SPACES_PATTERN.sub("", package.group(1))
+                if package else ""
+            ),
+            "imports": imports,
+            "wildcards": wildcards,
+            "names": sorted(names)
+        }
+
+    def update_file(self, file_path, class_path):
+        """
+        Updates the references of a specified file if it has been modified
+
+        @param file_path: a Java file path
+        @param class_path: a full class path of the file
+        """
+        modified_time = int(os.path.getmtime(file_path))
+        entry = self.files.get(file_path)
+        if (entry and entry["mtime"] == modified_time and
+                entry["class_path"] == class_path):
+            return
+        entry = self.read_references(file_path)
+        entry["mtime"] = modified_time
+        entry["class_path"] = class_path
+        self.files[file_path] = entry
+        self.build_cache.mark_changed()
+
+    def remove_missing_files(self):
+        """
+        Removes files which are no longer exists and returns a list of
+            its class paths
+        """
+        class_paths = []
+        for file_path in list(self.files):
+            if not os.path.exists(file_path):
+                class_paths.append(self.files.pop(file_path)["class_path"])
+        if class_paths:
+            self.build_cache.mark_changed()
+        return class_paths
+
+    def is_dependent(self, entry, class_path, names=None):
+        """
+        Returns whether a file entry is referenced to a specified class
+
+        @param entry: a file entry in the graph
+        @param class_path: a full class path
+        @param names: a set of referenced names of the entry
+        """
+        names = names or set(entry["names"])
+        for import_name in entry["imports"] + entry["wildcards"]:
+            if (import_name == class_path or
+                    import_name.startswith(class_path + ".")):
+                return True
+        package, _, class_name = class_path.rpartition(".")
+        if class_name not in names:
+            return False
+        if package == entry["package"] or package in entry["wildcards"]:
+            return True
+        # Fully qualified name
+        return package != "" and all(
+            name in names for name in package.split(".")
+        )
+
+    def get_dependents(self, class_paths):
+        """
+        Returns a set of file paths which are directly or indirectly
+            referenced to specified classes
+
+        @param class_paths: a list of full class paths
+        """
+        names = {}
+        file_names = {}
+        for file_path, entry in self.files.items():
+            file_names[file_path] = set(entry["names"])
+            for name in entry["names"]:
+                if name in names:
+                    names[name].append(file_path)
+                else:
+                    names[name] = [file_path]
+        dependents = set()
+        class_paths = list(class_paths)
+        visited_class_paths = set()
+        while class_paths:
+            class_path = class_paths.pop()
+            if class_path in visited_class_paths:
+                continue
+            visited_class_paths.add(class_path)
+            class_name = class_path.rpartition(".")[2]
+            for file_path in names.get(class_name, []):
+                entry = self.files[file_path]
+                if (file_path not in dependents and
+                        entry["class_path"] != class_path and
+                        self.is_dependent(
+                            entry, class_path, file_names[file_path]
+                        )):
+                    dependents.add(file_path)
+                    class_paths.append(entry["class_path"])
+        return dependents
@@ -61,6 +61,8 @@ class _DependencyManager:
             if provided as False, will refresh only local dependencies settings
         """
         if from_global is None:
+            from .helper_service import HelperService
+            HelperService().reset_query_cache()
             self.refresh_dependencies(False)
             self.refresh_dependencies(True)
             return
@@ -0,0 +1,182 @@
+import re
+import threading
+
+
+class DiagnosticParser:
+
+    """
+    A streaming parser for compiler output which turns the output lines into
+        diagnostic records as soon as each diagnostic is complete
+
+    A diagnostic contains every line after its header (the source line, the
+        caret line and the details) until the next header, a message
+        without location or the summary line
+
+    Each record is a dict contains "file", "line", "column", "severity",
+        "message" and "text" (the output lines of the diagnostic), output
+        lines outside of any diagnostic will be a record without "file"
+    """
+
+    HEADER_PATTERN = re.compile(
+        "^(.+?):(\\d+):(?:(\\d+):)?\\s*(error|warning|note):\\s*(.*)$",
+        re.IGNORECASE
+    )
+    CARET_PATTERN = re.compile("^(\\s*)\\^\\s*$")
+    SUMMARY_PATTERN = re.compile("^\\d+ (?:errors?|warnings?)$")
+    # A message without location, such as "Note: ..."
+    MESSAGE_PATTERN = re.compile("^(?:error|warning|note):", re.IGNORECASE)
+
+    def __init__(self):
+        self.partial_line = ""
+        self.diagnostic = None
+        # Whether the source line of current diagnostic is not yet read
+        self.source_pending = False
+
+    def create_record(self, line):
+        header = self.HEADER_PATTERN.match(line)
+        if not header:
+            return {
+                "file": None,
+                "line": None,
+                "column": None,
+                "severity": None,
+                "message": line,
+                "text": line + "\n"
+            }
+        return {
+            "file": header.group(1),
+            "line": int(header.group(2)),
+            "column": int(header.group(3)) if header.group(3) else None,
+            "severity": header.group(4).lower(),
+            "message": header.group(5),
+            "text": line + "\n"
+        }
+
+    def feed_line(self, line):
+        """
+        Parses a single output line and returns a list of completed records
+
+        @param line: an output line without a line break
+        """
+        if (self.diagnostic and
+                not self.HEADER_PATTERN.match(line) and
+                not self.SUMMARY_PATTERN.match(line) and
+                (self.source_pending or
+                    not self.MESSAGE_PATTERN.match(line))):
+            # Source line, caret and details belong to current diagnostic
+            self.source_pending = False
+            caret = self.CARET_PATTERN.match(line)
+            if caret and self.diagnostic["column"] is None:
+                self.diagnostic["column"] = len(caret.group(1)) + 1
+            self.diagnostic["text"] += line + "\n"
+            return []
+        records = self.close_diagnostic()
+        record = self.create_record(line)
+        if record["file"]:
+            self.diagnostic = record
+            self.source_pending = True
+        else:
+            records.append(record)
+        return records
+
+    def feed(self, data):
+        """
+        Parses a chunk of output and returns a list of completed records
+
+        @param data: a chunk of output, may ends in the middle of a line
+        """
+        lines = (self.partial_line + data.replace("\r\n", "\n")).split("\n")
+        self.partial_line = lines.pop()
+        records = []
+        for line in lines:
+            records += self.feed_line(line)
+        return records
+
+    def close_diagnostic(self):
+        if not self.diagnostic:
+            return []
+        diagnostic = self.diagnostic
+        self.diagnostic = None
+        return [diagnostic]
+
+    def close(self):
+        """
+        Returns a list of remaining records once the output is ended
+        """
+        records = []
+        if self.partial_line:
+            records += self.feed_line(self.partial_line)
+            self.partial_line = ""
+        return records + self.close_diagnostic()
+
+
+class DiagnosticIndex:
+
+    """
+    An index of diagnostic records by its file for a quick navigation
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """
+        Forget all indexed records
+        """
+        with self.lock:
+            # File path -> a list of records sorted by line
+            self.files = {}
+
+    def add(self, record):
+        """
+        Adds a diagnostic record to the index, records without file will be
+            ignored
+
+        @param record: a diagnostic record
+        """
+        if not record["file"]:
+            return
+        with self.lock:
+            records = self.files.setdefault(record["file"], [])
+            records.append(record)
+            records.sort(
+                key=lambda record: (record["line"], record["column"] or 0)
+            )
+
+    def get_diagnostics(self, file_path=None):
+        """
+        Returns a list of diagnostic records of a specified file, or all
+            records if file is not specified
+
+        @param file_path: a file path
+        """
+        with self.lock:
+            if file_path:
+                return list(self.files.get(file_path, []))
+            return [
+                record
+                for path in sorted(self.files)
+                for record in self.files[path]
+            ]
+
+    def get_next_diagnostic(self, file_path=None, line=0, severity=None):
+        """
+        Returns the next diagnostic record after a specified position, wrap
+            around to the first record when no record left, or None if
+            there is no record
+
+        @param file_path: a file path of current position
+        @param line: a line number of current position
+        @param severity: a severity to filter the records
+        """
+        records = [
+            record
+            for record in self.get_diagnostics()
+            if not severity or record["severity"] == severity
+        ]
+        for record in records:
+            if ((record["file"], record["line"]) >
+                    (file_path or "", line)):
+                return record
+        return records[0] if records else None
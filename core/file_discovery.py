@@ -0,0 +1,164 @@
+import fnmatch
+import os
+import re
+import threading
+import time
+from .settings import Settings
+
+
+class _FileDiscovery:
+
+    """
+    A shared file discovery which keeps a snapshot of listed directories
+
+    Each directory will be listed again only when its modification time has
+        been changed, so walking an unchanged tree only needs one stat call
+        per directory
+    """
+
+    # A listing which is taken within this duration (in seconds) after the
+    #     directory is modified might missed a later change within the same
+    #     timestamp, so it will not be reused
+    RACY_DURATION = 2
+
+    @classmethod
+    def instance(cls):
+        if not hasattr(cls, "_instance"):
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.exclude_patterns = None
+        self.exclude_matcher = None
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all listed directories
+        """
+        with self.lock:
+            # Directory path -> {
+            #     "mtime": mtime, "scan_time": scan time,
+            #     "dirs": directory names, "files": file names
+            # }
+            self.snapshot = {}
+
+    def get_exclude_matcher(self):
+        """
+        Returns a compiled pattern matches the excluded folder names
+        """
+        patterns = tuple(Settings().get_sublime("folder_exclude_patterns", []))
+        with self.lock:
+            if patterns != self.exclude_patterns:
+                self.exclude_patterns = patterns
+                self.exclude_matcher = re.compile("|".join(
+                    "(?:%s)" % (fnmatch.translate(pattern))
+                    for pattern in patterns
+                ) or "(?!)")
+            return self.exclude_matcher
+
+    def scan_dir(self, dir_path):
+        """
+        Returns a tuple of directory names and file names within a specified
+            directory
+
+        @param dir_path: a directory path
+        """
+        dirs = []
+        files = []
+        if hasattr(os, "scandir"):
+            for entry in os.scandir(dir_path):
+                try:
+                    if entry.is_dir():
+                        dirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    pass
+        else:
+            for name in os.listdir(dir_path):
+                path_name = os.path.join(dir_path, name)
+                if os.path.isdir(path_name):
+                    dirs.append(name)
+                elif os.path.isfile(path_name):
+                    files.append(name)
+        return (sorted(dirs), sorted(files))
+
+    def list_dir(self, dir_path):
+        """
+        Returns a tuple of directory names and file names within a specified
+            directory, or None if the directory cannot be listed
+
+        @param dir_path: a directory path
+        """
+        try:
+            modified_time = os.stat(dir_path).st_mtime
+        except OSError:
+            return None
+        with self.lock:
+            listing = self.snapshot.get(dir_path)
+        if (listing and listing["mtime"] == modified_time and
+                listing["scan_time"] - modified_time > self.RACY_DURATION):
+            return (listing["dirs"], listing["files"])
+        scan_time = time.time()
+        try:
+            dirs, files = self.scan_dir(dir_path)
+        except OSError:
+            return None
+        with self.lock:
+            self.snapshot[dir_path] = {
+                "mtime": modified_time,
+                "scan_time": scan_time,
+                "dirs": dirs,
+                "files": files
+            }
+        return (dirs, files)
+
+    def walk(self, dir_path, recursive=True, exclude=True):
+        """
+        Generates a tuple of directory path, directory names and file names
+            for a specified directory and its sub-directories
+
+        @param dir_path: a directory path
+        @param recursive: a boolean specified whether the sub-directories
+            will be walked or not
+        @param exclude: a boolean specified whether the folders in
+            "folder_exclude_patterns" will be skipped or not
+        """
+        exclude_matcher = self.get_exclude_matcher() if exclude else None
+        pending_dirs = [dir_path]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            listing = self.list_dir(current_dir)
+            if listing is None:
+                continue
+            dirs, files = listing
+            if exclude_matcher:
+                dirs = [
+                    name for name in dirs if not exclude_matcher.match(name)
+                ]
+            yield (current_dir, dirs, files)
+            if recursive:
+                pending_dirs.extend(
+                    os.path.join(current_dir, name) for name in reversed(dirs)
+                )
+
+    def get_files(self, dir_path, predicate=None):
+        """
+        Returns a list of file paths in specified directory and its
+            sub-directories
+
+        @param dir_path: a directory path
+        @param predicate: a function to filter the file paths
+        """
+        return [
+            os.path.join(current_dir, name)
+            for current_dir, _, files in self.walk(dir_path)
+            for name in files
+            if not predicate or predicate(os.path.join(current_dir, name))
+        ]
+
+
+def FileDiscovery():
+    return _FileDiscovery.instance()
@@ -1,12 +1,435 @@
 import sublime
+import codecs
 import os
+import queue
 import sys
 import threading
-import shlex
-import subprocess
-from time import time, sleep
+import tempfile
+from collections import deque
+from time import time
+from .logger import Logger
+from .process_runner import ProcessRunner
 from .settings import Settings
 
+try:
+    import selectors
+except ImportError:
+    selectors = None
+
+
+class _ShellReactor:
+
+    """
+    A single I/O loop which reads the output pipes of all running processes
+
+    Pipes cannot be selected on Windows (or without selectors module), in
+        that case each pipe will be read by its own blocking thread instead
+    """
+
+    CHUNK_SIZE = 65536
+
+    @classmethod
+    def instance(cls):
+        if not hasattr(cls, "_instance"):
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.selector = None
+        self.wakeup_read = None
+        self.wakeup_write = None
+        # A list of (operation, pipe, on_data, on_close) to be done by the
+        #     reactor thread
+        self.operations = []
+
+    def is_selectable(self):
+        return selectors is not None and sys.platform != "win32"
+
+    def register(self, pipe, on_data, on_close):
+        """
+        Reads a specified pipe until it is closed
+
+        @param pipe: a pipe to read
+        @param on_data: a callback receives each chunk of bytes read
+        @param on_close: a callback when the pipe is closed
+        """
+        if not self.is_selectable():
+            thread = threading.Thread(
+                target=self.read_pipe,
+                args=[pipe, on_data, on_close]
+            )
+            thread.daemon = True
+            thread.start()
+            return
+        with self.lock:
+            if self.selector is None:
+                self.selector = selectors.DefaultSelector()
+                self.wakeup_read, self.wakeup_write = os.pipe()
+                self.selector.register(self.wakeup_read, selectors.EVENT_READ)
+                thread = threading.Thread(target=self.run)
+                thread.daemon = True
+                thread.start()
+            self.operations.append(("register", pipe, on_data, on_close))
+        os.write(self.wakeup_write, b"\0")
+
+    def close(self, pipe):
+        """
+        Stops reading and closes a specified pipe, its on_close callback
+            will be called if it is not already closed
+
+        Registered pipes are owned by the reactor and must not be closed
+            by anything else
+
+        @param pipe: a registered pipe
+        """
+        if not self.is_selectable() or self.selector is None:
+            return
+        with self.lock:
+            self.operations.append(("close", pipe, None, None))
+        os.write(self.wakeup_write, b"\0")
+
+    def dispatch(self, callback, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            Logger().error("Shell output handler failed: %s" % (str(e)))
+
+    def read_pipe(self, pipe, on_data, on_close):
+        while True:
+            try:
+                data = os.read(pipe.fileno(), self.CHUNK_SIZE)
+            except (OSError, ValueError):
+                data = b""
+            if not data:
+                break
+            self.dispatch(on_data, data)
+        pipe.close()
+        self.dispatch(on_close)
+
+    def run_operations(self):
+        os.read(self.wakeup_read, 4096)
+        with self.lock:
+            operations = self.operations
+            self.operations = []
+        for operation, pipe, on_data, on_close in operations:
+            if operation == "register":
+                try:
+                    self.selector.register(
+                        pipe, selectors.EVENT_READ, (on_data, on_close)
+                    )
+                except (OSError, ValueError):
+                    self.dispatch(on_close)
+                continue
+            try:
+                key = self.selector.unregister(pipe)
+            except (KeyError, ValueError):
+                key = None
+            pipe.close()
+            if key:
+                self.dispatch(key.data[1])
+
+    def run(self):
+        while True:
+            for key, _ in self.selector.select():
+                if key.data is None:
+                    self.run_operations()
+                    continue
+                if self.selector.get_map().get(key.fd) is not key:
+                    # Closed (or replaced) by an earlier operation within
+                    #     the same batch
+                    continue
+                on_data, on_close = key.data
+                try:
+                    data = os.read(key.fd, self.CHUNK_SIZE)
+                except OSError:
+                    data = b""
+                if data:
+                    self.dispatch(on_data, data)
+                else:
+                    try:
+                        self.selector.unregister(key.fd)
+                    except (KeyError, ValueError):
+                        pass
+                    key.fileobj.close()
+                    self.dispatch(on_close)
+
+
+def ShellReactor():
+    return _ShellReactor.instance()
+
+
+class OutputDecoder:
+
+    """
+    An incremental decoder for process output which can be split at any
+        byte, including in the middle of a character or a line break
+    """
+
+    def __init__(self):
+        self.decoder = codecs.getincrementaldecoder(
+            Settings().get("encoding")
+        )(Settings().get("encoding_handle"))
+        self.pending_return = False
+
+    def decode(self, data, final=False):
+        """
+        Returns a decoded text of a specified chunk, line breaks will be
+            normalized to \\n
+
+        @param data: a chunk of bytes
+        @param final: a boolean specified whether this is the last chunk
+        """
+        text = self.decoder.decode(data, final)
+        if self.pending_return:
+            text = "\r" + text
+            self.pending_return = False
+        if text.endswith("\r") and not final:
+            text = text[:-1]
+            self.pending_return = True
+        return text.replace("\r\n", "\n")
+
+
+class OutputBuffer:
+
+    """
+    A chunked text buffer which appends without copying the previous text
+
+    Text beyond "memory_limit" characters will be moved to a temporary file
+        and text beyond "limit" characters will be dropped
+    """
+
+    def __init__(self, limit=0, memory_limit=0):
+        """
+        @param limit: a maximum number of characters to keep, or 0 to keep
+            all characters
+        @param memory_limit: a maximum number of characters to keep in
+            memory, or 0 to keep all characters in memory
+        """
+        self.limit = limit
+        self.memory_limit = memory_limit
+        self.chunks = deque()
+        self.size = 0
+        self.memory_size = 0
+        self.dropped_size = 0
+        self.spill_file = None
+
+    def __len__(self):
+        return self.size
+
+    def append(self, text):
+        """
+        Adds a text to the end of the buffer
+
+        @param text: a text to add
+        """
+        if self.limit > 0 and self.size + len(text) > self.limit:
+            available_size = max(0, self.limit - self.size)
+            self.dropped_size += len(text) - available_size
+            text = text[:available_size]
+        if not text:
+            return
+        self.chunks.append(text)
+        self.size += len(text)
+        self.memory_size += len(text)
+        if self.memory_limit > 0 and self.memory_size > self.memory_limit:
+            self.spill()
+
+    def spill(self):
+        """
+        Moves the text in memory to a temporary file
+        """
+        if not self.spill_file:
+            self.spill_file = tempfile.TemporaryFile()
+        self.spill_file.seek(0, os.SEEK_END)
+        self.spill_file.write(
+            "".join(self.chunks).encode("utf-8", "surrogatepass")
+        )
+        self.chunks.clear()
+        self.memory_size = 0
+
+    def discard(self, size):
+        """
+        Removes a specified number of characters from the start of the
+            buffer
+
+        @param size: a number of characters to remove
+        """
+        if self.spill_file:
+            text = self.getvalue()[size:]
+            self.close()
+            self.append(text)
+            return
+        size = min(size, self.size)
+        self.size -= size
+        self.memory_size -= size
+        while size > 0:
+            chunk = self.chunks.popleft()
+            if len(chunk) > size:
+                self.chunks.appendleft(chunk[size:])
+            size -= len(chunk)
+
+    def getvalue(self):
+        """
+        Returns the whole text in the buffer
+        """
+        text = "".join(self.chunks)
+        if self.spill_file:
+            self.spill_file.seek(0)
+            text = self.spill_file.read().decode(
+                "utf-8", "surrogatepass"
+            ) + text
+        return text
+
+    def close(self):
+        """
+        Clears the buffer and removes its temporary file
+        """
+        if self.spill_file:
+            self.spill_file.close()
+            self.spill_file = None
+        self.chunks.clear()
+        self.size = 0
+        self.memory_size = 0
+
+
+class ShellOutput:
+
+    """
+    A decoded output of a process which is read by the shell reactor
+
+    The reactor only queues the chunks it reads, the chunks are decoded and
+        handed to the callback on the thread which waits for the output
+    """
+
+    def __init__(self, pipe, on_data=None, capture=True):
+        """
+        @param pipe: a pipe to read, it will be closed by the shell reactor
+        @param on_data: a callback receives each decoded chunk
+        @param capture: a boolean specified whether the output will be kept
+            to be read after the process is exited or not
+        """
+        self.pipe = pipe
+        self.on_data = on_data
+        self.decoder = OutputDecoder()
+        self.buffer = None
+        if capture:
+            self.buffer = OutputBuffer(
+                limit=Settings().get("shell_output_limit", 0),
+                memory_limit=Settings().get("shell_output_memory_limit", 0)
+            )
+        # Chunks of bytes read, followed by None once the pipe is closed
+        self.chunks = queue.Queue()
+        self.closed = False
+        ShellReactor().register(pipe, self.chunks.put, self.on_close)
+
+    def on_close(self):
+        self.chunks.put(None)
+
+    def append(self, text):
+        if not text:
+            return
+        if self.buffer is not None:
+            self.buffer.append(text)
+        if self.on_data:
+            self.on_data(text)
+
+    def wait(self, timeout=None):
+        """
+        Handles the queued output until the output is closed, returns
+            whether it is closed
+
+        @param timeout: a maximum duration in seconds to wait
+        """
+        end_time = None if timeout is None else time() + timeout
+        while not self.closed:
+            try:
+                if end_time is None:
+                    data = self.chunks.get()
+                else:
+                    data = self.chunks.get(
+                        timeout=max(0, end_time - time())
+                    )
+            except queue.Empty:
+                return False
+            if data is None:
+                self.closed = True
+                self.append(self.decoder.decode(b"", True))
+            else:
+                self.append(self.decoder.decode(data))
+        return True
+
+    def read(self):
+        """
+        Returns the captured output, or None if there is no output
+
+        Captured output will be released once it is read
+        """
+        if not self.buffer:
+            return None
+        text = self.buffer.getvalue()
+        self.buffer.close()
+        return text or None
+
+    def abandon(self):
+        """
+        Stops reading the output
+        """
+        if self.closed:
+            return
+        if ShellReactor().is_selectable():
+            ShellReactor().close(self.pipe)
+        else:
+            # Blocking read cannot be interrupted, leave the pipe to its
+            #     reader thread
+            self.on_close()
+
+
+class ConsoleBuffer:
+
+    """
+    A buffer which coalesces console output until it is written to the view
+
+    Only the last "limit" characters will be kept, so a process which prints
+        faster than the view can be rendered will not grow the buffer
+    """
+
+    def __init__(self, limit=0):
+        """
+        @param limit: a maximum number of characters to keep, or 0 to keep
+            all characters
+        """
+        self.lock = threading.Lock()
+        self.limit = limit
+        self.chunks = []
+        self.size = 0
+
+    def append(self, text):
+        """
+        Adds a text to the buffer
+
+        @param text: a text to add
+        """
+        with self.lock:
+            self.chunks.append(text)
+            self.size += len(text)
+            if self.limit > 0 and self.size > self.limit * 2:
+                text = "".join(self.chunks)[-self.limit:]
+                self.chunks = [text]
+                self.size = len(text)
+
+    def take(self):
+        """
+        Returns all buffered text and clears the buffer
+        """
+        with self.lock:
+            text = "".join(self.chunks)
+            self.chunks = []
+            self.size = 0
+        if self.limit > 0:
+            return text[-self.limit:]
+        return text
+
 
 class GenericShell(threading.Thread):
     def __init__(self, cmds, view, on_complete=None, no_echo=False,
@@ -25,145 +448,159 @@ class GenericShell(threading.Thread):
         self.cwd = path
 
     def popen(self, cmd, cwd):
-        if sys.platform == "win32":
-            return subprocess.Popen(
-                shlex.split(cmd), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT, cwd=cwd, shell=True
-            )
-        elif sys.platform == "darwin":
-            return subprocess.Popen(
-                ["/bin/bash", "-l", "-c", cmd], stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd,
-                shell=False
-            )
-        elif sys.platform == "linux":
-            return subprocess.Popen(
-                ["/bin/bash", "-c", cmd], stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd,
-                shell=False
-            )
-        else:
-            return subprocess.Popen(
-                shlex.split(cmd), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT, cwd=cwd, shell=False
-            )
+        return ProcessRunner.popen(cmd, cwd)
 
     def kill(self, proc):
-        if sys.platform == "win32":
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            subprocess.Popen(
-                "taskkill /F /PID %s /T" % (str(proc.pid)),
-                startupinfo=startupinfo
+        ProcessRunner.kill(proc)
+
+    def on_output(self, data):
+        self.output_buffer.append(data)
+
+    def write_output(self):
+        """
+        Writes the buffered output to the view
+        """
+        data = self.output_buffer.take()
+        if not data:
+            return
+        _, layout_height = self.view.layout_extent()
+        _, viewport_height = self.view.viewport_extent()
+        viewport_posx, viewport_posy = self.view.viewport_position()
+        self.view.set_read_only(False)
+        self.view.run_command(
+            "javatar_utils",
+            {"util_type": "add", "text": data}
+        )
+        self.console_text.append(data)
+        self.output_end += len(data)
+        self.trim_scrollback()
+        self.view.set_read_only(self.read_only)
+        if (self.autoscroll and
+            viewport_posy >= (layout_height - viewport_height -
+                              self.autoscroll_snap_range)):
+            _, layout_height = self.view.layout_extent()
+            self.view.set_viewport_position(
+                (viewport_posx, layout_height - viewport_height),
+                False
             )
-        else:
-            proc.terminate()
+        if self.to_console:
+            print(data)
 
-    def read_stdout(self):
-        while True:
-            data = os.read(self.proc.stdout.fileno(), 512)
-            if len(data) > 0:
-                _, layout_height = self.view.layout_extent()
-                _, viewport_height = self.view.viewport_extent()
-                viewport_posx, viewport_posy = self.view.viewport_position()
-                decoded_data = data.decode(
-                    Settings().get("encoding"),
-                    Settings().get("encoding_handle")
-                ).replace("\r\n", "\n")
-                self.view.set_read_only(False)
-                self.view.run_command(
-                    "javatar_utils",
-                    {"util_type": "add", "text": decoded_data}
-                )
-                self.view.set_read_only(self.read_only)
-                self.old_data += decoded_data
-                if (Settings().get("autoscroll_to_bottom") and
-                    viewport_posy >= (layout_height - viewport_height -
-                                      Settings().get("autoscroll_snap_range"))):
-                    _, layout_height = self.view.layout_extent()
-                    self.view.set_viewport_position(
-                        (viewport_posx, layout_height - viewport_height),
-                        False
-                    )
-                if self.to_console:
-                    print(decoded_data)
-            elif self.proc.poll() is not None:
-                break
-            sleep(Settings().get("shell_refresh_interval"))
-        self.isReadable = False
+    def trim_scrollback(self):
+        """
+        Removes the oldest lines from the view which exceed the scrollback
+            limit
+        """
+        if self.scrollback_limit <= 0:
+            return
+        if self.view.size() <= self.scrollback_limit:
+            return
+        trim_size = self.output_end - self.scrollback_limit
+        if trim_size <= 0:
+            return
+        line_end = self.view.find("\n", trim_size, sublime.LITERAL)
+        if line_end and 0 <= line_end.end() <= self.output_end:
+            trim_size = line_end.end()
+        self.view.run_command(
+            "javatar_utils",
+            {"util_type": "erase", "region": [0, trim_size]}
+        )
+        self.console_text.discard(trim_size)
+        self.output_end -= trim_size
 
     def read_stdin(self):
-        while self.proc.poll() is None:
-            # If input make output less than before, reset it
-            if len(self.old_data) > self.view.size():
-                send_eof = False
-                if self.view.size() == 0:
-                    send_eof = True
+        """
+        Sends the input from the view to the process, returns whether
+            the input is still open
+
+        Text after the end of process output is an input
+        """
+        view_size = self.view.size()
+        # If input make output less than before, reset it
+        if self.output_end > view_size:
+            send_eof = False
+            if view_size == 0:
+                send_eof = True
+            self.view.run_command(
+                "javatar_utils",
+                {"util_type": "clear"}
+            )
+            self.view.run_command(
+                "javatar_utils",
+                {"util_type": "add", "text": self.console_text.getvalue()}
+            )
+            if send_eof:
                 self.view.run_command(
                     "javatar_utils",
-                    {"util_type": "clear"}
+                    {"util_type": "add", "text": "\n"}
                 )
+                self.proc.stdin.close()
+                return False
+        elif self.output_end < view_size:
+            self.data_in = self.view.substr(
+                sublime.Region(self.output_end, view_size)
+            )
+        if "\n" in self.data_in:
+            if self.no_echo:
                 self.view.run_command(
                     "javatar_utils",
-                    {"util_type": "add", "text": self.old_data}
-                )
-                if send_eof:
-                    self.view.run_command(
-                        "javatar_utils",
-                        {"util_type": "add", "text": "\n"}
-                    )
-                    self.proc.stdin.close()
-                    break
-            elif len(self.old_data) < self.view.size():
-                self.data_in = self.view.substr(
-                    sublime.Region(len(self.old_data), self.view.size())
+                    {"util_type": "erase", "region": [
+                        self.output_end, self.view.size()
+                    ]}
                 )
-            if "\n" in self.data_in:
-                if self.no_echo:
-                    self.view.run_command(
-                        "javatar_utils",
-                        {"util_type": "erase", "region": [
-                            len(self.old_data), self.view.size()
-                        ]}
-                    )
-                os.write(
-                    self.proc.stdin.fileno(),
-                    self.data_in.encode(Settings().get("encoding"))
-                )
-                self.old_data = self.view.substr(
-                    sublime.Region(0, self.view.size())
-                )
-                self.data_in = ""
-            sleep(Settings().get("shell_refresh_interval"))
-        self.isWritable = False
+            else:
+                self.console_text.append(self.data_in)
+            os.write(
+                self.proc.stdin.fileno(),
+                self.data_in.encode(Settings().get("encoding"))
+            )
+            self.output_end = len(self.console_text)
+            self.data_in = ""
+        return True
 
     def run(self):
         start_time = time()
         self.proc = self.popen(self.cmds, self.cwd)
-        self.old_data = self.view.substr(sublime.Region(0, self.view.size()))
+        # A copy of the view content to restore when the output is removed
+        self.console_text = OutputBuffer()
+        self.console_text.append(
+            self.view.substr(sublime.Region(0, self.view.size()))
+        )
+        self.output_end = len(self.console_text)
         self.data_in = ""
         self.return_code = None
-        self.isReadable = True
-        self.isWritable = True
-
-        threading.Thread(target=self.read_stdout).start()
-        if not self.read_only:
-            threading.Thread(target=self.read_stdin).start()
+        self.autoscroll = Settings().get("autoscroll_to_bottom")
+        self.autoscroll_snap_range = Settings().get("autoscroll_snap_range")
+        self.scrollback_limit = Settings().get("console_scrollback_limit", 0)
+        self.output_buffer = ConsoleBuffer(self.scrollback_limit)
+        refresh_interval = Settings().get("shell_refresh_interval")
+        render_interval = Settings().get("console_render_interval", 0)
+        last_render_time = 0
+        # Output is read by the shell reactor, this thread only updates
+        #    the view and sends the input
+        output = ShellOutput(
+            self.proc.stdout, self.on_output, capture=False
+        )
+        writable = not self.read_only
 
         while (self.view is not None and
                self.view.id() and
                 self.view.window() is not None):
-            if self.proc.poll() is not None:
-                self.return_code = self.proc.poll()
-            if not self.isWritable and not self.isReadable:
-                self.proc.stdout.close()
-                self.proc.stdin.close()
-                break
-            if self.proc.poll() is not None:
+            closed = output.wait(refresh_interval)
+            if closed or time() - last_render_time >= render_interval:
+                self.write_output()
+                last_render_time = time()
+            if closed:
+                self.return_code = self.proc.wait()
                 break
-            sleep(Settings().get("shell_refresh_interval"))
+            if writable and self.proc.poll() is None:
+                writable = self.read_stdin()
         if self.return_code is None:
             self.kill(self.proc)
+            output.abandon()
+            output.wait(1)
+        if not self.proc.stdin.closed:
+            self.proc.stdin.close()
         self.result = True
         if self.on_complete is not None:
             self.on_complete(
@@ -186,81 +623,16 @@ class GenericSilentShell(threading.Thread):
     def set_cwd(self, path=""):
         self.cwd = path
 
-    def popen(self, cmd, cwd):
-        if sys.platform == "win32":
-            return subprocess.Popen(
-                shlex.split(cmd), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT, cwd=cwd, shell=True
-            )
-        elif sys.platform == "darwin":
-            return subprocess.Popen(
-                ["/bin/bash", "-l", "-c", cmd], stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd,
-                shell=False
-            )
-        elif sys.platform == "linux":
-            return subprocess.Popen(
-                ["/bin/bash", "-c", cmd], stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd,
-                shell=False
-            )
-        else:
-            return subprocess.Popen(
-                shlex.split(cmd), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT, cwd=cwd, shell=False
-            )
-
-    def kill(self, proc):
-        if sys.platform == "win32":
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            subprocess.Popen(
-                "taskkill /F /PID %s /T" % (str(proc.pid)),
-                startupinfo=startupinfo
-            )
-        else:
-            proc.terminate()
-
-    def read_stdout(self):
-        while True:
-            data = os.read(self.proc.stdout.fileno(), 512)
-            if len(data) > 0:
-                decoded_data = data.decode(
-                    Settings().get("encoding"),
-                    Settings().get("encoding_handle")
-                ).replace("\r\n", "\n")
-                if self.data_out is None:
-                    self.data_out = decoded_data
-                else:
-                    self.data_out += decoded_data
-                if self.to_console:
-                    print(decoded_data)
-            elif self.proc.poll() is not None:
-                break
-            sleep(Settings().get("shell_refresh_interval"))
-        self.isReadable = False
-
     def run(self):
-        start_time = time()
-        self.proc = self.popen(self.cmds, self.cwd)
-        self.return_code = None
-        self.isReadable = True
-
-        threading.Thread(target=self.read_stdout).start()
-
-        while True:
-            if self.proc.poll() is not None:
-                self.return_code = self.proc.poll()
-            if not self.isReadable:
-                self.proc.stdout.close()
-                break
-            sleep(Settings().get("shell_refresh_interval"))
-        if self.return_code is None:
-            self.kill(self.proc)
+        result = ProcessRunner(self.cmds, self.cwd).run(
+            print if self.to_console else None
+        )
+        self.data_out = result.data
+        self.return_code = result.return_code
         self.result = True
         if self.on_complete is not None:
             self.on_complete(
-                time() - start_time,
+                result.elapse_time,
                 self.data_out,
                 self.return_code,
                 self.params
@@ -268,78 +640,8 @@ class GenericSilentShell(threading.Thread):
 
 
 class GenericBlockShell():
-    def run(self, cmds, cwd=None):
-        start_time = time()
-        self.proc = self.popen(cmds, cwd)
-        self.return_code = None
-        self.data_out = None
-        self.isReadable = True
-
-        threading.Thread(target=self.read_stdout).start()
-
-        while True:
-            if self.proc.poll() is not None:
-                self.return_code = self.proc.poll()
-            if not self.isReadable:
-                self.proc.stdout.close()
-                break
-            sleep(Settings().get("shell_refresh_interval"))
-        if self.return_code is None:
-            self.kill(self.proc)
-        return {
-            "elapse_time": time() - start_time,
-            "data": self.data_out,
-            "return_code": self.return_code
-        }
-
-    def popen(self, cmd, cwd):
-        if sys.platform == "win32":
-            return subprocess.Popen(
-                shlex.split(cmd), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT, cwd=cwd, shell=True
-            )
-        elif sys.platform == "darwin":
-            return subprocess.Popen(
-                ["/bin/bash", "-l", "-c", cmd], stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd,
-                shell=False
-            )
-        elif sys.platform == "linux":
-            return subprocess.Popen(
-                ["/bin/bash", "-c", cmd], stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd,
-                shell=False
-            )
-        else:
-            return subprocess.Popen(
-                shlex.split(cmd), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT, cwd=cwd, shell=False
-            )
-
-    def kill(self, proc):
-        if sys.platform == "win32":
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            subprocess.Popen(
-                "taskkill /F /PID %s /T" % (str(proc.pid)),
-                startupinfo=startupinfo
-            )
-        else:
-            proc.terminate()
-
-    def read_stdout(self):
-        while self.proc.poll() is None:
-            data = os.read(self.proc.stdout.fileno(), 512)
-            if len(data) > 0:
-                decoded_data = data.decode(
-                    Settings().get("encoding"),
-                    Settings().get("encoding_handle")
-                ).replace("\r\n", "\n")
-                if self.data_out is None:
-                    self.data_out = decoded_data
-                else:
-                    self.data_out += decoded_data
-            elif self.proc.poll() is not None:
-                break
-            sleep(Settings().get("shell_refresh_interval"))
-        self.isReadable = False
+    def run(self, cmds, cwd=None, timeout=None):
+        result = ProcessRunner(cmds, cwd, timeout=timeout).run()
+        self.data_out = result.data
+        self.return_code = result.return_code
+        return result.to_dict()
@@ -0,0 +1,157 @@
+import queue
+import subprocess
+import threading
+from time import time
+
+
+class HelperServer:
+
+    """
+    A long-lived helper process which answers the queries through its
+        standard input and output
+
+    Each request is a single line contains the same arguments as a helper
+        query, and each response is a list of result lines follows by an end
+        line (RESPONSE_END follows by a return code). Helper process should
+        exit when its standard input is closed
+    """
+
+    RESPONSE_END = "\x04"
+
+    def __init__(self, args, idle_timeout=0, encoding="utf-8", cwd=None):
+        """
+        @param args: a list of arguments to start a helper process
+        @param idle_timeout: a duration in seconds until an unused helper
+            process will be stopped, or 0 to keep it running
+        @param encoding: an encoding of helper's input and output
+        @param cwd: a working directory of helper process
+        """
+        self.args = args
+        self.cwd = cwd
+        self.idle_timeout = idle_timeout
+        self.encoding = encoding
+        self.proc = None
+        self.lines = None
+        self.idle_timer = None
+        # Whether the last query has been abandoned
+        self.abandoned = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        """
+        Starts a helper process
+        """
+        self.proc = subprocess.Popen(
+            self.args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, cwd=self.cwd
+        )
+        self.lines = queue.Queue()
+        reader = threading.Thread(
+            target=self.read_stdout,
+            args=[self.proc.stdout, self.lines]
+        )
+        reader.daemon = True
+        reader.start()
+
+    def read_stdout(self, stdout, lines):
+        for line in stdout:
+            lines.put(line.decode(self.encoding, "replace").rstrip("\r\n"))
+        lines.put(None)
+
+    def is_alive(self):
+        """
+        Returns whether a helper process is running or not
+        """
+        return self.proc is not None and self.proc.poll() is None
+
+    def query(self, query, timeout=None):
+        """
+        Returns an output of a specified query in the same format as
+            GenericBlockShell, or None if helper process cannot answer it
+
+        @param query: a query arguments
+        @param timeout: a maximum duration in seconds to wait for each line
+        """
+        with self.lock:
+            self.abandoned = False
+            self.cancel_idle_timer()
+            if not self.is_alive():
+                try:
+                    self.start()
+                except OSError:
+                    self.stop()
+                    return None
+            start_time = time()
+            data = []
+            return_code = None
+            try:
+                self.proc.stdin.write((query + "\n").encode(self.encoding))
+                self.proc.stdin.flush()
+                while return_code is None:
+                    line = self.lines.get(timeout=timeout)
+                    if line is None:
+                        break
+                    elif line.startswith(self.RESPONSE_END):
+                        return_code = int(line[len(self.RESPONSE_END):] or 0)
+                    else:
+                        data.append(line)
+            except (OSError, ValueError, queue.Empty):
+                pass
+            if return_code is None:
+                self.stop()
+                return None
+            self.start_idle_timer()
+            return {
+                "elapse_time": time() - start_time,
+                "data": "\n".join(data + [""]) if data else None,
+                "return_code": return_code
+            }
+
+    def start_idle_timer(self):
+        if self.idle_timeout <= 0:
+            return
+        self.idle_timer = threading.Timer(self.idle_timeout, self.shutdown)
+        self.idle_timer.daemon = True
+        self.idle_timer.start()
+
+    def cancel_idle_timer(self):
+        if self.idle_timer:
+            self.idle_timer.cancel()
+            self.idle_timer = None
+
+    def stop(self):
+        self.cancel_idle_timer()
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        if self.proc.poll() is None:
+            try:
+                self.proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self.proc.stdout.close()
+        self.proc = None
+
+    def abandon(self):
+        """
+        Kills a helper process without waiting for the running query, the
+            running query will returns None
+        """
+        self.abandoned = True
+        proc = self.proc
+        if proc is not None and proc.poll() is None:
+            try:
+                proc.kill()
+            except OSError:
+                pass
+
+    def shutdown(self):
+        """
+        Stops a helper process
+        """
+        with self.lock:
+            self.stop()
@@ -2,9 +2,14 @@ import sublime
 import hashlib
 import os
 import shlex
+import threading
+import time
+from .artifact_registry import ArtifactRegistry
+from .class_path_scanner import ClassPathScanner
 from .dependency_manager import DependencyManager
-from .generic_shell import GenericBlockShell
+from .helper_server import HelperServer
 from .logger import Logger
+from .process_runner import ProcessRunner
 from .settings import Settings
 
 
@@ -14,12 +19,27 @@ class _HelperService:
     A Javatar autocomplete helper class for deep Java information query
     """
 
+    # Duration in seconds until a failed helper server will be tried again,
+    #     doubled on each consecutive failure up to the maximum duration
+    SERVER_RETRY_DELAY = 30
+    SERVER_MAX_RETRY_DELAY = 600
+
     @classmethod
     def instance(cls):
         if not hasattr(cls, "_instance"):
             cls._instance = cls()
         return cls._instance
 
+    def __init__(self):
+        self.helper_digest = None
+        self.server = None
+        self.unsupported_server_args = None
+        self.server_failures = 0
+        self.server_retry_time = 0
+        self.server_lock = threading.Lock()
+        self.query_cache = {}
+        self.query_cache_lock = threading.Lock()
+
     def startup(self):
         """
         Check and extract helper files
@@ -55,6 +75,17 @@ class _HelperService:
                 "Packages/Javatar/binary/JavatarAutocompleteHelper.jar"
             ))
             helper_file.close()
+            ArtifactRegistry().get_digest(file_path)
+
+    def get_helper_digest(self):
+        """
+        Returns a SHA-256 digest of a bundled helper file
+        """
+        if not self.helper_digest:
+            self.helper_digest = hashlib.sha256(sublime.load_binary_resource(
+                "Packages/Javatar/binary/JavatarAutocompleteHelper.jar"
+            )).hexdigest()
+        return self.helper_digest
 
     def verify_helper(self, path):
         """
@@ -62,18 +93,14 @@ class _HelperService:
 
         @param path: a path to helper file
         """
+        return ArtifactRegistry().is_verified(path, self.get_helper_digest())
 
-        helper_file = open(path, "rb")
-        actual_hash = hashlib.sha256(
-            helper_file.read()
-        ).hexdigest()
-        helper_file.close()
-        expected_hash = hashlib.sha256(sublime.load_binary_resource(
-            "Packages/Javatar/binary/JavatarAutocompleteHelper.jar"
-        )).hexdigest()
-        return actual_hash == expected_hash
-
-    def query_data(self, query):
+    def get_query_environment(self):
+        """
+        Returns a dict contains a helper file, a Java executable, a list of
+            class paths and a list of package exclusions to be used in a query,
+            or None if helper cannot be used
+        """
         from .jdk_manager import JDKManager
         helpers = sublime.find_resources("JavatarAutocompleteHelper.jar")
         helper_file = None
@@ -97,47 +124,242 @@ class _HelperService:
         runtime_path = JDKManager().get_runtime_file("runtime")
         if runtime_path:
             dependencies.append(runtime_path)
-        exclusion = Settings().get("java_exclude_packages", [])
+        return {
+            "helper_file": helper_file,
+            "executable": executable,
+            "dependencies": dependencies,
+            "exclusion": Settings().get("java_exclude_packages", [])
+        }
+
+    def query_data(self, query, environment=None):
+        environment = environment or self.get_query_environment()
+        if not environment:
+            return None
+        helper_file = environment["helper_file"]
+        executable = environment["executable"]
+        dependencies = environment["dependencies"]
+        exclusion = environment["exclusion"]
 
+        args = [executable, "-jar", helper_file]
         if exclusion:
-            exclusion = " -xp %s" % (shlex.quote(os.pathsep.join(exclusion)))
-        else:
-            exclusion = ""
+            args += ["-xp", os.pathsep.join(exclusion)]
         if dependencies:
-            dependencies = " -cp %s" % (shlex.quote(os.pathsep.join(dependencies)))
-        else:
-            dependencies = ""
-
-        helper_script = "%s -jar %s%s%s %s" % (
-            shlex.quote(executable),
-            shlex.quote(helper_file),
-            exclusion,
-            dependencies,
-            query
+            args += ["-cp", os.pathsep.join(dependencies)]
+
+        if Settings().get("helper_server"):
+            output = self.query_server(args + ["--server"], query)
+            if output is not None:
+                return output
+
+        return ProcessRunner(args + shlex.split(query)).run().to_dict()
+
+    def query_server(self, args, query):
+        """
+        Returns an output of a specified query from a helper server,
+            or None if the helper server cannot be used
+
+        Helper server will be restarted when the arguments (such as class
+            paths) are changed, a failed helper server will not be used
+            until its retry delay has passed
+
+        @param args: a list of arguments to start a helper server
+        @param query: a query arguments
+        """
+        with self.server_lock:
+            if (args == self.unsupported_server_args and
+                    time.time() < self.server_retry_time):
+                return None
+            if self.server and self.server.args != args:
+                self.server.shutdown()
+                self.server = None
+            if not self.server:
+                self.server = HelperServer(
+                    args,
+                    idle_timeout=Settings().get(
+                        "helper_server_idle_timeout", 0
+                    ),
+                    encoding=Settings().get("encoding", "utf-8")
+                )
+            server = self.server
+        output = server.query(
+            query, timeout=Settings().get("helper_server_timeout")
+        )
+        with self.server_lock:
+            if output is not None:
+                self.unsupported_server_args = None
+                self.server_failures = 0
+                return output
+            if args != self.unsupported_server_args:
+                self.server_failures = 0
+            retry_delay = min(
+                self.SERVER_RETRY_DELAY * 2 ** self.server_failures,
+                self.SERVER_MAX_RETRY_DELAY
+            )
+            self.unsupported_server_args = args
+            self.server_failures += 1
+            self.server_retry_time = time.time() + retry_delay
+        Logger().warning(
+            "Helper server is not available, fallback to helper query " +
+            "for %s seconds" % (retry_delay)
         )
-        return GenericBlockShell().run(helper_script)
+        return None
+
+    def shutdown_server(self):
+        """
+        Stops a running helper server
+        """
+        with self.server_lock:
+            if self.server:
+                self.server.shutdown()
+                self.server = None
+
+    def get_query_fingerprint(self, environment):
+        """
+        Returns a fingerprint of a query environment, which will be changed
+            when any of class paths has been modified
+
+        @param environment: a query environment
+        """
+        fingerprint = [
+            environment["executable"],
+            ArtifactRegistry().get_digest(environment["helper_file"]),
+            environment["exclusion"]
+        ]
+        for dependency in environment["dependencies"]:
+            try:
+                mtime = os.path.getmtime(dependency)
+            except OSError:
+                mtime = None
+            fingerprint.append([dependency, mtime])
+        return hashlib.sha1(repr(fingerprint).encode()).hexdigest()
+
+    def get_query_cache_dir(self):
+        return os.path.join(sublime.cache_path(), "Javatar", "Helper")
+
+    def get_query_cache(self, fingerprint):
+        """
+        Returns a query cache for a specified fingerprint from memory or disk
+
+        @param fingerprint: a query environment fingerprint
+        """
+        with self.query_cache_lock:
+            if self.query_cache.get("fingerprint") == fingerprint:
+                return self.query_cache
+            self.query_cache = {
+                "fingerprint": fingerprint,
+                "packages": None,
+                "classes": {}
+            }
+            cache_path = os.path.join(self.get_query_cache_dir(), fingerprint)
+            if os.path.exists(cache_path):
+                try:
+                    cache_file = open(cache_path, "r")
+                    self.query_cache.update(
+                        sublime.decode_value(cache_file.read())
+                    )
+                    cache_file.close()
+                except Exception as e:
+                    Logger().warning(
+                        "Cannot load helper query cache: %s" % (str(e))
+                    )
+            return self.query_cache
+
+    def save_query_cache(self, cache):
+        """
+        Writes a specified query cache to disk
+
+        @param cache: a query cache
+        """
+        cache_dir = self.get_query_cache_dir()
+        try:
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            cache_path = os.path.join(cache_dir, cache["fingerprint"])
+            with self.query_cache_lock:
+                data = sublime.encode_value(cache)
+            cache_file = open(cache_path + ".tmp", "w")
+            cache_file.write(data)
+            cache_file.close()
+            os.replace(cache_path + ".tmp", cache_path)
+        except Exception as e:
+            Logger().warning("Cannot save helper query cache: %s" % (str(e)))
+
+    def reset_query_cache(self):
+        """
+        Clears all query results from memory
+
+        Query results on disk will be reused only if the query environment
+            has the same fingerprint
+        """
+        with self.query_cache_lock:
+            self.query_cache = {}
 
     def get_packages(self):
-        query = "-p"
-        output = self.query_data(query)
-        packages = []
-        if output and output["data"] and output["return_code"] == 0:
-            packages = output["data"].strip().split("\n")
-        return packages
+        """
+        Returns a list of packages within class paths
+
+        Class paths will be read directly if "scan_class_paths" is enabled,
+            the helper will only be queried when they cannot be read
+        """
+        if Settings().get("scan_class_paths"):
+            packages = ClassPathScanner().get_packages()
+            if packages is not None:
+                return packages
+        environment = self.get_query_environment()
+        if not environment:
+            return []
+        cache = self.get_query_cache(self.get_query_fingerprint(environment))
+        if cache["packages"] is None:
+            query = "-p"
+            output = self.query_data(query, environment)
+            if not output or output["return_code"] != 0:
+                return []
+            packages = []
+            if output["data"]:
+                packages = output["data"].strip().split("\n")
+            with self.query_cache_lock:
+                cache["packages"] = packages
+            self.save_query_cache(cache)
+        return list(cache["packages"])
 
     def get_class_paths_for_classes(self, class_names):
-        query = "-t %s" % (os.pathsep.join(class_names))
-        output = self.query_data(query)
-        class_paths = {}
-        if output and output["data"] and output["return_code"] == 0:
-            paths = output["data"].strip().split("\n")
-            for path in paths:
-                name, class_path = path.split(";")
-                if name in class_paths:
-                    class_paths[name].append(class_path)
-                else:
-                    class_paths[name] = [class_path]
-        return class_paths
+        """
+        Returns a dict of class name and a list of its class paths
+
+        Only class names which are not in the cache will be queried
+
+        @param class_names: a list of class names
+        """
+        environment = self.get_query_environment()
+        if not environment:
+            return {}
+        cache = self.get_query_cache(self.get_query_fingerprint(environment))
+        missing_names = []
+        for class_name in class_names:
+            if (class_name not in cache["classes"] and
+                    class_name not in missing_names):
+                missing_names.append(class_name)
+        if missing_names:
+            query = "-t %s" % (os.pathsep.join(missing_names))
+            output = self.query_data(query, environment)
+            if output and output["return_code"] == 0:
+                class_paths = {class_name: [] for class_name in missing_names}
+                if output["data"]:
+                    paths = output["data"].strip().split("\n")
+                    for path in paths:
+                        name, class_path = path.split(";")
+                        if name in class_paths:
+                            class_paths[name].append(class_path)
+                        else:
+                            class_paths[name] = [class_path]
+                with self.query_cache_lock:
+                    cache["classes"].update(class_paths)
+                self.save_query_cache(cache)
+        return {
+            class_name: list(cache["classes"][class_name])
+            for class_name in class_names
+            if cache["classes"].get(class_name)
+        }
 
 
 def HelperService():
@@ -1,20 +1,97 @@
 import sublime
 import os
+import threading
+from collections import OrderedDict
 from .action_history import ActionHistory
+from .class_path_scanner import ClassPathScanner
 from .helper_service import HelperService
 from .java_utils import JavaClassPath, JavaUtils
+from .project_index import ProjectIndex
 from .state_property import StateProperty
 from .settings import Settings
-from ..parser.GrammarParser import GrammarParser
+from ..parser.GrammarParser import CompiledGrammar, GrammarParser
 
 
 class _JavaStructure:
+    GRAMMAR_RESOURCE = "Packages/Javatar/grammars/Java8.javatar-grammar"
+
     @classmethod
     def instance(cls):
         if not hasattr(cls, "_instance"):
             cls._instance = cls()
         return cls._instance
 
+    def __init__(self):
+        self.grammar = None
+        self.grammar_version = None
+        self.parse_cache_lock = threading.Lock()
+        self.reset_parse_cache()
+
+    def reset_parse_cache(self):
+        """
+        Clears all parsed files and its statistics
+        """
+        with self.parse_cache_lock:
+            # File path -> {"key": (mtime, size, grammar), "nodes": nodes}
+            self.parse_cache = OrderedDict()
+            self.parse_cache_nodes = 0
+            self.parse_cache_hits = 0
+            self.parse_cache_misses = 0
+
+    def get_parse_cache_stats(self):
+        """
+        Returns a parse cache statistics
+        """
+        return {
+            "files": len(self.parse_cache),
+            "nodes": self.parse_cache_nodes,
+            "hits": self.parse_cache_hits,
+            "misses": self.parse_cache_misses
+        }
+
+    def get_grammar_version(self):
+        """
+        Returns a version of the grammar resource based on its file stats
+        """
+        grammar_paths = [
+            os.path.join(
+                sublime.packages_path(), self.GRAMMAR_RESOURCE[9:]
+            ),
+            os.path.join(
+                sublime.installed_packages_path(), "Javatar.sublime-package"
+            )
+        ]
+        version = []
+        for grammar_path in grammar_paths:
+            if os.path.exists(grammar_path):
+                stat = os.stat(grammar_path)
+                version.append((grammar_path, stat.st_mtime, stat.st_size))
+        return tuple(version)
+
+    def get_grammar(self):
+        """
+        Returns a compiled Java grammar
+
+        The grammar will be loaded and compiled only once and will be reused
+            until the grammar resource has been changed
+        """
+        grammar_version = self.get_grammar_version()
+        if self.grammar is None or self.grammar_version != grammar_version:
+            self.grammar = CompiledGrammar(sublime.decode_value(
+                sublime.load_resource(self.GRAMMAR_RESOURCE)
+            ))
+            self.grammar_version = grammar_version
+        return self.grammar
+
+    def create_parser(self):
+        """
+        Returns a new Java grammar parser using the shared compiled grammar
+        """
+        return GrammarParser(
+            self.get_grammar(),
+            packrat=Settings().get("packrat_parsing", False)
+        )
+
     def file_with_class_path(self, class_path):
         class_path = JavaClassPath(class_path)
         jpackage = class_path.get_package()
@@ -49,28 +126,8 @@ class _JavaStructure:
                 on_complete=callback
             )
         class_paths = {}
-        found_classes = []
         if include_local:
-            for source_folder in StateProperty().get_source_folders():
-                for root, dir_names, file_names in os.walk(source_folder):
-                    for file_name in file_names:
-                        for class_name in classes:
-                            if file_name != class_name + ".java":
-                                continue
-                            class_path = ".".join([
-                                x for x in [
-                                    JavaUtils().to_package(
-                                        root
-                                    ).as_class_path(),
-                                    class_name
-                                ] if x
-                            ])
-                            if class_name in class_paths:
-                                class_paths[class_name].append(class_path)
-                            else:
-                                class_paths[class_name] = [class_path]
-                            if class_name not in found_classes:
-                                found_classes.append(class_name)
+            class_paths = ProjectIndex().get_class_paths_for_classes(classes)
 
         cont = True
         if custom_filter:
@@ -81,7 +138,13 @@ class _JavaStructure:
                 else:
                     class_paths[class_name] = cl_paths[class_name]
         if cont:
-            cl_paths = HelperService().get_class_paths_for_classes(classes)
+            cl_paths = None
+            if Settings().get("scan_class_paths"):
+                cl_paths = ClassPathScanner().get_class_paths_for_classes(
+                    classes
+                )
+            if cl_paths is None:
+                cl_paths = HelperService().get_class_paths_for_classes(classes)
             for class_name in cl_paths:
                 if class_name in class_paths:
                     class_paths[class_name] += cl_paths[class_name]
@@ -91,21 +154,57 @@ class _JavaStructure:
             class_paths[class_name].sort()
         return class_paths
 
+    def parse_file(self, file_path):
+        """
+        Returns a list of nodes from a parsed Java file,
+            or None if the file cannot be parsed
+
+        The nodes will be reused until the file or the grammar has been changed
+
+        @param file_path: a Java file path
+        """
+        stat = os.stat(file_path)
+        self.get_grammar()
+        cache_key = (stat.st_mtime, stat.st_size, self.grammar_version)
+        with self.parse_cache_lock:
+            if (file_path in self.parse_cache and
+                    self.parse_cache[file_path]["key"] == cache_key):
+                self.parse_cache.move_to_end(file_path)
+                self.parse_cache_hits += 1
+                return self.parse_cache[file_path]["nodes"]
+            self.parse_cache_misses += 1
+
+        parser = self.create_parser()
+        java_file = open(file_path, "r")
+        source_code = java_file.read()
+        java_file.close()
+        parse_output = parser.parse_grammar(source_code)
+        nodes = parser.find_all() if parse_output["success"] else None
+
+        with self.parse_cache_lock:
+            if file_path in self.parse_cache:
+                self.parse_cache_nodes -= len(
+                    self.parse_cache.pop(file_path)["nodes"] or []
+                )
+            self.parse_cache[file_path] = {"key": cache_key, "nodes": nodes}
+            self.parse_cache_nodes += len(nodes or [])
+            # Remove least recently used files, except the latest one
+            cache_size = Settings().get("parse_cache_size", 0)
+            while (len(self.parse_cache) > 1 and
+                    self.parse_cache_nodes > cache_size):
+                _, cache = self.parse_cache.popitem(last=False)
+                self.parse_cache_nodes -= len(cache["nodes"] or [])
+        return nodes
+
     def package_declarations_in_file(self, file_path):
         if not JavaUtils().is_java_file(file_path):
             return []
         try:
-            parser = GrammarParser(sublime.decode_value(sublime.load_resource(
-                "Packages/Javatar/grammars/Java8.javatar-grammar"
-            )))
-
-            java_file = open(file_path, "r")
-            source_code = java_file.read()
-            java_file.close()
-            parse_output = parser.parse_grammar(source_code)
-            if parse_output["success"]:
-                return parser.find_by_selectors(
-                    Settings().get("package_declaration_selector")
+            nodes = self.parse_file(file_path)
+            if nodes is not None:
+                return GrammarParser.filter_by_selectors(
+                    Settings().get("package_declaration_selector"),
+                    nodes
                 )
         except Exception as e:
             ActionHistory().add_action(
@@ -124,31 +223,27 @@ class _JavaStructure:
             "types": []
         }
         try:
-            parser = GrammarParser(sublime.decode_value(sublime.load_resource(
-                "Packages/Javatar/grammars/Java8.javatar-grammar"
-            )))
-
-            java_file = open(file_path, "r")
-            source_code = java_file.read()
-            java_file.close()
-            parse_output = parser.parse_grammar(source_code)
-            if parse_output["success"]:
-                type_declarations = parser.find_by_selectors(
-                    Settings().get("type_selectors")
+            nodes = self.parse_file(file_path)
+            if nodes is not None:
+                type_declarations = GrammarParser.filter_by_selectors(
+                    Settings().get("type_selectors"),
+                    nodes
                 )
                 for type_declaration in type_declarations:
                     imports_and_types["types"].append(
                         type_declaration["value"]
                     )
 
-                declarations = parser.find_by_selectors(
-                    Settings().get("declarations_selector")
-                )
-                imports_and_types["import_nodes"] = parser.find_by_selectors(
+                declarations = GrammarParser.filter_by_selectors(
+                    Settings().get("declarations_selector"),
+                    nodes
+                ) or nodes
+                import_nodes = GrammarParser.filter_by_selectors(
                     Settings().get("import_declaration_selector"),
                     declarations
                 )
-                import_declarations = parser.find_by_selectors(
+                imports_and_types["import_nodes"] = import_nodes
+                import_declarations = GrammarParser.filter_by_selectors(
                     Settings().get("import_declaration_package_selector"),
                     declarations
                 )
@@ -170,27 +265,21 @@ class _JavaStructure:
             return []
         classes = []
         try:
-            parser = GrammarParser(sublime.decode_value(sublime.load_resource(
-                "Packages/Javatar/grammars/Java8.javatar-grammar"
-            )))
-
-            java_file = open(file_path, "r")
-            source_code = java_file.read()
-            java_file.close()
-            parse_output = parser.parse_grammar(source_code)
-            if parse_output["success"]:
-                class_names = parser.find_by_selectors(
+            nodes = self.parse_file(file_path)
+            if nodes is not None:
+                class_names = GrammarParser.filter_by_selectors(
                     Settings().get("class_declaration_name_selector"),
+                    nodes
                 )
                 for class_name in class_names:
-                    nodes = parser.find_by_selectors(
-                        Settings().get("class_members_filter_selector") % (
-                            class_name["value"]
-                        )
-                    )
                     classes.append({
                         "name": class_name["value"],
-                        "nodes": nodes
+                        "nodes": GrammarParser.filter_by_selectors(
+                            Settings().get("class_members_filter_selector") % (
+                                class_name["value"]
+                            ),
+                            nodes
+                        )
                     })
         except Exception as e:
             ActionHistory().add_action(
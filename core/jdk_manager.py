@@ -37,7 +37,9 @@ class _JDKManager:
 
         @param jdks: JDKs informations
         """
+        from .helper_service import HelperService
         self.jdks = jdks
+        HelperService().reset_query_cache()
         if on_done:
             on_done()
 
@@ -0,0 +1,195 @@
+import sublime
+import os
+import queue
+import shutil
+import sys
+import threading
+from .logger import Logger
+from .settings import Settings
+
+
+class _JDKProbe:
+
+    """
+    A persistent cache of JDK probe results (such as "java -version") which
+        is shared across sessions
+
+    A probe result is keyed by its executable path and modification time,
+        so an executable only needs to be probed again after it is changed
+    """
+
+    CACHE_VERSION = 1
+
+    @classmethod
+    def instance(cls):
+        if not hasattr(cls, "_instance"):
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # Executable real path -> {
+        #     "mtime": mtime, "size": size, "results": {name: result}
+        # }
+        self.executables = None
+        self.changed = False
+
+    def get_cache_path(self):
+        """
+        Returns a path to the probe cache file
+        """
+        return os.path.join(sublime.cache_path(), "Javatar", "jdk_probes.json")
+
+    def load_cache(self):
+        """
+        Load the probe cache if not already loaded
+        """
+        with self.lock:
+            if self.executables is not None:
+                return
+            self.executables = {}
+            self.changed = False
+            cache_path = self.get_cache_path()
+            if not os.path.exists(cache_path):
+                return
+            try:
+                cache_file = open(cache_path, "r")
+                cache = sublime.decode_value(cache_file.read())
+                cache_file.close()
+                if cache.get("version") == self.CACHE_VERSION:
+                    self.executables = cache["executables"]
+            except Exception as e:
+                Logger().warning("Cannot load JDK probe cache: %s" % (str(e)))
+
+    def save_cache(self):
+        """
+        Write the probe cache to the cache file if it has been changed,
+            executables which are no longer exist will be removed
+        """
+        with self.lock:
+            if not self.executables:
+                return
+            for executable in list(self.executables):
+                if not os.path.isfile(executable):
+                    del self.executables[executable]
+                    self.changed = True
+            if not self.changed:
+                return
+            cache_path = self.get_cache_path()
+            try:
+                if not os.path.isdir(os.path.dirname(cache_path)):
+                    os.makedirs(os.path.dirname(cache_path))
+                temp_path = cache_path + ".tmp"
+                cache_file = open(temp_path, "w")
+                cache_file.write(sublime.encode_value({
+                    "version": self.CACHE_VERSION,
+                    "executables": self.executables
+                }))
+                cache_file.close()
+                os.replace(temp_path, cache_path)
+                self.changed = False
+            except Exception as e:
+                Logger().warning("Cannot save JDK probe cache: %s" % (str(e)))
+
+    def get_executable_path(self, executable):
+        """
+        Returns a real path to a specified executable, or None if the
+            executable cannot be found
+
+        @param executable: an executable path or name
+        """
+        if not os.path.dirname(executable):
+            executable = shutil.which(executable)
+            if not executable:
+                return None
+        executable = os.path.realpath(executable)
+        if sys.platform == "win32" and not os.path.isfile(executable):
+            executable += ".exe"
+        if not os.path.isfile(executable):
+            return None
+        return executable
+
+    def get(self, executable, name, probe):
+        """
+        Returns a cached result of a specified probe, or runs the probe and
+            caches its result if the executable has been changed
+
+        Empty results will not be cached, so failed probes will be run again
+            on the next call
+
+        @param executable: an executable path or name to be probed
+        @param name: a probe name
+        @param probe: a function returns a probe result
+        """
+        executable_path = self.get_executable_path(executable)
+        if not executable_path:
+            return probe()
+        try:
+            stat = os.stat(executable_path)
+        except OSError:
+            return probe()
+        with self.lock:
+            self.load_cache()
+            entry = self.executables.get(executable_path)
+            if (entry and entry["mtime"] == stat.st_mtime and
+                    entry["size"] == stat.st_size and
+                    name in entry["results"]):
+                return entry["results"][name]
+        result = probe()
+        if not result:
+            return result
+        with self.lock:
+            entry = self.executables.get(executable_path)
+            if (not entry or entry["mtime"] != stat.st_mtime or
+                    entry["size"] != stat.st_size):
+                entry = {
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                    "results": {}
+                }
+                self.executables[executable_path] = entry
+            entry["results"][name] = result
+            self.changed = True
+        return result
+
+    def run_probes(self, function, items):
+        """
+        Returns a list of results of a specified function on each item, the
+            items will be run on a bounded pool of threads
+
+        @param function: a function to be run on each item
+        @param items: a list of items
+        """
+        items = list(items)
+        results = [None] * len(items)
+        pending_items = queue.Queue()
+        for index, item in enumerate(items):
+            pending_items.put((index, item))
+
+        def run_pending_items():
+            while True:
+                try:
+                    index, item = pending_items.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    results[index] = function(item)
+                except Exception as e:
+                    Logger().warning(
+                        "Cannot probe %s: %s" % (item, str(e))
+                    )
+
+        max_workers = max(1, Settings().get("jdk_probe_workers", 1))
+        workers = [
+            threading.Thread(target=run_pending_items)
+            for _ in range(min(max_workers, len(items)))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
+
+
+def JDKProbe():
+    return _JDKProbe.instance()
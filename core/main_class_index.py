@@ -0,0 +1,200 @@
+import sublime
+import os
+import re
+import threading
+from .event_handler import EventHandler
+from .file_discovery import FileDiscovery
+from .java_structure import JavaStructure
+from .java_utils import JavaUtils
+from .logger import Logger
+from .regex import RE
+from .settings import Settings
+
+
+class _MainClassIndex:
+
+    """
+    A persistent index of Java source files which contain a main method
+
+    A source file will be parsed again only when its size or modification
+        time has been changed, and only when it could contain a main method
+    """
+
+    INDEX_VERSION = 1
+    # Every main method must be matched, the parser will rule out the rest
+    MAIN_PATTERN = re.compile("\\bvoid\\s+main\\s*\\(")
+
+    @classmethod
+    def instance(cls):
+        if not hasattr(cls, "_instance"):
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.index_path = None
+        # File path -> [mtime, size, is main class]
+        self.files = {}
+        self.changed = False
+
+    def startup(self):
+        """
+        Update the index whenever a Java file is saved
+        """
+        EventHandler().register_handler(
+            self, EventHandler().ON_POST_SAVE_ASYNC
+        )
+
+    def on_post_save_async(self, view):
+        file_path = view.file_name()
+        if JavaUtils().is_java_file(file_path):
+            self.is_main_class(file_path)
+
+    def get_index_path(self):
+        """
+        Returns a path to the index file of current project
+        """
+        from .macro import Macro
+        cache_location = Macro().parse(Settings().get(
+            "cache_file_location"
+        ))
+        return os.path.join(cache_location, ".javatar-main-classes")
+
+    def load_index(self):
+        """
+        Load the index of current project if not already loaded
+        """
+        index_path = self.get_index_path()
+        if self.index_path == index_path:
+            return
+        self.index_path = index_path
+        self.files = {}
+        self.changed = False
+        if not os.path.exists(index_path):
+            return
+        try:
+            index_file = open(index_path, "r")
+            index = sublime.decode_value(index_file.read())
+            index_file.close()
+            if index.get("version") == self.INDEX_VERSION:
+                self.files = index["files"]
+        except Exception as e:
+            Logger().warning("Cannot load main class index: %s" % (str(e)))
+
+    def save_index(self):
+        """
+        Write the index to the index file if it has been changed
+        """
+        if not self.index_path or not self.changed:
+            return
+        try:
+            temp_path = self.index_path + ".tmp"
+            index_file = open(temp_path, "w")
+            index_file.write(sublime.encode_value({
+                "version": self.INDEX_VERSION,
+                "files": self.files
+            }))
+            index_file.close()
+            os.replace(temp_path, self.index_path)
+            self.changed = False
+        except Exception as e:
+            Logger().warning("Cannot save main class index: %s" % (str(e)))
+
+    def parse_main_class(self, file_path):
+        """
+        Returns whether a specified Java file contains a main method
+
+        @param file_path: a Java file path
+        """
+        try:
+            java_file = open(file_path, "r", errors="ignore")
+            source_code = java_file.read()
+            java_file.close()
+        except OSError:
+            return False
+        if not self.MAIN_PATTERN.search(source_code):
+            return False
+        for cl in JavaStructure().classes_in_file(file_path):
+            for method in JavaStructure().methods_in_class(cl):
+                if method["name"] != "main":
+                    continue
+                elif len(method["params"]) != 1:
+                    continue
+                elif not RE().get("string_type_match", "^String\\b").search(
+                        method["params"][0]["type"]):
+                    continue
+                return True
+        return False
+
+    def is_main_class(self, file_path):
+        """
+        Returns whether a specified file is a main class
+
+        @param file_path: a file path
+        """
+        with self.lock:
+            self.load_index()
+            is_main = self.update_file(file_path)
+            self.save_index()
+            return is_main
+
+    def update_file(self, file_path):
+        """
+        Updates the index for a specified file if it has been changed and
+            returns whether it is a main class
+
+        @param file_path: a file path
+        """
+        if not JavaUtils().is_java_file(file_path):
+            return False
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        with self.lock:
+            entry = self.files.get(file_path)
+            if (entry and entry[0] == stat.st_mtime and
+                    entry[1] == stat.st_size):
+                return entry[2]
+        is_main = self.parse_main_class(file_path)
+        with self.lock:
+            self.files[file_path] = [stat.st_mtime, stat.st_size, is_main]
+            self.changed = True
+        return is_main
+
+    def get_main_files(self, dir_paths):
+        """
+        Returns a list of main class file paths within specified directories
+
+        @param dir_paths: a list of directory paths
+        """
+        with self.lock:
+            self.load_index()
+            java_files = []
+            for dir_path in dir_paths:
+                java_files += FileDiscovery().get_files(
+                    dir_path, JavaUtils().is_java_file
+                )
+            main_files = [
+                file_path
+                for file_path in java_files
+                if self.update_file(file_path)
+            ]
+            # Forget the removed files
+            existing_files = set(java_files)
+            for file_path in list(self.files):
+                if (file_path not in existing_files and
+                        any(
+                            file_path.startswith(
+                                os.path.join(dir_path, "")
+                            )
+                            for dir_path in dir_paths
+                        )):
+                    del self.files[file_path]
+                    self.changed = True
+            self.save_index()
+            return main_files
+
+
+def MainClassIndex():
+    return _MainClassIndex.instance()
@@ -0,0 +1,209 @@
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+from time import time
+from .logger import Logger
+
+
+class ProcessResult:
+
+    """
+    A result of a process which has been run by a process runner
+    """
+
+    def __init__(self, args, return_code=None, data=None, elapse_time=0,
+                 timed_out=False, cancelled=False, error=None):
+        """
+        @param args: a list of arguments (or a command) of the process
+        @param return_code: a return code, or None if the process cannot
+            be started
+        @param data: a decoded output, or None if there is no output
+        @param elapse_time: a duration in seconds the process has been run
+        @param timed_out: a boolean specified whether the process has been
+            killed after the timeout or not
+        @param cancelled: a boolean specified whether the process has been
+            cancelled or not
+        @param error: an error message if the process cannot be started
+        """
+        self.args = args
+        self.return_code = return_code
+        self.data = data
+        self.elapse_time = elapse_time
+        self.timed_out = timed_out
+        self.cancelled = cancelled
+        self.error = error
+
+    def is_success(self):
+        return (self.return_code == 0 and
+                not self.timed_out and
+                not self.cancelled)
+
+    def to_dict(self):
+        """
+        Returns a dict in the same format as a generic block shell output
+        """
+        return {
+            "elapse_time": self.elapse_time,
+            "data": self.data,
+            "return_code": self.return_code
+        }
+
+
+class ProcessRunner:
+
+    """
+    Runs a process and waits for its output
+
+    A list of arguments will always be executed directly, a command string
+        will be executed directly as well unless it uses any shell feature
+    """
+
+    # Characters which have a meaning to the shell other than quoting
+    SHELL_PATTERN = re.compile("[|&;<>()$`*?\\[\\]{}~!#\\n]")
+
+    def __init__(self, args, cwd=None, env=None, timeout=None):
+        """
+        @param args: a list of arguments, or a command string
+        @param cwd: a working directory
+        @param env: a dict of environment variables to override, None value
+            will remove the variable
+        @param timeout: a maximum duration in seconds before the process
+            will be killed
+        """
+        self.args = args
+        self.cwd = cwd or None
+        self.env = env
+        self.timeout = timeout
+        self.proc = None
+        self.cancelled = False
+        self.lock = threading.Lock()
+
+    @classmethod
+    def split_command(cls, command):
+        """
+        Returns a tuple of a list of arguments to execute a specified command
+            string and whether it must be run by the system shell
+
+        @param command: a command string
+        """
+        if sys.platform == "win32":
+            return (shlex.split(command), True)
+        args = None
+        if not cls.SHELL_PATTERN.search(command):
+            try:
+                args = shlex.split(command)
+            except ValueError:
+                args = None
+        if args and "=" not in args[0]:
+            # Login shell provides the user's paths to a command name on OS X
+            if sys.platform != "darwin" or os.path.isabs(args[0]):
+                return (args, False)
+        if sys.platform == "darwin":
+            return (["/bin/bash", "-l", "-c", command], False)
+        elif sys.platform == "linux":
+            return (["/bin/bash", "-c", command], False)
+        return (shlex.split(command), False)
+
+    @classmethod
+    def popen(cls, args, cwd=None, env=None, stdin=subprocess.PIPE):
+        """
+        Starts a process with its output (and error) piped and returns it
+
+        @param args: a list of arguments, or a command string
+        @param cwd: a working directory
+        @param env: a dict of environment variables to override
+        @param stdin: a standard input of the process
+        """
+        shell = False
+        if isinstance(args, str):
+            args, shell = cls.split_command(args)
+        startupinfo = None
+        if sys.platform == "win32" and not shell:
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        if env:
+            environment = dict(os.environ)
+            for key, value in env.items():
+                if value is None:
+                    environment.pop(key, None)
+                else:
+                    environment[key] = value
+            env = environment
+        return subprocess.Popen(
+            args, stdin=stdin, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, cwd=cwd or None, env=env or None,
+            shell=shell, startupinfo=startupinfo
+        )
+
+    @classmethod
+    def kill(cls, proc):
+        """
+        Kills a specified process (and its child processes on Windows)
+
+        @param proc: a process to kill
+        """
+        if sys.platform == "win32":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            subprocess.Popen(
+                "taskkill /F /PID %s /T" % (str(proc.pid)),
+                startupinfo=startupinfo
+            )
+        else:
+            try:
+                proc.terminate()
+            except OSError:
+                pass
+
+    def run(self, on_data=None):
+        """
+        Runs the process until it is exited, killed after the timeout or
+            cancelled, and returns its result
+
+        @param on_data: a callback receives each decoded chunk of output
+        """
+        from .generic_shell import ShellOutput
+        start_time = time()
+        with self.lock:
+            if self.cancelled:
+                return ProcessResult(self.args, cancelled=True)
+            try:
+                self.proc = self.popen(
+                    self.args, self.cwd, self.env, subprocess.DEVNULL
+                )
+            except OSError as e:
+                Logger().warning("Cannot run %s: %s" % (self.args, str(e)))
+                return ProcessResult(
+                    self.args,
+                    elapse_time=time() - start_time,
+                    error=str(e)
+                )
+        output = ShellOutput(self.proc.stdout, on_data)
+        timed_out = not output.wait(self.timeout)
+        if timed_out:
+            self.kill(self.proc)
+            output.abandon()
+            output.wait(1)
+        return_code = self.proc.wait()
+        with self.lock:
+            self.proc = None
+        return ProcessResult(
+            self.args,
+            return_code=return_code,
+            data=output.read(),
+            elapse_time=time() - start_time,
+            timed_out=timed_out,
+            cancelled=self.cancelled
+        )
+
+    def cancel(self):
+        """
+        Kills the running process, or prevents the process to be started
+        """
+        with self.lock:
+            self.cancelled = True
+            if self.proc and self.proc.poll() is None:
+                self.kill(self.proc)
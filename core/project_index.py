@@ -0,0 +1,279 @@
+import sublime
+import os
+import threading
+import time
+from .event_handler import EventHandler
+from .java_utils import JavaUtils
+from .logger import Logger
+from .settings import Settings
+from .state_property import StateProperty
+
+
+class _ProjectIndex:
+
+    """
+    A persistent index of Java types within project source folders
+
+    Lookups are served from the loaded index, the index is updated in
+        background when a file is saved or at most once every
+        REFRESH_INTERVAL seconds on lookups
+    """
+
+    INDEX_VERSION = 1
+    REFRESH_INTERVAL = 2
+
+    @classmethod
+    def instance(cls):
+        if not hasattr(cls, "_instance"):
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.refresh_lock = threading.Lock()
+        self.refreshing = False
+        self.refresh_pending = False
+        self.refresh_time = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Clears the loaded index
+        """
+        with self.lock:
+            self.index_path = None
+            # Source folder -> {relative dir: [mtime, dirs, types, package]}
+            self.folders = {}
+            # Class name -> list of class paths
+            self.classes = {}
+
+    def startup(self):
+        """
+        Build the index in background and update it whenever a file is saved
+        """
+        EventHandler().register_handler(
+            self, EventHandler().ON_POST_SAVE_ASYNC
+        )
+        self.refresh_index(force=True)
+
+    def on_post_save_async(self, view):
+        if JavaUtils().is_java_file(view.file_name()):
+            self.refresh_index(force=True)
+
+    def get_index_path(self):
+        """
+        Returns a path to the index file of current project
+        """
+        from .macro import Macro
+        cache_location = Macro().parse(Settings().get(
+            "cache_file_location"
+        ))
+        return os.path.join(cache_location, ".javatar-index")
+
+    def load_index(self, index_path):
+        """
+        Load the index from a specified index file if not already loaded
+
+        @param index_path: a path to the index file
+        """
+        if self.index_path == index_path:
+            return
+        self.index_path = index_path
+        self.folders = {}
+        if os.path.exists(index_path):
+            try:
+                index_file = open(index_path, "r")
+                index = sublime.decode_value(index_file.read())
+                index_file.close()
+                if index.get("version") == self.INDEX_VERSION:
+                    self.folders = index["folders"]
+            except Exception as e:
+                Logger().warning(
+                    "Cannot load project index: %s" % (str(e))
+                )
+        self.update_classes()
+
+    def save_index(self):
+        """
+        Write the index to the index file
+        """
+        if not self.index_path:
+            return
+        try:
+            temp_path = self.index_path + ".tmp"
+            index_file = open(temp_path, "w")
+            index_file.write(sublime.encode_value({
+                "version": self.INDEX_VERSION,
+                "folders": self.folders
+            }))
+            index_file.close()
+            os.replace(temp_path, self.index_path)
+        except Exception as e:
+            Logger().warning("Cannot save project index: %s" % (str(e)))
+
+    def index_directory(self, dir_path):
+        """
+        Returns an index entry for a specified directory
+
+        @param dir_path: a path to the directory
+        """
+        dir_names = []
+        types = []
+        for file_name in sorted(os.listdir(dir_path)):
+            file_path = os.path.join(dir_path, file_name)
+            if os.path.isdir(file_path):
+                # Same as os.walk, symbolic links to directories are skipped
+                if not os.path.islink(file_path):
+                    dir_names.append(file_name)
+            elif file_name.endswith(".java"):
+                types.append(file_name[:-5])
+        return [
+            os.stat(dir_path).st_mtime,
+            dir_names,
+            types,
+            JavaUtils().to_package(dir_path).as_class_path()
+        ]
+
+    def update_folder(self, source_folder, entries):
+        """
+        Returns an updated index entries for a specified source folder and
+            whether the entries are changed or not
+
+        Only directories which has been changed will be listed again
+
+        @param source_folder: a path to the source folder
+        @param entries: a previous index entries of the source folder
+        """
+        updated_entries = {}
+        changed = False
+        dir_stack = [""]
+        while dir_stack:
+            relative_dir = dir_stack.pop()
+            dir_path = os.path.join(source_folder, relative_dir)
+            try:
+                mtime = os.stat(dir_path).st_mtime
+                entry = entries.get(relative_dir)
+                if not entry or entry[0] != mtime:
+                    entry = self.index_directory(dir_path)
+                    changed = True
+            except OSError:
+                changed = True
+                continue
+            updated_entries[relative_dir] = entry
+            dir_stack += [
+                os.path.join(relative_dir, dir_name)
+                for dir_name in entry[1]
+            ]
+        return (
+            updated_entries,
+            changed or len(updated_entries) != len(entries)
+        )
+
+    def update_classes(self):
+        """
+        Rebuild the class name lookup table from the index
+        """
+        classes = {}
+        for source_folder in self.folders:
+            for entry in self.folders[source_folder].values():
+                for class_name in entry[2]:
+                    class_path = ".".join([
+                        x for x in [entry[3], class_name] if x
+                    ])
+                    if class_name in classes:
+                        classes[class_name].append(class_path)
+                    else:
+                        classes[class_name] = [class_path]
+        self.classes = classes
+
+    def update_index(self, source_folders=None, index_path=None):
+        """
+        Update the index to match the current source folders and save it
+            if the index has been changed
+
+        @param source_folders: a list of source folders to be indexed
+        @param index_path: a path to the index file
+        """
+        source_folders = (
+            source_folders or StateProperty().get_source_folders()
+        )
+        index_path = index_path or self.get_index_path()
+        with self.lock:
+            self.load_index(index_path)
+            previous_folders = dict(self.folders)
+        # Directories are listed without the lock, so lookups are not blocked
+        folders = {}
+        changed = set(source_folders) != set(previous_folders)
+        for source_folder in source_folders:
+            folders[source_folder], folder_changed = self.update_folder(
+                source_folder, previous_folders.get(source_folder, {})
+            )
+            changed = changed or folder_changed
+        with self.lock:
+            if changed and self.index_path == index_path:
+                self.folders = folders
+                self.update_classes()
+                self.save_index()
+
+    def refresh_index(self, force=False):
+        """
+        Update the index in background unless it has been updated within
+            the refresh interval
+
+        @param force: a boolean specified whether the refresh interval will
+            be ignored or not
+        """
+        with self.refresh_lock:
+            if self.refreshing:
+                self.refresh_pending = self.refresh_pending or force
+                return
+            if (not force and
+                    time.time() - self.refresh_time < self.REFRESH_INTERVAL):
+                return
+            self.refreshing = True
+            self.refresh_pending = False
+        self.build_index()
+
+    def run_refresh(self):
+        try:
+            self.update_index()
+        finally:
+            with self.refresh_lock:
+                self.refresh_time = time.time()
+                self.refreshing = False
+                refresh_pending = self.refresh_pending
+        if refresh_pending:
+            self.refresh_index(force=True)
+
+    def build_index(self):
+        """
+        Update the index in background
+        """
+        from ..threads import BackgroundThread
+        return BackgroundThread(
+            func=self.run_refresh,
+            args=[],
+            on_complete=None
+        )
+
+    def get_class_paths_for_classes(self, class_names):
+        """
+        Returns a dict of class name and a list of its class paths within
+            the project
+
+        @param class_names: a list of class names
+        """
+        index_path = self.get_index_path()
+        with self.lock:
+            self.load_index(index_path)
+            class_paths = {
+                class_name: list(self.classes[class_name])
+                for class_name in class_names
+                if class_name in self.classes
+            }
+        self.refresh_index()
+        return class_paths
+
+
+def ProjectIndex():
+    return _ProjectIndex.instance()
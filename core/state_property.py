@@ -1,6 +1,7 @@
 import sublime
 import os
 import time
+from .file_discovery import FileDiscovery
 from .settings import Settings
 
 
@@ -77,17 +78,15 @@ class _StateProperty:
         @param can_empty: a boolean specified whether the empty folder will
             consider as a source folder
         """
-        empty = True
-        for name in os.listdir(path):
-            empty = False
-            path_name = os.path.join(path, name)
-            if can_empty:
-                if os.path.isdir(path_name):
-                    if self.is_source_folder(path_name, can_empty):
-                        return True
-            if os.path.isfile(path_name) and self.is_java(path_name):
+        for dir_path, dirs, files in FileDiscovery().walk(
+                path, recursive=can_empty, exclude=False
+        ):
+            if can_empty and not dirs and not files:
                 return True
-        return can_empty and empty
+            for name in files:
+                if self.is_java(os.path.join(dir_path, name)):
+                    return True
+        return False
 
     def load_cache(self):
         from .macro import Macro
@@ -118,11 +117,10 @@ class _StateProperty:
             "cache_file_location"
         ))
         cache_path = os.path.join(cache_location, ".javatar-cache")
-        if os.path.exists(cache_path):
-            os.remove(cache_path)
-        cache_file = open(cache_path, "w")
+        cache_file = open(cache_path + ".tmp", "w")
         cache_file.write(sublime.encode_value(cache, True))
         cache_file.close()
+        os.replace(cache_path + ".tmp", cache_path)
 
     def get_file(self, view=None):
         """
@@ -26,19 +26,107 @@ SOFTWARE.
 
 import re
 from time import clock
+try:
+    from sys import intern
+except ImportError:
+    # Python 2 has intern as a built-in function
+    pass
 
 
-class GrammarParser():
-    def __init__(self, grammar, printer=None):
+class CompiledGrammar():
+    def __init__(self, grammar):
         self.grammar = grammar
+        self.re_cache = {}
+        # Rule table (rule name -> rule) for include resolution
+        self.rules = {}
+        self.unresolved_rules = []
+        if "repository" in grammar:
+            for rule_name in grammar["repository"]:
+                self.rules[intern(str(rule_name))] = grammar["repository"][rule_name]
+        for key in ("separator", "compilation_unit"):
+            if key in grammar:
+                self.compile_rule(grammar[key], set())
+
+    def compile_rule(self, rule, visited):
+        if id(rule) in visited:
+            return
+        visited.add(id(rule))
+        if "name" in rule:
+            rule["name"] = intern(str(rule["name"]))
+        if "match" in rule:
+            self.compile_pattern(rule["match"])
+        if "exclude" in rule:
+            self.compile_rule(rule["exclude"], visited)
+        for key in ("parse", "parse_any"):
+            if key in rule:
+                for child_rule in rule[key]:
+                    self.compile_rule(child_rule, visited)
+        if "include" in rule:
+            if rule["include"] in self.rules:
+                self.compile_rule(self.rules[rule["include"]], visited)
+            elif rule["include"] not in self.unresolved_rules:
+                self.unresolved_rules.append(rule["include"])
+
+    # Returns a rule from rule table, if exists
+    def get_rule(self, rule_name):
+        if rule_name in self.rules:
+            return self.rules[rule_name]
+        return None
+
+    # Returns a compiled pattern and which characters before the matching position it depends on
+    def compile_pattern(self, pattern):
+        if pattern in self.re_cache:
+            return self.re_cache[pattern]
+        lookback = None
+        index = 0
+        class_begin = None
+        while index < len(pattern):
+            char = pattern[index]
+            if char == "\\":
+                if class_begin is None and pattern[index+1:index+2] in ("b", "B") and lookback is None:
+                    lookback = "boundary"
+                elif class_begin is None and pattern[index+1:index+2] == "A":
+                    lookback = "any"
+                index += 2
+                continue
+            if class_begin is not None:
+                # Closing bracket right after the opening one is a literal
+                if char == "]" and index > class_begin:
+                    class_begin = None
+            elif char == "[":
+                class_begin = index+1
+                if pattern[index+1:index+2] == "^":
+                    class_begin += 1
+            elif char == "^" or pattern.startswith("(?<=", index) or pattern.startswith("(?<!", index):
+                lookback = "any"
+            index += 1
+        re_pattern = re.compile(pattern)
+        self.re_cache[pattern] = (re_pattern, lookback, re.compile("\\w", re_pattern.flags))
+        return self.re_cache[pattern]
+
+
+class GrammarParser():
+    def __init__(self, grammar, printer=None, packrat=False, packrat_limit=500000):
+        # Compiled grammar can be shared between parsers, so patterns are compiled only once
+        if isinstance(grammar, CompiledGrammar):
+            self.compiled_grammar = grammar
+        else:
+            self.compiled_grammar = CompiledGrammar(grammar)
+        self.grammar = self.compiled_grammar.grammar
         self.printer = None
         if printer is not None:
             self.printer = printer
-        self.re_cache = {}
+        self.re_cache = self.compiled_grammar.re_cache
         self.regions = []
         self.data = None
         self.unused_rules = []
         self.unexists_rules = []
+        # Packrat memoization (rule, position, separator) -> (parent, output)
+        self.packrat = packrat
+        self.packrat_limit = packrat_limit
+        self.memo = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
 
     def contain_rule(self, rule_name):
         return "repository" in self.grammar and rule_name in self.grammar["repository"]
@@ -82,6 +170,7 @@ class GrammarParser():
         if self.data is None or self.data != data:
             self.data = data
             self.regions = []
+            self.reset_memo()
         else:
             if self.printer is not None:
                 self.printer(0, "Already parse")
@@ -107,8 +196,34 @@ class GrammarParser():
                     parse_output["end"] = separator_output["end"]
                     self.regions += separator_output["regions"]
         self.elapse_time = clock()-starttime
+        # Memoized outputs are only valid while parsing, release them
+        self.memo = {}
         return {"success": parse_output["successive_match"], "begin": parse_output["begin"], "end": parse_output["end"]}
 
+    def reset_memo(self):
+        self.memo = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    # Returns a compiled pattern and which characters before the matching position it depends on
+    def compile_pattern(self, pattern):
+        return self.compiled_grammar.compile_pattern(pattern)
+
+    # Returns an end position of the pattern matched at specified position, if matched
+    def match_pattern(self, pattern, begin):
+        re_pattern, lookback, word_pattern = self.compile_pattern(pattern)
+        if lookback is None or begin == 0 or (lookback == "boundary" and word_pattern.match(self.data, begin-1) is None):
+            # Match in place, the result is the same as matching from the beginning of remaining data
+            matches = re_pattern.match(self.data, begin)
+            if matches is not None:
+                return matches.end()
+        else:
+            # Pattern must not see data before the matching position
+            matches = re_pattern.match(self.data[begin:])
+            if matches is not None:
+                return begin+matches.end()
+        return None
+
     def parse_rule_list(self, rules, is_separator, parent, level, begin):
         regions = []
         if self.printer is not None and not is_separator:
@@ -153,6 +268,83 @@ class GrammarParser():
         return parse_output
 
     def parse_rule(self, rule, is_separator, parent, level, begin):
+        if not self.packrat:
+            return self.parse_rule_uncached(rule, is_separator, parent, level, begin)
+        key = (id(rule), begin, is_separator)
+        if key in self.memo:
+            self.memo_hits += 1
+            memo_parent, memo_output = self.memo[key]
+            # Callers modify the output, so always hand out a copy
+            rule_output = dict(memo_output)
+            if memo_parent != parent:
+                rule_output["regions"] = self.rebase_regions(memo_output["regions"], memo_parent, parent)
+            return rule_output
+        self.memo_misses += 1
+        rule_output = self.parse_rule_uncached(rule, is_separator, parent, level, begin)
+        if len(self.memo) >= self.packrat_limit:
+            self.memo = {}
+        self.memo[key] = (parent, dict(rule_output))
+        return rule_output
+
+    # Move regions parsed under one call tree to another call tree
+    def rebase_regions(self, regions, old_parent, new_parent):
+        offset = len(old_parent) + 1 if old_parent != "" else 0
+        new_regions = []
+        for region in regions:
+            region = dict(region)
+            if new_parent != "":
+                region["parent"] = new_parent + ">" + region["parent"][offset:]
+            else:
+                region["parent"] = region["parent"][offset:]
+            new_regions.append(region)
+        return new_regions
+
+    def parse_rule_uncached(self, rule, is_separator, parent, level, begin):
+        rule_output, regions, parent, begin = self.parse_rule_once(rule, is_separator, parent, level, begin)
+        if "multiple" in rule and rule["multiple"] and rule_output["successive_match"]:
+            # Repeat the rule in a loop rather than recursion, so long repetitions
+            #   will not exceed the recursion limit nor copy the regions on every level
+            repeats = []
+            while True:
+                if self.printer is not None and not is_separator:
+                    self.printer(level, "Multiple: " + str(begin))
+                level += 1
+                repeat_output, repeat_regions, repeat_parent, repeat_begin = self.parse_rule_once(rule, is_separator, parent, level, begin)
+                repeats.append((repeat_output, repeat_regions, parent))
+                if not repeat_output["successive_match"] or repeat_begin == begin:
+                    break
+                parent = repeat_parent
+                begin = repeat_begin
+            last_output = repeats[-1][0]
+            for repeat_output, repeat_regions, repeat_parent in repeats:
+                if "name" in rule:
+                    regions.append({"begin": repeat_output["begin"], "end": last_output["end"], "value": self.data[repeat_output["begin"]:last_output["end"]], "parent": repeat_parent, "name": rule["name"]})
+                if repeat_output["match"]:
+                    rule_output["match"] = repeat_output["match"]
+                regions += repeat_regions
+            begin = last_output["new_begin"]
+            rule_output["end"] = last_output["end"]
+            rule_output["new_begin"] = last_output["new_begin"]
+
+        if rule_output["successive_match"]:
+            if "name" in rule:
+                if self.printer is not None and not is_separator:
+                    self.printer(level, "> Matched")
+        elif ("optional" in rule and rule["optional"]) or ("multiple" in rule and rule["multiple"]):
+            rule_output["successive_match"] = True
+            if self.printer is not None and not is_separator:
+                self.printer(level, "> Optional")
+        if "name" in rule:
+            if self.printer is not None and not is_separator:
+                self.printer(level, "== EndRule " + rule["name"] + " [" + str(begin) + "] ==")
+        else:
+            if self.printer is not None and not is_separator:
+                self.printer(level, "== EndRule [" + str(begin) + "] ==")
+        rule_output["regions"] = regions
+        return rule_output
+
+    # Parse the rule once, returns the output, its regions, its parent and the position after it
+    def parse_rule_once(self, rule, is_separator, parent, level, begin):
         regions = []
         if self.printer is not None and not is_separator:
             if "name" in rule:
@@ -171,10 +363,6 @@ class GrammarParser():
                 good = False
         if good:
             if "match" in rule:
-                if rule["match"] in self.re_cache:
-                    re_pattern = self.re_cache[rule["match"]]
-                else:
-                    re_pattern = re.compile(rule["match"])
                 if not is_separator and "separator" in self.grammar and ("before_separator" not in rule or rule["before_separator"]):
                     if self.printer is not None and not is_separator:
                         self.printer(level, "> Separator Before: " + str(begin))
@@ -186,12 +374,12 @@ class GrammarParser():
                             self.printer(level, "> Match before sep")
                 if self.printer is not None and not is_separator:
                     self.printer(level, "> Matching at [" + str(begin) + "]: " + rule["match"])
-                matches = re_pattern.search(self.data[begin:len(self.data)])
-                if matches is not None and matches.start() == 0:
+                match_end = self.match_pattern(rule["match"], begin)
+                if match_end is not None:
                     rule_output["successive_match"] = True
                     rule_output["match"] = True
                     rule_output["begin"] = begin
-                    rule_output["end"] = begin+matches.end()
+                    rule_output["end"] = match_end
                     rule_output["new_begin"] = rule_output["end"]
                     begin = rule_output["end"]
                     if "name" in rule:
@@ -237,10 +425,11 @@ class GrammarParser():
                     rule_output["successive_match"] = parse_output["successive_match"]
                     regions += parse_output["regions"]
             elif "include" in rule:
-                if "repository" in self.grammar and rule["include"] in self.grammar["repository"]:
+                include_rule = self.compiled_grammar.get_rule(rule["include"])
+                if include_rule is not None:
                     if self.printer is not None and not is_separator:
                         self.printer(level, "> Include " + rule["include"])
-                    parse_output = self.parse_rule(self.grammar["repository"][rule["include"]], is_separator, parent, level+1, begin)
+                    parse_output = self.parse_rule(include_rule, is_separator, parent, level+1, begin)
                     if parse_output["successive_match"]:
                         if "name" in rule:
                             regions.append({"begin": parse_output["begin"], "end": parse_output["end"], "value": self.data[parse_output["begin"]:parse_output["end"]], "parent": parent, "name": rule["name"]})
@@ -254,37 +443,7 @@ class GrammarParser():
                         regions += parse_output["regions"]
                 else:
                     rule_output["successive_match"] = False
-
-            if "multiple" in rule and rule["multiple"] and rule_output["successive_match"]:
-                if self.printer is not None and not is_separator:
-                    self.printer(level, "Multiple: " + str(begin))
-                parse_output = self.parse_rule(rule, is_separator, parent, level+1, begin)
-                if parse_output["successive_match"]:
-                    if "name" in rule:
-                        regions.append({"begin": parse_output["begin"], "end": parse_output["end"], "value": self.data[parse_output["begin"]:parse_output["end"]], "parent": parent, "name": rule["name"]})
-                    if parse_output["match"]:
-                        rule_output["match"] = parse_output["match"]
-                    begin = parse_output["new_begin"]
-                    rule_output["end"] = parse_output["end"]
-                    rule_output["new_begin"] = parse_output["new_begin"]
-                    regions += parse_output["regions"]
-
-        if rule_output["successive_match"]:
-            if "name" in rule:
-                if self.printer is not None and not is_separator:
-                    self.printer(level, "> Matched")
-        elif ("optional" in rule and rule["optional"]) or ("multiple" in rule and rule["multiple"]):
-            rule_output["successive_match"] = True
-            if self.printer is not None and not is_separator:
-                self.printer(level, "> Optional")
-        if "name" in rule:
-            if self.printer is not None and not is_separator:
-                self.printer(level, "== EndRule " + rule["name"] + " [" + str(begin) + "] ==")
-        else:
-            if self.printer is not None and not is_separator:
-                self.printer(level, "== EndRule [" + str(begin) + "] ==")
-        rule_output["regions"] = regions
-        return rule_output
+        return rule_output, regions, parent, begin
 
     # Find all (return all)
     def find_all(self):
@@ -436,3 +595,7 @@ class GrammarParser():
     # Get parse time
     def get_elapse_time(self):
         return self.elapse_time
+
+    # Get packrat memoization statistics
+    def get_memo_stats(self):
+        return {"hits": self.memo_hits, "misses": self.memo_misses, "size": len(self.memo)}
@@ -0,0 +1,92 @@
+from GrammarParser import *
+import json
+import argparse
+import os.path
+
+
+# A Java class member used to generate a large source
+JAVA_MEMBER = """
+    // Member {index}
+    private java.util.List<String> names{index} = new java.util.ArrayList<String>();
+
+    public int method{index}(String name, int count) {{
+        for (int i = 0; i < count; i++) {{
+            if (names{index}.size() > count && !name.isEmpty()) {{
+                System.out.println("Too many: " + names{index}.size());
+            }}
+        }}
+        return count * {index};
+    }}
+"""
+
+
+def generate_java_source(lines):
+    source_data = "package benchmark;\n\nimport java.util.List;\n\npublic class Benchmark {\n"
+    index = 0
+    while source_data.count("\n") < lines - 1:
+        source_data += JAVA_MEMBER.format(index=index)
+        index += 1
+    return source_data + "}\n"
+
+
+def parse_file(grammar, source_data, packrat):
+    parser = GrammarParser(grammar, packrat=packrat)
+    parse_output = parser.parse_grammar(source_data)
+    return parser, parse_output
+
+
+def run():
+    # Command-line stuffs
+    parser = argparse.ArgumentParser(description="GrammarParser benchmark program.", usage="%(prog)s [options] source [source ...]")
+    parser.add_argument("-g", "--grammar", dest="grammar", nargs="?", default="example.json", type=str, help="grammar file to use (default is example.json)")
+    parser.add_argument("-n", "--no-compare", dest="compare", action="store_false", default=True, help="skip the parse without packrat mode")
+    parser.add_argument("-l", "--lines", dest="lines", nargs="*", default=[], type=int, help="also parse generated Java sources with specified line counts")
+    parser.add_argument("source", nargs="*", type=str, help="source files to parse with grammar")
+    options = parser.parse_args()
+
+    # Show help if nothing is provided
+    if not options.source and not options.lines:
+        parser.print_help()
+        return
+
+    if not os.path.exists(options.grammar):
+        print("Error: Grammar file is not found")
+        return
+    print("Grammar: " + options.grammar)
+    grammar_data = open(options.grammar, "r").read()
+
+    # Remove comment since JSON does not supported it
+    # This RegEx only remove line comment (//comment)
+    grammar = json.loads(re.sub("(?<=[\\r\\n])\\s*//[^\\r\\n]*(?=[\\r\\n])", "", grammar_data))
+
+    sources = [(source, None) for source in options.source]
+    sources += [("<generated>", generate_java_source(lines)) for lines in options.lines]
+    for source, source_data in sources:
+        if source_data is None and not os.path.exists(source):
+            print("Error: Source file " + source + " is not found")
+            continue
+        elif source_data is None:
+            source_data = open(source, "r").read()
+        print("Source: {0} ({1} lines, {2} characters)".format(source, source_data.count("\n") + 1, len(source_data)))
+
+        packrat_parser, packrat_output = parse_file(grammar, source_data, True)
+        stats = packrat_parser.get_memo_stats()
+        print("  Packrat: {0:.2f}s, {1} tokens, ending {2}/{3} ({4} hits, {5} misses)".format(
+            packrat_parser.get_elapse_time(), len(packrat_parser.find_all()),
+            packrat_output["end"], len(source_data), stats["hits"], stats["misses"]
+        ))
+
+        if not options.compare:
+            continue
+        plain_parser, plain_output = parse_file(grammar, source_data, False)
+        print("  Plain:   {0:.2f}s, {1} tokens, ending {2}/{3}".format(
+            plain_parser.get_elapse_time(), len(plain_parser.find_all()),
+            plain_output["end"], len(source_data)
+        ))
+        if plain_output != packrat_output or plain_parser.find_all() != packrat_parser.find_all():
+            print("  Error: Parse outputs are different")
+        elif packrat_parser.get_elapse_time() > 0:
+            print("  Speed up: {0:.2f}x".format(plain_parser.get_elapse_time() / packrat_parser.get_elapse_time()))
+
+if __name__ == "__main__":
+    run()
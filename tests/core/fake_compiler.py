@@ -0,0 +1,31 @@
+"""
+A stand-in for a compile server which do not require JDK
+
+Source files which contain "error" will be reported as a compilation error
+"""
+import os
+import shlex
+import sys
+import time
+
+RESPONSE_END = "\x04"
+
+
+def main():
+    for line in sys.stdin:
+        return_code = 0
+        for arg in shlex.split(line):
+            if arg == "--pid":
+                print(os.getpid())
+            elif arg == "--hang":
+                time.sleep(10)
+            elif arg.endswith(".java"):
+                with open(arg, "r") as source_file:
+                    if "error" in source_file.read():
+                        print("%s:1: error: fake error" % (arg))
+                        return_code = 1
+        print(RESPONSE_END + str(return_code))
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+A stand-in for JavatarAutocompleteHelper server mode which do not require JDK
+
+Class paths are the directories in which each file name is a class name
+"""
+import os
+import shlex
+import sys
+
+RESPONSE_END = "\x04"
+
+
+def find_classes(class_paths):
+    classes = []
+    for class_path in class_paths:
+        for file_name in sorted(os.listdir(class_path)):
+            classes.append(os.path.basename(class_path) + "." + file_name)
+    return classes
+
+
+def main():
+    args = sys.argv[1:]
+    class_paths = []
+    if "-cp" in args:
+        class_paths = args[args.index("-cp") + 1].split(os.pathsep)
+    if "--server" not in args:
+        return 1
+    for line in sys.stdin:
+        query = shlex.split(line)
+        if query[0] == "-p":
+            for class_path in class_paths:
+                print(os.path.basename(class_path))
+        elif query[0] == "-t":
+            for class_name in query[1].split(os.pathsep):
+                for class_path in find_classes(class_paths):
+                    if class_path.endswith("." + class_name):
+                        print("%s;%s" % (class_name, class_path))
+        elif query[0] == "--pid":
+            print(os.getpid())
+        elif query[0] == "--exit":
+            return 1
+        print(RESPONSE_END + "0")
+        sys.stdout.flush()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from Javatar.core.artifact_registry import _ArtifactRegistry
+
+
+class TestArtifactRegistry(unittest.TestCase):
+    def test_get_digest(self):
+        artifact_file = tempfile.NamedTemporaryFile(delete=False)
+        artifact_file.write(b"alpha")
+        artifact_file.close()
+        self.addCleanup(os.remove, artifact_file.name)
+        digest = hashlib.sha256(b"alpha").hexdigest()
+
+        ar = _ArtifactRegistry()
+        with patch("hashlib.sha256", wraps=hashlib.sha256) as sha256:
+            self.assertTrue(ar.is_verified(artifact_file.name, digest))
+            self.assertTrue(ar.is_verified(artifact_file.name, digest))
+            self.assertEqual(sha256.call_count, 1)
+
+            # Changed file will be read again
+            with open(artifact_file.name, "ab") as changed_file:
+                changed_file.write(b"bravo")
+            self.assertFalse(ar.is_verified(artifact_file.name, digest))
+            self.assertEqual(sha256.call_count, 2)
+
+        self.assertEqual(ar.get_digest(artifact_file.name + ".missing"), None)
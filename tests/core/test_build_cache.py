@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from Javatar.core.build_cache import BuildCache
+
+
+class TestBuildCache(unittest.TestCase):
+    @patch("Javatar.core.state_property._StateProperty.save_cache")
+    @patch(
+        "Javatar.core.state_property._StateProperty.load_cache",
+        return_value={"build_durations": {"Alpha.java": 1.5}}
+    )
+    def test_build_cache(self, load_cache, save_cache):
+        bc = BuildCache()
+        self.assertEqual(bc.get_build_durations(), {"Alpha.java": 1.5})
+        self.assertEqual(bc.get_section("alpha"), {})
+        bc.flush()
+        self.assertFalse(save_cache.called)
+
+        bc.set_build_duration("Bravo.java", 2)
+        self.assertEqual(
+            bc.get_build_durations(), {"Alpha.java": 1.5, "Bravo.java": 2}
+        )
+        bc.flush()
+        bc.flush()
+        self.assertEqual(load_cache.call_count, 1)
+        save_cache.assert_called_once_with({
+            "build_durations": {"Alpha.java": 1.5, "Bravo.java": 2},
+            "alpha": {}
+        })
+
+    @patch("Javatar.core.state_property._StateProperty.load_cache")
+    def test_remove_missing_build_durations(self, load_cache):
+        with tempfile.TemporaryDirectory() as source_folder:
+            file_path = os.path.join(source_folder, "Alpha.java")
+            open(file_path, "w").close()
+            missing_path = os.path.join(source_folder, "Bravo.java")
+            load_cache.return_value = {
+                "build_durations": {file_path: 1.5, missing_path: 2}
+            }
+            bc = BuildCache()
+            bc.remove_missing_build_durations()
+            self.assertTrue(bc.changed)
+            self.assertEqual(bc.get_build_durations(), {file_path: 1.5})
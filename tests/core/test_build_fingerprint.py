@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from Javatar.core.build_fingerprint import BuildFingerprint
+
+
+class TestBuildFingerprint(unittest.TestCase):
+    def setUp(self):
+        self.source_folder = tempfile.mkdtemp()
+        self.output_location = tempfile.mkdtemp()
+        self.source_file = os.path.join(self.source_folder, "Alpha.java")
+        self.class_file = os.path.join(self.output_location, "Alpha.class")
+        self.write(self.source_file, "class Alpha {}")
+        self.write(self.class_file, "")
+        self.build_cache = MagicMock()
+        self.build_cache.get_section.return_value = {}
+
+    def tearDown(self):
+        shutil.rmtree(self.source_folder)
+        shutil.rmtree(self.output_location)
+
+    def write(self, path, content, modified_time=1000):
+        with open(path, "w") as output_file:
+            output_file.write(content)
+        os.utime(path, (modified_time, modified_time))
+
+    def create_fingerprint(self, build_arguments=""):
+        return BuildFingerprint(
+            self.build_cache,
+            environment={"build_arguments": build_arguments},
+            output_location=self.output_location
+        )
+
+    def test_fingerprint(self):
+        bf = self.create_fingerprint()
+        self.assertTrue(bf.is_changed(self.source_file, "Alpha"))
+        bf.update(self.source_file, "Alpha")
+        self.assertTrue(self.build_cache.mark_changed.called)
+        self.assertFalse(bf.is_changed(self.source_file, "Alpha"))
+
+        # Touched but unchanged
+        self.write(self.source_file, "class Alpha {}", 2000)
+        self.assertFalse(bf.is_changed(self.source_file, "Alpha"))
+        self.assertEqual(bf.fingerprints["Alpha"]["mtime"], 2000)
+
+        self.write(self.source_file, "class Alpha { }", 2000)
+        self.assertTrue(bf.is_changed(self.source_file, "Alpha"))
+
+        bf.update(self.source_file, "Alpha")
+        self.assertTrue(
+            self.create_fingerprint("-g").is_changed(self.source_file, "Alpha")
+        )
+        os.remove(self.class_file)
+        self.assertTrue(bf.is_changed(self.source_file, "Alpha"))
+
+        bf.remove("Alpha")
+        self.assertEqual(bf.fingerprints, {})
@@ -0,0 +1,157 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from Javatar.core.build_system import (
+    BuildPartitioner,
+    BuildScheduler,
+    BuildTelemetry
+)
+
+
+def get_settings(key, default=None):
+    return {
+        "encoding": "utf-8",
+        "encoding_handle": "ignore"
+    }.get(key, default)
+
+
+class TestBuildScheduler(unittest.TestCase):
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    @patch("Javatar.core.macro._Macro.parse", return_value=None)
+    @patch(
+        "Javatar.threads.build_system.BuilderThread.get_build_args",
+        return_value=["cat", "-classpath", "lib dir"]
+    )
+    def test_build(self, *_):
+        controller = MagicMock()
+        batches = [["Alpha.java"], ["Bravo.java", "Charlie.java"], ["Delta"]]
+        bs = BuildScheduler(controller, batches, max_workers=2)
+        self.assertEqual(len(bs.workers), 2)
+        argument_files = []
+        for worker in bs.workers:
+            def read_argument_file(build_args, argument_file, extra_args):
+                argument_files.append(argument_file)
+                return [build_args[0], argument_file]
+
+            worker.get_compile_args = read_argument_file
+        bs.start()
+        for worker in bs.workers:
+            worker.join(10)
+            self.assertFalse(worker.is_alive())
+        calls = controller.on_builder_complete.call_args_list
+        self.assertEqual(
+            sorted(call[0][2] for call in calls),
+            [
+                "\"-classpath\"\n\"lib dir\"\n\"Alpha.java\"\n",
+                "\"-classpath\"\n\"lib dir\"\n\"Bravo.java\"\n" +
+                "\"Charlie.java\"\n",
+                "\"-classpath\"\n\"lib dir\"\n\"Delta\"\n"
+            ]
+        )
+        outputs = controller.on_builder_output.call_args_list
+        self.assertEqual(
+            sorted(call[0][2] for call in calls),
+            sorted(
+                "".join(
+                    record["text"]
+                    for call in outputs
+                    if call[0][1] == files
+                    for record in call[0][0]
+                )
+                for files in batches
+            )
+        )
+        self.assertEqual(len(argument_files), 3)
+        for argument_file in argument_files:
+            self.assertFalse(os.path.exists(argument_file))
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    @patch("Javatar.core.macro._Macro.parse", return_value=None)
+    @patch(
+        "Javatar.threads.build_system.BuilderThread.get_build_args",
+        return_value=[sys.executable]
+    )
+    def test_cancel(self, *_):
+        controller = MagicMock()
+        started = threading.Event()
+        controller.on_builder_output.side_effect = lambda *_: started.set()
+        bs = BuildScheduler(controller, [["Alpha"], ["Bravo"]], max_workers=1)
+        bs.workers[0].get_compile_args = lambda build_args, *_: [
+            build_args[0], "-c",
+            "import time; print('started', flush=True); time.sleep(10)"
+        ]
+        bs.start()
+        self.assertTrue(started.wait(10))
+        bs.cancel()
+        bs.workers[0].join(10)
+        self.assertFalse(bs.workers[0].is_alive())
+        self.assertEqual(controller.on_builder_complete.call_count, 1)
+        self.assertNotEqual(controller.on_builder_complete.call_args[0][3], 0)
+
+
+class TestBuildPartitioner(unittest.TestCase):
+    @patch("os.path.getsize", return_value=100)
+    def test_partition(self, *_):
+        files = [
+            "src/a/Alpha.java", "src/a/Bravo.java",
+            "src/b/Charlie.java", "src/b/Delta.java"
+        ]
+        bp = BuildPartitioner()
+        self.assertEqual(bp.partition([], 2), [])
+        self.assertEqual(
+            sorted(bp.partition(files, 2)),
+            [
+                ["src/a/Alpha.java", "src/a/Bravo.java"],
+                ["src/b/Charlie.java", "src/b/Delta.java"]
+            ]
+        )
+        self.assertEqual(len(bp.partition(files, 10)), 4)
+
+    @patch("os.path.getsize", return_value=100)
+    def test_partition_by_duration(self, *_):
+        files = ["a/Alpha.java", "b/Bravo.java", "c/Charlie.java"]
+        bp = BuildPartitioner({"a/Alpha.java": 4, "b/Bravo.java": 1})
+        self.assertEqual(
+            bp.get_costs(files),
+            {"a/Alpha.java": 4, "b/Bravo.java": 1, "c/Charlie.java": 2.5}
+        )
+        self.assertEqual(
+            bp.partition(files, 2),
+            [["a/Alpha.java"], ["c/Charlie.java", "b/Bravo.java"]]
+        )
+
+
+class TestBuildTelemetry(unittest.TestCase):
+    def test_write_report(self):
+        bt = BuildTelemetry()
+        with bt.measure("discovery"):
+            pass
+        bt.add_event("compile", 2, files=3)
+        bt.add_event("compile", 1, files=1)
+        report_dir = tempfile.mkdtemp()
+        report_path = os.path.join(report_dir, "reports", "build.jsonl")
+        try:
+            bt.write_report(report_path, status="success")
+            bt.write_report(report_path, status="success")
+            with open(report_path, "r") as report_file:
+                events = [json.loads(line) for line in report_file]
+        finally:
+            shutil.rmtree(report_dir)
+        self.assertEqual(len(events), 8)
+        self.assertEqual(
+            [event["phase"] for event in events[:4]],
+            ["discovery", "compile", "compile", "build"]
+        )
+        self.assertEqual(events[1]["files"], 3)
+        self.assertEqual(events[3]["status"], "success")
+        self.assertEqual(events[3]["phases"]["compile"], {
+            "count": 2, "elapse_time": 3
+        })
+        self.assertEqual(
+            set(event["build"] for event in events), set([bt.build_id])
+        )
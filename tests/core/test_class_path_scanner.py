@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+from Javatar.core.class_path_scanner import _ClassPathScanner
+
+
+class TestClassPathScanner(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.runtime_path = os.path.join(self.temp_dir, "rt.jar")
+        runtime_file = zipfile.ZipFile(self.runtime_path, "w")
+        for entry_name in [
+            "META-INF/MANIFEST.MF",
+            "java/util/List.class",
+            "java/util/Map.class",
+            "java/util/Map$Entry.class",
+            "java/util/package-info.class",
+            "java/awt/List.class",
+            "sun/misc/Unsafe.class"
+        ]:
+            runtime_file.writestr(entry_name, "")
+        runtime_file.close()
+        self.class_folder = os.path.join(self.temp_dir, "classes")
+        os.makedirs(os.path.join(self.class_folder, "alpha"))
+        open(
+            os.path.join(self.class_folder, "alpha", "List.class"), "w"
+        ).close()
+
+    @patch("Javatar.core.settings._Settings.get", return_value=["sun."])
+    def test_get_class_paths_for_classes(self, *_):
+        cps = _ClassPathScanner()
+        cps.get_class_paths = lambda: [self.class_folder, self.runtime_path]
+        self.assertEqual(
+            cps.get_class_paths_for_classes(["List", "Entry", "Unsafe"]),
+            {"List": ["alpha.List", "java.util.List", "java.awt.List"]}
+        )
+        self.assertEqual(cps.get_packages(), ["alpha", "java.awt", "java.util"])
+
+        with patch.object(cps, "list_entries") as list_entries:
+            cps.get_class_paths_for_classes(["Map"])
+            self.assertFalse(list_entries.called)
+
+        # New class in a nested package of a class folder
+        os.makedirs(os.path.join(self.class_folder, "alpha", "bravo"))
+        open(
+            os.path.join(self.class_folder, "alpha", "bravo", "Map.class"),
+            "w"
+        ).close()
+        self.assertEqual(
+            cps.get_class_paths_for_classes(["Map"]),
+            {"Map": ["alpha.bravo.Map", "java.util.Map"]}
+        )
+        os.remove(
+            os.path.join(self.class_folder, "alpha", "bravo", "Map.class")
+        )
+        self.assertEqual(
+            cps.get_class_paths_for_classes(["Map"]),
+            {"Map": ["java.util.Map"]}
+        )
+
+        cps.get_class_paths = lambda: [self.temp_dir + "/missing.jar"]
+        self.assertEqual(cps.get_class_paths_for_classes(["List"]), None)
@@ -0,0 +1,98 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from Javatar.core.compile_server import _CompileServer
+
+FAKE_COMPILER = os.path.join(os.path.dirname(__file__), "fake_compiler.py")
+
+
+def get_settings(key, default=None):
+    return {
+        "compile_server_idle_timeout": 0,
+        "compile_server_timeout": 10
+    }.get(key, default)
+
+
+class TestCompileServer(unittest.TestCase):
+    def create_file(self, name, source_code):
+        file_path = os.path.join(self.source_folder, name)
+        with open(file_path, "w") as java_file:
+            java_file.write(source_code)
+        return file_path
+
+    def setUp(self):
+        self.source_folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source_folder)
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_compile(self, *_):
+        cs = _CompileServer()
+        self.addCleanup(cs.shutdown)
+        args = [sys.executable, FAKE_COMPILER]
+        alpha = self.create_file("Alpha.java", "class Alpha {}")
+        bravo = self.create_file("Bravo.java", "class Bravo { error }")
+
+        output = cs.compile(args, ["-d", "bin", alpha], "bin")
+        self.assertEqual(output["return_code"], 0)
+        self.assertEqual(output["data"], None)
+        output = cs.compile(args, ["-d", "bin", alpha, bravo], "bin")
+        self.assertEqual(output["return_code"], 1)
+        self.assertEqual(output["data"], bravo + ":1: error: fake error\n")
+
+        # One compile server for each output location
+        pid = cs.compile(args, ["--pid"], "bin")["data"]
+        self.assertEqual(cs.compile(args, ["--pid"], "bin")["data"], pid)
+        self.assertNotEqual(cs.compile(args, ["--pid"], "out")["data"], pid)
+        self.assertEqual(len(cs.servers), 2)
+
+        # Missing compile server will not be started again
+        args = [os.path.join(self.source_folder, "missing")]
+        with patch("Javatar.core.compile_server.Logger"):
+            self.assertEqual(cs.compile(args, [alpha]), None)
+        self.assertEqual(cs.compile(args, [alpha]), None)
+        self.assertEqual(len(cs.servers), 2)
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_worker(self, *_):
+        cs = _CompileServer()
+        self.addCleanup(cs.shutdown)
+        args = [sys.executable, FAKE_COMPILER]
+
+        # One compile server for each builder thread
+        pid = cs.compile(args, ["--pid"], worker=0)["data"]
+        self.assertNotEqual(
+            cs.compile(args, ["--pid"], worker=1)["data"], pid
+        )
+        self.assertEqual(cs.compile(args, ["--pid"], worker=0)["data"], pid)
+
+        # Cancelled compilation will not disable the compile server
+        timer = threading.Timer(0.5, cs.cancel, [1])
+        timer.start()
+        start_time = time.time()
+        self.assertEqual(cs.compile(args, ["--hang"], worker=1), None)
+        self.assertLess(time.time() - start_time, 5)
+        timer.join()
+        self.assertEqual(cs.compile(args, ["--pid"], worker=0)["data"], pid)
+        self.assertIsNotNone(cs.compile(args, ["--pid"], worker=1))
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_timeout(self, *_):
+        cs = _CompileServer()
+        self.addCleanup(cs.shutdown)
+        args = [sys.executable, FAKE_COMPILER]
+        with patch(
+            "Javatar.core.settings._Settings.get",
+            side_effect=lambda key, default=None: (
+                0.5 if key == "compile_server_timeout"
+                else get_settings(key, default)
+            )
+        ), patch("Javatar.core.compile_server.Logger"):
+            start_time = time.time()
+            self.assertEqual(cs.compile(args, ["--hang"]), None)
+        self.assertLess(time.time() - start_time, 5)
+        self.assertEqual(cs.servers, {})
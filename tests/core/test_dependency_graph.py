@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from Javatar.core.dependency_graph import DependencyGraph
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.source_folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source_folder)
+        self.build_cache = MagicMock()
+        self.build_cache.get_section.return_value = {}
+
+    def create_file(self, name, source_code):
+        file_path = os.path.join(self.source_folder, name + ".java")
+        with open(file_path, "w") as java_file:
+            java_file.write(source_code)
+        return file_path
+
+    def test_read_references(self):
+        dg = DependencyGraph(self.build_cache)
+        file_path = self.create_file("Alpha", (
+            "package alpha . bravo;\n"
+            "import java.util.*;\n"
+            "import static charlie.Delta.echo;\n"
+            "// import foxtrot.Golf;\n"
+            "class Alpha { String s = \"Hotel /* India\"; } /* Juliet */"
+        ))
+        self.assertEqual(dg.read_references(file_path), {
+            "package": "alpha.bravo",
+            "imports": ["charlie.Delta.echo"],
+            "wildcards": ["java.util"],
+            "names": ["Alpha", "Delta", "String", "alpha", "charlie", "java"]
+        })
+
+    def test_get_dependents(self):
+        files = {
+            "alpha.Alpha": "package alpha; class Alpha {}",
+            "alpha.Bravo": "package alpha; class Bravo { Alpha a; }",
+            "charlie.Charlie": (
+                "package charlie; import alpha.Bravo; class Charlie {}"
+            ),
+            "charlie.Delta": "package charlie; class Delta { Charlie c; }",
+            "echo.Echo": "package echo; class Echo { alpha.Alpha a; }",
+            "echo.Foxtrot": "package echo; class Foxtrot { Alpha a; }",
+            "golf.Golf": (
+                "package golf; class Golf { Object g = alpha . Alpha.b; }"
+            )
+        }
+        dg = DependencyGraph(self.build_cache)
+        file_paths = {}
+        for class_path, source_code in files.items():
+            file_paths[class_path] = self.create_file(class_path, source_code)
+            dg.update_file(file_paths[class_path], class_path)
+        self.assertEqual(dg.get_dependents(["alpha.Alpha"]), {
+            file_paths["alpha.Bravo"],
+            file_paths["charlie.Charlie"],
+            file_paths["charlie.Delta"],
+            file_paths["echo.Echo"],
+            file_paths["golf.Golf"]
+        })
+        self.assertEqual(dg.get_dependents(["charlie.Delta"]), set())
+
+        os.remove(file_paths["charlie.Charlie"])
+        self.assertEqual(dg.remove_missing_files(), ["charlie.Charlie"])
+        self.assertTrue(self.build_cache.mark_changed.called)
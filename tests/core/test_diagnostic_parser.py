@@ -0,0 +1,88 @@
+import unittest
+from Javatar.core.diagnostic_parser import DiagnosticIndex, DiagnosticParser
+
+
+class TestDiagnosticParser(unittest.TestCase):
+    def test_feed(self):
+        dp = DiagnosticParser()
+        self.assertEqual(
+            dp.feed("/src/Alpha.java:3: error: cannot find symbol\n    Bra"),
+            []
+        )
+        self.assertEqual(dp.feed("vo b;\n    ^\n  symbol: class Bravo\n"), [])
+        records = dp.feed("/src/Alpha.java:1: warning: [rawtypes] raw\n")
+        self.assertEqual(records, [{
+            "file": "/src/Alpha.java",
+            "line": 3,
+            "column": 5,
+            "severity": "error",
+            "message": "cannot find symbol",
+            "text": (
+                "/src/Alpha.java:3: error: cannot find symbol\n" +
+                "    Bravo b;\n    ^\n  symbol: class Bravo\n"
+            )
+        }])
+        records = dp.feed("1 error\r\n1 warning")
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["severity"], "warning")
+        self.assertEqual(records[1]["file"], None)
+        self.assertEqual(records[1]["text"], "1 error\n")
+        records = dp.close()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["message"], "1 warning")
+        self.assertEqual(dp.close(), [])
+
+    def test_feed_top_level_source(self):
+        dp = DiagnosticParser()
+        records = dp.feed(
+            "/p/A.java:3: error: class B is public\n" +
+            "public class B {\n" +
+            "       ^\n" +
+            "Note: A.java uses unchecked or unsafe operations.\n" +
+            "1 error\n"
+        ) + dp.close()
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]["column"], 8)
+        self.assertEqual(
+            records[0]["text"],
+            "/p/A.java:3: error: class B is public\n" +
+            "public class B {\n       ^\n"
+        )
+        self.assertEqual(records[1]["file"], None)
+        self.assertEqual(records[2]["text"], "1 error\n")
+
+
+class TestDiagnosticIndex(unittest.TestCase):
+    def create_record(self, file_path, line, severity="error"):
+        return {
+            "file": file_path,
+            "line": line,
+            "column": None,
+            "severity": severity,
+            "message": "",
+            "text": ""
+        }
+
+    def test_get_next_diagnostic(self):
+        di = DiagnosticIndex()
+        self.assertEqual(di.get_next_diagnostic(), None)
+        bravo = self.create_record("/src/Bravo.java", 5)
+        alpha_warning = self.create_record("/src/Alpha.java", 2, "warning")
+        alpha = self.create_record("/src/Alpha.java", 8)
+        for record in [bravo, alpha, alpha_warning]:
+            di.add(record)
+        di.add(self.create_record(None, None, None))
+        self.assertEqual(
+            di.get_diagnostics("/src/Alpha.java"), [alpha_warning, alpha]
+        )
+        self.assertEqual(di.get_next_diagnostic(), alpha_warning)
+        self.assertEqual(di.get_next_diagnostic("/src/Alpha.java", 2), alpha)
+        self.assertEqual(di.get_next_diagnostic("/src/Alpha.java", 8), bravo)
+        self.assertEqual(
+            di.get_next_diagnostic("/src/Bravo.java", 5), alpha_warning
+        )
+        self.assertEqual(
+            di.get_next_diagnostic("/src/Bravo.java", 5, "error"), alpha
+        )
+        di.clear()
+        self.assertEqual(di.get_diagnostics(), [])
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Javatar.core.file_discovery import _FileDiscovery
+
+
+class TestFileDiscovery(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for path in ["src/alpha", "src/bravo", "src/.git", "build"]:
+            os.makedirs(os.path.join(self.root, path))
+        for path in [
+            "src/Main.java", "src/alpha/Alpha.java", "src/alpha/README",
+            "src/.git/HEAD", "build/Build.java"
+        ]:
+            open(os.path.join(self.root, path), "w").close()
+        # Old enough to be reused
+        for path in ["", "src", "src/alpha", "src/bravo", "src/.git", "build"]:
+            os.utime(os.path.join(self.root, path), (1000, 1000))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def relative_paths(self, paths):
+        return sorted(os.path.relpath(path, self.root) for path in paths)
+
+    @patch(
+        "Javatar.core.settings._Settings.get_sublime",
+        return_value=[".git", "bui*"]
+    )
+    def test_get_files(self, *_):
+        fd = _FileDiscovery()
+        self.assertEqual(
+            self.relative_paths(fd.get_files(
+                self.root, lambda path: path.endswith(".java")
+            )),
+            ["src/Main.java", "src/alpha/Alpha.java"]
+        )
+        self.assertEqual(
+            self.relative_paths(fd.get_files(os.path.join(self.root, "src"))),
+            ["src/Main.java", "src/alpha/Alpha.java", "src/alpha/README"]
+        )
+        self.assertEqual(
+            [
+                dirs
+                for _, dirs, _ in fd.walk(self.root, recursive=False)
+            ],
+            [["src"]]
+        )
+        self.assertEqual(
+            len(list(fd.walk(self.root, recursive=False, exclude=False))), 1
+        )
+        self.assertEqual(fd.get_files(os.path.join(self.root, "none")), [])
+
+    @patch("Javatar.core.settings._Settings.get_sublime", return_value=[])
+    def test_snapshot(self, *_):
+        fd = _FileDiscovery()
+        alpha = os.path.join(self.root, "src", "alpha")
+        self.assertEqual(fd.list_dir(alpha), ([], ["Alpha.java", "README"]))
+        with patch.object(fd, "scan_dir") as scan_dir:
+            self.assertEqual(
+                fd.list_dir(alpha), ([], ["Alpha.java", "README"])
+            )
+            self.assertFalse(scan_dir.called)
+        open(os.path.join(alpha, "Bravo.java"), "w").close()
+        os.utime(alpha, (2000, 2000))
+        self.assertEqual(
+            fd.list_dir(alpha), ([], ["Alpha.java", "Bravo.java", "README"])
+        )
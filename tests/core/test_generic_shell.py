@@ -0,0 +1,146 @@
+import os
+import queue
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+from Javatar.core.generic_shell import (
+    ConsoleBuffer,
+    GenericBlockShell,
+    GenericSilentShell,
+    OutputBuffer,
+    OutputDecoder,
+    _ShellReactor
+)
+
+
+def get_settings(key, default=None):
+    return {
+        "encoding": "utf-8",
+        "encoding_handle": "strict",
+        "shell_output_memory_limit": 1000
+    }.get(key, default)
+
+
+class TestGenericShell(unittest.TestCase):
+    def test_console_buffer(self):
+        cb = ConsoleBuffer()
+        self.assertEqual(cb.take(), "")
+        cb.append("alpha\n")
+        cb.append("bravo\n")
+        self.assertEqual(cb.take(), "alpha\nbravo\n")
+        self.assertEqual(cb.take(), "")
+
+        cb = ConsoleBuffer(limit=8)
+        for index in range(100):
+            cb.append("%02d\n" % (index))
+        self.assertLessEqual(cb.size, 16)
+        self.assertEqual(cb.take(), "7\n98\n99\n")
+
+    def test_output_buffer(self):
+        ob = OutputBuffer(memory_limit=4)
+        ob.append("alpha")
+        self.assertIsNotNone(ob.spill_file)
+        ob.append("bra")
+        self.assertEqual(len(ob), 8)
+        self.assertEqual(ob.getvalue(), "alphabra")
+        ob.append("vo")
+        self.assertEqual(ob.getvalue(), "alphabravo")
+        ob.discard(3)
+        self.assertEqual(ob.getvalue(), "habravo")
+        ob.append("\udcff é")
+        self.assertEqual(ob.getvalue(), "habravo\udcff é")
+        ob.close()
+        self.assertEqual(ob.getvalue(), "")
+
+        ob = OutputBuffer(limit=6)
+        for text in ["al", "pha", "bravo"]:
+            ob.append(text)
+        self.assertEqual(ob.getvalue(), "alphab")
+        self.assertEqual(ob.dropped_size, 4)
+        ob.discard(3)
+        self.assertEqual(ob.getvalue(), "hab")
+        ob.discard(10)
+        self.assertEqual(len(ob), 0)
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_output_decoder(self, *_):
+        od = OutputDecoder()
+        data = "A\r\nB é\r\n".encode("utf-8")
+        self.assertEqual(
+            "".join(od.decode(data[index:index + 1]) for index in range(
+                len(data)
+            )) + od.decode(b"", True),
+            "A\nB é\n"
+        )
+        self.assertEqual(od.decode(b"C\r", True), "C\r")
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_block_shell(self, *_):
+        script = "%s -c \"print('x' * 200000); import sys; sys.exit(3)\"" % (
+            sys.executable
+        )
+        outputs = [GenericBlockShell().run(script) for _ in range(3)]
+        for output in outputs:
+            self.assertEqual(output["data"], "x" * 200000 + "\n")
+            self.assertEqual(output["return_code"], 3)
+        self.assertEqual(
+            GenericBlockShell().run("true"),
+            {
+                "elapse_time": unittest.mock.ANY,
+                "data": None,
+                "return_code": 0
+            }
+        )
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_silent_shell(self, *_):
+        completed = threading.Event()
+        results = []
+
+        def on_complete(elapse_time, data, return_code, params):
+            results.append((data, return_code, params))
+            completed.set()
+
+        shell = GenericSilentShell(
+            "echo alpha", on_complete=on_complete, params="bravo"
+        )
+        shell.start()
+        self.assertTrue(completed.wait(10))
+        self.assertEqual(results, [("alpha\n", 0, "bravo")])
+
+    def test_reactor_close_and_eof(self):
+        reactor = _ShellReactor()
+        if not reactor.is_selectable():
+            self.skipTest("Pipes cannot be selected")
+
+        def open_pipe():
+            read_fd, write_fd = os.pipe()
+            return (os.fdopen(read_fd, "rb", 0), write_fd)
+
+        blocked = threading.Event()
+        released = threading.Event()
+
+        def block(data):
+            blocked.set()
+            released.wait(10)
+
+        pipe_a, write_a = open_pipe()
+        pipe_b, write_b = open_pipe()
+        reactor.register(pipe_a, lambda data: None, lambda: None)
+        reactor.register(pipe_b, block, lambda: None)
+        os.write(write_b, b"b")
+        self.assertTrue(blocked.wait(10))
+        # Close and EOF of the same pipe are handled in one batch
+        reactor.close(pipe_a)
+        os.close(write_a)
+        released.set()
+
+        pipe_c, write_c = open_pipe()
+        chunks = queue.Queue()
+        reactor.register(pipe_c, chunks.put, lambda: chunks.put(None))
+        os.write(write_c, b"c")
+        os.close(write_c)
+        os.close(write_b)
+        self.assertEqual(chunks.get(timeout=10), b"c")
+        self.assertEqual(chunks.get(timeout=10), None)
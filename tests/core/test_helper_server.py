@@ -0,0 +1,99 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+from Javatar.core.helper_server import HelperServer
+from Javatar.core.helper_service import _HelperService
+
+FAKE_HELPER = os.path.join(os.path.dirname(__file__), "fake_helper.py")
+
+
+def get_settings(key, default=None):
+    return {
+        "helper_server_idle_timeout": 0,
+        "helper_server_timeout": 10
+    }.get(key, default)
+
+
+class TestHelperServer(unittest.TestCase):
+    def setUp(self):
+        self.class_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.class_path)
+        for class_name in ["Alpha", "Bravo"]:
+            open(os.path.join(self.class_path, class_name), "w").close()
+
+    def get_args(self, *class_paths):
+        return [
+            sys.executable, FAKE_HELPER,
+            "-cp", os.pathsep.join(class_paths),
+            "--server"
+        ]
+
+    def test_query(self):
+        server = HelperServer(self.get_args(self.class_path))
+        self.addCleanup(server.shutdown)
+        package = os.path.basename(self.class_path)
+        output = server.query("-t Alpha%sCharlie" % (os.pathsep), timeout=10)
+        self.assertEqual(output["data"], "Alpha;%s.Alpha\n" % (package))
+        self.assertEqual(output["return_code"], 0)
+
+        pid = server.query("--pid", timeout=10)["data"]
+        self.assertEqual(server.query("--pid", timeout=10)["data"], pid)
+
+        # Helper process exits without response
+        self.assertEqual(server.query("--exit", timeout=10), None)
+        self.assertFalse(server.is_alive())
+        self.assertNotEqual(server.query("--pid", timeout=10)["data"], pid)
+
+    def test_idle_timeout(self):
+        server = HelperServer(self.get_args(self.class_path), idle_timeout=1)
+        self.assertEqual(server.query("-p", timeout=10)["return_code"], 0)
+        idle_timer = server.idle_timer
+        self.assertTrue(server.is_alive())
+        idle_timer.join()
+        self.assertFalse(server.is_alive())
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_restart_on_class_paths_change(self, *_):
+        hs = _HelperService()
+        self.addCleanup(hs.shutdown_server)
+        package = os.path.basename(self.class_path)
+        args = self.get_args(self.class_path)
+        self.assertEqual(
+            hs.query_server(args, "-p")["data"], package + "\n"
+        )
+        server = hs.server
+
+        other_class_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, other_class_path)
+        args = self.get_args(self.class_path, other_class_path)
+        self.assertEqual(
+            hs.query_server(args, "-p")["data"],
+            "%s\n%s\n" % (package, os.path.basename(other_class_path))
+        )
+        self.assertIsNot(hs.server, server)
+        self.assertFalse(server.is_alive())
+
+        # Helper without server mode will not be started again
+        args = args[:-1]
+        with patch("Javatar.core.helper_service.Logger"):
+            self.assertEqual(hs.query_server(args, "-p"), None)
+        with patch.object(HelperServer, "query") as query:
+            self.assertEqual(hs.query_server(args, "-p"), None)
+            self.assertFalse(query.called)
+
+        # Failed helper server will be tried again after its retry delay
+        retry_time = hs.server_retry_time
+        hs.server_retry_time = 0
+        with patch("Javatar.core.helper_service.Logger"):
+            self.assertEqual(hs.query_server(args, "-p"), None)
+        self.assertGreater(
+            hs.server_retry_time - retry_time, hs.SERVER_RETRY_DELAY / 2
+        )
+        hs.server_retry_time = 0
+        self.assertEqual(
+            hs.query_server(args + ["--server"], "-p")["return_code"], 0
+        )
+        self.assertEqual(hs.server_failures, 0)
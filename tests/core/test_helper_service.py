@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Javatar.core.helper_service import _HelperService
+
+
+def get_settings(key, default=None):
+    return {
+        "scan_class_paths": True
+    }.get(key, default)
+
+
+class TestHelperService(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.dependency = os.path.join(self.cache_dir, "alpha.jar")
+        open(self.dependency, "w").close()
+        self.environment = {
+            "helper_file": self.dependency,
+            "executable": "java",
+            "dependencies": [self.dependency],
+            "exclusion": []
+        }
+
+    def create_service(self):
+        hs = _HelperService()
+        hs.get_query_environment = lambda: self.environment
+        hs.get_query_cache_dir = lambda: self.cache_dir
+        return hs
+
+    @patch("sublime.encode_value", lambda value: json.dumps(value))
+    @patch("sublime.decode_value", json.loads)
+    @patch("Javatar.core.helper_service._HelperService.query_data")
+    def test_get_class_paths_for_classes(self, query_data):
+        query_data.return_value = {
+            "data": "List;java.util.List\nList;java.awt.List\n",
+            "return_code": 0
+        }
+        hs = self.create_service()
+        self.assertEqual(
+            hs.get_class_paths_for_classes(["List", "Alpha", "List"]),
+            {"List": ["java.util.List", "java.awt.List"]}
+        )
+        query_data.assert_called_once_with(
+            "-t List%sAlpha" % (os.pathsep), self.environment
+        )
+
+        # Cached results and missing classes will not be queried again
+        query_data.reset_mock()
+        query_data.return_value = {
+            "data": "Map;java.util.Map\n",
+            "return_code": 0
+        }
+        self.assertEqual(
+            hs.get_class_paths_for_classes(["Alpha", "List", "Map"]),
+            {"List": ["java.util.List", "java.awt.List"],
+             "Map": ["java.util.Map"]}
+        )
+        query_data.assert_called_once_with("-t Map", self.environment)
+
+        # Results are reused from disk
+        query_data.reset_mock()
+        hs = self.create_service()
+        self.assertEqual(hs.get_class_paths_for_classes(["Map"]), {
+            "Map": ["java.util.Map"]
+        })
+        self.assertFalse(query_data.called)
+
+        # Modified class paths will be queried again
+        os.utime(self.dependency, (0, 0))
+        hs.get_class_paths_for_classes(["Map"])
+        self.assertTrue(query_data.called)
+
+    @patch("sublime.encode_value", lambda value: json.dumps(value))
+    @patch("sublime.decode_value", json.loads)
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    @patch("Javatar.core.class_path_scanner._ClassPathScanner.get_packages")
+    @patch("Javatar.core.helper_service._HelperService.query_data")
+    def test_get_packages(self, query_data, get_packages, *_):
+        query_data.return_value = {
+            "data": "alpha\njava.util\n",
+            "return_code": 0
+        }
+        hs = self.create_service()
+
+        # Class paths are scanned without the helper
+        get_packages.return_value = ["alpha"]
+        self.assertEqual(hs.get_packages(), ["alpha"])
+        self.assertFalse(query_data.called)
+
+        # Helper is queried when class paths cannot be scanned
+        get_packages.return_value = None
+        self.assertEqual(hs.get_packages(), ["alpha", "java.util"])
+        query_data.assert_called_once_with("-p", self.environment)
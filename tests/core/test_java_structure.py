@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from Javatar.core.java_structure import _JavaStructure
+
+
+class TestJavaStructure(unittest.TestCase):
+    def create_parser(self):
+        parser = MagicMock()
+        parser.parse_grammar.return_value = {
+            "success": True,
+            "begin": 0,
+            "end": 10
+        }
+        parser.find_all.return_value = [{"name": "Node"}] * 3
+        return parser
+
+    def create_file(self, source_code):
+        java_file = tempfile.NamedTemporaryFile(
+            mode="w", suffix=".java", delete=False
+        )
+        java_file.write(source_code)
+        java_file.close()
+        self.addCleanup(os.remove, java_file.name)
+        return java_file.name
+
+    @patch("Javatar.core.settings._Settings.get", return_value=5)
+    @patch(
+        "Javatar.core.java_structure._JavaStructure.get_grammar",
+        return_value=None
+    )
+    def test_parse_file(self, *_):
+        js = _JavaStructure()
+        js.create_parser = MagicMock(side_effect=self.create_parser)
+        alpha = self.create_file("class Alpha {}")
+        bravo = self.create_file("class Bravo {}")
+
+        self.assertEqual(len(js.parse_file(alpha)), 3)
+        self.assertIs(js.parse_file(alpha), js.parse_file(alpha))
+        self.assertEqual(js.create_parser.call_count, 1)
+
+        # Changed file will be parsed again
+        with open(alpha, "a") as java_file:
+            java_file.write("\n")
+        js.parse_file(alpha)
+        self.assertEqual(js.create_parser.call_count, 2)
+
+        # Least recently used file is removed when exceeds the limit
+        js.parse_file(bravo)
+        self.assertEqual(list(js.parse_cache), [bravo])
+        self.assertEqual(js.get_parse_cache_stats(), {
+            "files": 1,
+            "nodes": 3,
+            "hits": 2,
+            "misses": 3
+        })
@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from Javatar.core.jdk_probe import _JDKProbe
+
+
+def get_settings(key, default=None):
+    return {
+        "jdk_probe_workers": 2
+    }.get(key, default)
+
+
+class TestJDKProbe(unittest.TestCase):
+    def setUp(self):
+        self.jdk_location = tempfile.mkdtemp()
+        self.cache_location = tempfile.mkdtemp()
+        self.executable = os.path.join(self.jdk_location, "java")
+        with open(self.executable, "w") as executable_file:
+            executable_file.write("java")
+
+    def tearDown(self):
+        shutil.rmtree(self.jdk_location)
+        shutil.rmtree(self.cache_location)
+
+    def create_probe(self):
+        jp = _JDKProbe()
+        jp.get_cache_path = lambda: os.path.join(
+            self.cache_location, "Javatar", "jdk_probes.json"
+        )
+        return jp
+
+    @patch("sublime.encode_value", lambda value: json.dumps(value))
+    @patch("sublime.decode_value", json.loads)
+    def test_get(self, *_):
+        probe = MagicMock(return_value={"version": "1.8.0"})
+        jp = self.create_probe()
+        self.assertEqual(
+            jp.get(self.executable, "version", probe), {"version": "1.8.0"}
+        )
+        self.assertEqual(
+            jp.get(self.executable, "version", probe), {"version": "1.8.0"}
+        )
+        self.assertEqual(probe.call_count, 1)
+        jp.save_cache()
+
+        # Next session
+        jp = self.create_probe()
+        self.assertEqual(
+            jp.get(self.executable, "version", probe), {"version": "1.8.0"}
+        )
+        self.assertEqual(probe.call_count, 1)
+
+        # Failed probes will not be cached
+        failed_probe = MagicMock(return_value=None)
+        self.assertIsNone(jp.get(self.executable, "java_home", failed_probe))
+        self.assertIsNone(jp.get(self.executable, "java_home", failed_probe))
+        self.assertEqual(failed_probe.call_count, 2)
+
+        # Changed executable will be probed again
+        with open(self.executable, "a") as executable_file:
+            executable_file.write(" 9")
+        probe.return_value = {"version": "9"}
+        self.assertEqual(
+            jp.get(self.executable, "version", probe), {"version": "9"}
+        )
+        self.assertEqual(probe.call_count, 2)
+
+        # Removed executable will be forgotten
+        os.remove(self.executable)
+        jp.save_cache()
+        self.assertEqual(self.create_probe().executables, None)
+        jp = self.create_probe()
+        jp.load_cache()
+        self.assertEqual(jp.executables, {})
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_run_probes(self, *_):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def probe(item):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            if item == 3:
+                raise ValueError("Broken JDK")
+            return item * 2
+
+        jp = self.create_probe()
+        self.assertEqual(jp.run_probes(probe, []), [])
+        self.assertEqual(
+            jp.run_probes(probe, range(6)), [0, 2, 4, None, 8, 10]
+        )
+        self.assertEqual(running[1], 2)
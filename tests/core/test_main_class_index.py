@@ -0,0 +1,78 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Javatar.core.main_class_index import _MainClassIndex
+
+
+def get_settings(key, default=None):
+    return {
+        "java_extensions": [".java"]
+    }.get(key, default)
+
+
+class TestMainClassIndex(unittest.TestCase):
+    def setUp(self):
+        self.source_folder = tempfile.mkdtemp()
+        self.cache_location = tempfile.mkdtemp()
+        self.write("Alpha.java", "class Alpha {\n  void run() {}\n}")
+        self.write(
+            "Bravo.java",
+            "class Bravo {\n  public static void main(String[] args) {}\n}"
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.source_folder)
+        shutil.rmtree(self.cache_location)
+
+    def write(self, name, content):
+        with open(os.path.join(self.source_folder, name), "w") as java_file:
+            java_file.write(content)
+
+    @patch("sublime.encode_value", lambda value: json.dumps(value))
+    @patch("sublime.decode_value", json.loads)
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    @patch("Javatar.core.settings._Settings.get_sublime", return_value=[])
+    def test_get_main_files(self, *_):
+        mci = _MainClassIndex()
+        mci.get_index_path = lambda: os.path.join(
+            self.cache_location, ".javatar-main-classes"
+        )
+        bravo = os.path.join(self.source_folder, "Bravo.java")
+        with patch.object(
+            mci, "parse_main_class", wraps=mci.parse_main_class
+        ) as parse_main_class:
+            with patch(
+                "Javatar.core.java_structure._JavaStructure.classes_in_file",
+                return_value=[{"name": "Bravo"}]
+            ), patch(
+                "Javatar.core.java_structure._JavaStructure.methods_in_class",
+                return_value=[{
+                    "name": "main", "params": [{"type": "String[]"}]
+                }]
+            ) as methods_in_class:
+                self.assertEqual(
+                    mci.get_main_files([self.source_folder]), [bravo]
+                )
+                # Alpha is ruled out without parsing
+                self.assertEqual(methods_in_class.call_count, 1)
+            self.assertEqual(parse_main_class.call_count, 2)
+
+            # Reloaded from the index file without parsing
+            mci = _MainClassIndex()
+            mci.get_index_path = lambda: os.path.join(
+                self.cache_location, ".javatar-main-classes"
+            )
+            mci.parse_main_class = parse_main_class
+            self.assertEqual(
+                mci.get_main_files([self.source_folder]), [bravo]
+            )
+            self.assertEqual(parse_main_class.call_count, 2)
+
+        os.remove(bravo)
+        self.assertEqual(mci.get_main_files([self.source_folder]), [])
+        self.assertEqual(list(mci.files), [
+            os.path.join(self.source_folder, "Alpha.java")
+        ])
@@ -0,0 +1,91 @@
+import sys
+import threading
+import unittest
+from unittest.mock import patch
+from Javatar.core.process_runner import ProcessRunner
+
+
+def get_settings(key, default=None):
+    return {
+        "encoding": "utf-8",
+        "encoding_handle": "strict"
+    }.get(key, default)
+
+
+class TestProcessRunner(unittest.TestCase):
+    @patch("sys.platform", "linux")
+    def test_split_command(self):
+        self.assertEqual(
+            ProcessRunner.split_command("java -cp 'lib dir' Main"),
+            (["java", "-cp", "lib dir", "Main"], False)
+        )
+        for command in ["ls *.java", "echo $HOME", "a && b", "A=1 java"]:
+            self.assertEqual(
+                ProcessRunner.split_command(command),
+                (["/bin/bash", "-c", command], False)
+            )
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_run(self, *_):
+        chunks = []
+        threads = set()
+
+        def on_data(data):
+            chunks.append(data)
+            threads.add(threading.current_thread())
+
+        result = ProcessRunner(
+            [
+                sys.executable, "-c",
+                "import os, sys; print(os.environ['JAVATAR_TEST']); " +
+                "print(os.environ.get('HOME')); sys.exit(3)"
+            ],
+            env={"JAVATAR_TEST": "alpha bravo", "HOME": None}
+        ).run(on_data)
+        self.assertEqual(result.data, "alpha bravo\nNone\n")
+        self.assertEqual("".join(chunks), result.data)
+        # Output is handled on the waiting thread, not the reactor thread
+        self.assertEqual(threads, set([threading.current_thread()]))
+        self.assertEqual(result.return_code, 3)
+        self.assertFalse(result.is_success())
+        self.assertEqual(result.to_dict(), {
+            "elapse_time": result.elapse_time,
+            "data": "alpha bravo\nNone\n",
+            "return_code": 3
+        })
+
+        result = ProcessRunner(["javatar-missing-executable"]).run()
+        self.assertIsNone(result.return_code)
+        self.assertIsNotNone(result.error)
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_timeout(self, *_):
+        result = ProcessRunner(
+            [sys.executable, "-c", "import time; time.sleep(10)"],
+            timeout=0.2
+        ).run()
+        self.assertTrue(result.timed_out)
+        self.assertLess(result.elapse_time, 5)
+        self.assertNotEqual(result.return_code, 0)
+
+    @patch("Javatar.core.settings._Settings.get", side_effect=get_settings)
+    def test_cancel(self, *_):
+        started = threading.Event()
+        runner = ProcessRunner([
+            sys.executable, "-c",
+            "import sys, time; sys.stdout.write('started\\n'); " +
+            "sys.stdout.flush(); time.sleep(10)"
+        ])
+        thread = threading.Thread(
+            target=lambda: started.wait(10) and runner.cancel()
+        )
+        thread.start()
+        result = runner.run(lambda data: started.set())
+        thread.join(10)
+        self.assertTrue(result.cancelled)
+        self.assertLess(result.elapse_time, 5)
+        self.assertEqual(result.data, "started\n")
+
+        result = runner.run()
+        self.assertTrue(result.cancelled)
+        self.assertIsNone(result.return_code)
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Javatar.core.project_index import _ProjectIndex
+
+
+class TestProjectIndex(unittest.TestCase):
+    def setUp(self):
+        self.source_folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source_folder)
+
+    def create_file(self, *parts):
+        file_path = os.path.join(self.source_folder, *parts)
+        if not os.path.isdir(os.path.dirname(file_path)):
+            os.makedirs(os.path.dirname(file_path))
+        open(file_path, "w").close()
+
+    @patch("Javatar.core.project_index._ProjectIndex.save_index")
+    @patch("Javatar.core.project_index._ProjectIndex.get_index_path")
+    @patch("Javatar.core.state_property._StateProperty.get_source_folders")
+    def test_get_class_paths_for_classes(self, get_source_folders,
+                                         get_index_path, save_index):
+        get_source_folders.return_value = [self.source_folder]
+        get_index_path.return_value = os.path.join(
+            self.source_folder, ".javatar-index"
+        )
+        self.create_file("Alpha.java")
+        self.create_file("alpha", "bravo", "Alpha.java")
+        self.create_file("alpha", "bravo", "Charlie.txt")
+
+        pi = _ProjectIndex()
+        pi.update_index()
+        self.assertEqual(
+            pi.get_class_paths_for_classes(["Alpha", "Charlie"]),
+            {"Alpha": ["Alpha", "alpha.bravo.Alpha"]}
+        )
+        self.assertEqual(save_index.call_count, 1)
+
+        # Unchanged directories will not be listed again
+        with patch.object(pi, "index_directory") as index_directory:
+            pi.update_index()
+            self.assertFalse(index_directory.called)
+        self.assertEqual(save_index.call_count, 1)
+
+        self.create_file("alpha", "Charlie.java")
+        shutil.rmtree(os.path.join(self.source_folder, "alpha", "bravo"))
+        pi.update_index()
+        self.assertEqual(
+            pi.get_class_paths_for_classes(["Alpha", "Charlie"]),
+            {"Alpha": ["Alpha"], "Charlie": ["alpha.Charlie"]}
+        )
+        self.assertEqual(save_index.call_count, 2)
+
+    @patch("Javatar.core.project_index._ProjectIndex.get_index_path")
+    def test_refresh_index(self, get_index_path):
+        get_index_path.return_value = os.path.join(
+            self.source_folder, ".javatar-index"
+        )
+        pi = _ProjectIndex()
+        pi.classes = {"Alpha": ["alpha.Alpha"]}
+        pi.index_path = get_index_path.return_value
+
+        # Lookups are served from the loaded index and refresh it in
+        #     background at most once per refresh interval
+        with patch.object(pi, "build_index") as build_index, \
+                patch.object(pi, "update_folder") as update_folder:
+            for _ in range(3):
+                self.assertEqual(
+                    pi.get_class_paths_for_classes(["Alpha"]),
+                    {"Alpha": ["alpha.Alpha"]}
+                )
+            self.assertEqual(build_index.call_count, 1)
+            self.assertFalse(update_folder.called)
+
+            # Save during the refresh will refresh it again
+            pi.refresh_index(force=True)
+            self.assertEqual(build_index.call_count, 1)
+            with patch.object(pi, "update_index"):
+                pi.run_refresh()
+            self.assertEqual(build_index.call_count, 2)
+            with patch.object(pi, "update_index"):
+                pi.run_refresh()
+            pi.refresh_index()
+            self.assertEqual(build_index.call_count, 2)
@@ -0,0 +1,160 @@
+import unittest
+from Javatar.parser.GrammarParser import CompiledGrammar, GrammarParser
+
+
+class TestGrammarParser(unittest.TestCase):
+    def get_grammar(self):
+        return {
+            "separator": {
+                "match": "\\s+",
+                "optional": True
+            },
+            "compilation_unit": {
+                "name": "Unit",
+                "parse": [
+                    {
+                        "include": "Statement",
+                        "multiple": True
+                    }
+                ]
+            },
+            "repository": {
+                "Statement": {
+                    "name": "Statement",
+                    "parse_any": [
+                        {
+                            "include": "Comment"
+                        },
+                        {
+                            "parse": [
+                                {
+                                    "include": "Keyword"
+                                },
+                                {
+                                    "include": "Identifier"
+                                },
+                                {
+                                    "match": ";"
+                                }
+                            ]
+                        },
+                        {
+                            "parse": [
+                                {
+                                    "include": "Identifier"
+                                },
+                                {
+                                    "match": ";"
+                                }
+                            ]
+                        }
+                    ]
+                },
+                "Comment": {
+                    "name": "Comment",
+                    "parse": [
+                        {
+                            "match": "/\\*",
+                            "after_separator": False
+                        },
+                        {
+                            "match": "(\\*(?!/)|[^*](?<!\\*/))*",
+                            "before_separator": False,
+                            "after_separator": False
+                        },
+                        {
+                            "match": "\\*/",
+                            "before_separator": False
+                        }
+                    ]
+                },
+                "Keyword": {
+                    "name": "Keyword",
+                    "match": "\\bint\\b"
+                },
+                "Identifier": {
+                    "name": "Identifier",
+                    "match": "[a-z]+"
+                }
+            }
+        }
+
+    def parse(self, data, packrat=False):
+        parser = GrammarParser(self.get_grammar(), packrat=packrat)
+        return parser, parser.parse_grammar(data)
+
+    def test_parse(self):
+        parser, output = self.parse("int alpha; bravo;")
+        self.assertEqual(output, {"success": True, "begin": 0, "end": 17})
+        self.assertEqual(
+            [node["value"] for node in parser.find_by_selector("@Keyword")],
+            ["int"]
+        )
+        self.assertEqual(
+            [node["value"] for node in parser.find_by_selector("@Identifier")],
+            ["alpha", "bravo"]
+        )
+
+    def test_match_pattern_in_place(self):
+        parser, _ = self.parse("alpha;")
+        parser.data = "alphaint bravo"
+        # Boundary at matching position does not depends on previous data
+        self.assertEqual(parser.match_pattern("\\bint\\b", 5), 8)
+        self.assertEqual(parser.match_pattern("\\bint\\b", 4), None)
+        self.assertEqual(parser.match_pattern("[a-z]+", 9), 14)
+        self.assertEqual(parser.match_pattern("^bravo", 9), 14)
+        self.assertEqual(parser.match_pattern("(?<!a)int", 5), 8)
+
+    def test_compile_pattern_once(self):
+        parser, _ = self.parse("alpha; bravo; charlie;")
+        self.assertIn("[a-z]+", parser.re_cache)
+        re_pattern = parser.re_cache["[a-z]+"]
+        parser.parse_grammar("delta;")
+        self.assertIs(parser.re_cache["[a-z]+"], re_pattern)
+
+    def test_lookbehind_comment(self):
+        parser, output = self.parse("/*/ alpha */ bravo;")
+        self.assertEqual(output, {"success": True, "begin": 0, "end": 19})
+        self.assertEqual(
+            [node["value"] for node in parser.find_by_selector("@Comment")],
+            ["/*/ alpha */"]
+        )
+
+    def test_long_repetition(self):
+        data = "alpha; " * 5000
+        parser, output = self.parse(data)
+        self.assertTrue(output["success"])
+        self.assertEqual(output["end"], len(data))
+        self.assertEqual(len(parser.find_by_selector("@Statement")), 5000)
+
+    def test_packrat(self):
+        data = "int alpha; bravo; /* charlie */ int delta;" * 10
+        parser, output = self.parse(data)
+        packrat_parser, packrat_output = self.parse(data, packrat=True)
+        self.assertEqual(output, packrat_output)
+        self.assertEqual(parser.find_all(), packrat_parser.find_all())
+        self.assertGreater(packrat_parser.get_memo_stats()["hits"], 0)
+        self.assertEqual(packrat_parser.get_memo_stats()["size"], 0)
+
+    def test_compiled_grammar(self):
+        grammar = self.get_grammar()
+        grammar["repository"]["Unknown"] = {"include": "Missing"}
+        grammar["repository"]["Statement"]["parse_any"].append({
+            "include": "Unknown"
+        })
+        compiled_grammar = CompiledGrammar(grammar)
+        self.assertIn("\\bint\\b", compiled_grammar.re_cache)
+        self.assertIs(
+            compiled_grammar.get_rule("Keyword"),
+            grammar["repository"]["Keyword"]
+        )
+        self.assertEqual(compiled_grammar.get_rule("Missing"), None)
+        self.assertEqual(compiled_grammar.unresolved_rules, ["Missing"])
+
+        parser = GrammarParser(compiled_grammar)
+        other_parser = GrammarParser(compiled_grammar)
+        self.assertIs(parser.re_cache, other_parser.re_cache)
+        self.assertEqual(
+            parser.parse_grammar("int alpha;"),
+            other_parser.parse_grammar("int alpha;")
+        )
@@ -1,10 +1,13 @@
 import threading
 import shlex
+import tempfile
 from os.path import isdir, isfile
-from os import makedirs, pathsep
+from os import makedirs, pathsep, remove
+from time import time
 from ..core import (
     DependencyManager,
-    GenericSilentShell,
+    DiagnosticParser,
+    ProcessRunner,
     Settings,
     StateProperty
 )
@@ -13,23 +16,28 @@ from ..core import (
 class BuilderThread(threading.Thread):
 
     """
-    A thread to build Java source code files
+    A thread to build Java source code files from a build scheduler
     """
 
-    def __init__(self, controller, files=None, macro_data=None, params=None):
-        self.files = files or []
-        self.total_files = len(self.files)
+    def __init__(self, scheduler, macro_data=None, index=0):
+        """
+        @param scheduler: a build scheduler to get the file batches from
+        @param macro_data: a macro data
+        @param index: an index of the builder within the scheduler, each
+            index uses its own compile server
+        """
+        self.scheduler = scheduler
         self.macro_data = macro_data or {}
-        self.params = params
-        self.controller = controller
+        self.index = index
         self.running = True
-        self.builds = 0
+        self.runner = None
+        self.proc_lock = threading.Lock()
         threading.Thread.__init__(self)
-        self.start()
 
-    def run(self):
+    def get_build_args(self):
         """
-        Build the specified files
+        Returns a list of build command arguments without the source files,
+            or None if the files cannot be built
         """
         from ..core import JDKManager, Macro
         sourcepath = pathsep.join(StateProperty().get_source_folders())
@@ -43,62 +51,162 @@ class BuilderThread(threading.Thread):
 
         executable = JDKManager().get_executable("build")
         if not executable:
-            return
+            return None
 
-        build_script = "%s -sourcepath %s -classpath %s" % (
-            shlex.quote(executable),
-            shlex.quote(sourcepath),
-            shlex.quote(classpath)
-        )
+        build_args = [
+            executable,
+            "-sourcepath", sourcepath,
+            "-classpath", classpath
+        ]
         if output_location:
             if isfile(output_location):
-                return
+                return None
             elif not isdir(output_location):
                 try:
                     makedirs(output_location)
                 except:
                     pass
-            build_script += " -d %s" % (shlex.quote(output_location))
-
-        while self.running and self.files:
-            self.builds += 1
-            parallel_builds = Settings().get("parallel_builds")
-            if parallel_builds > 0:
-                files = self.files[:parallel_builds]
-                self.files = self.files[parallel_builds:]
-            else:
-                files = self.files
-                self.files = []
-            file_list = " ".join([
-                shlex.quote(filename) for filename in files
-            ])
-            actual_build_script = build_script + " %s" % (file_list)
-            build_args = Settings().get("build_arguments", "")
-            if build_args:
-                actual_build_script += " " + build_args
-
-            shell = GenericSilentShell(
-                actual_build_script,
-                lambda elapse_time, data, ret, params: self.on_build_done(
-                    len(files), elapse_time, data, ret
-                )
+            build_args += ["-d", output_location]
+        return build_args
+
+    def get_compile_server_args(self):
+        """
+        Returns a list of arguments to start a compile server, or None if
+            compile server is not specified
+        """
+        from ..core import JDKManager, Macro
+        server_args = Settings().get("compile_server")
+        if not server_args:
+            return None
+        macros = Macro().get({
+            "java": JDKManager().get_executable("run") or "",
+            "javac": JDKManager().get_executable("build") or ""
+        })
+        return [Macro().parse(arg, macros) for arg in server_args]
+
+    def compile(self, build_args, server_args, files):
+        """
+        Builds the specified files and returns a tuple of output and
+            return code
+
+        @param build_args: a list of build command arguments
+        @param server_args: a list of arguments to start a compile server
+        @param files: a list of file paths
+        """
+        from ..core import CompileServer, Macro
+        extra_args = Settings().get("build_arguments", "")
+        build_location = Macro().parse(Settings().get("build_location"))
+        if server_args:
+            output_location = None
+            if "-d" in build_args:
+                output_location = build_args[build_args.index("-d") + 1]
+            output = CompileServer().compile(
+                server_args,
+                build_args[1:] + files + shlex.split(extra_args),
+                output_location,
+                build_location or None,
+                self.index
             )
-            shell.set_cwd(Macro().parse(Settings().get("build_location")))
-            shell.start()
-        while self.running and self.builds > 0:
-            pass
+            if output is not None:
+                parser = DiagnosticParser()
+                self.scheduler.on_batch_output(
+                    files,
+                    parser.feed(output["data"] or "") + parser.close()
+                )
+                return (output["data"], output["return_code"])
 
-    def on_build_done(self, total_files, elapse_time, data, ret):
+        argument_file = self.write_argument_file(build_args[1:] + files)
+        try:
+            with self.proc_lock:
+                if not self.running:
+                    return (None, None)
+                self.runner = ProcessRunner(
+                    self.get_compile_args(
+                        build_args, argument_file, extra_args
+                    ),
+                    cwd=build_location
+                )
+            parser = DiagnosticParser()
+
+            def on_data(data):
+                records = parser.feed(data)
+                if records:
+                    self.scheduler.on_batch_output(files, records)
+
+            result = self.runner.run(on_data)
+            if result.error:
+                on_data(result.error + "\n")
+            records = parser.close()
+            if records:
+                self.scheduler.on_batch_output(files, records)
+        finally:
+            try:
+                remove(argument_file)
+            except OSError:
+                pass
+        if result.error:
+            return (result.error, result.return_code)
+        return (result.data, result.return_code)
+
+    def get_compile_args(self, build_args, argument_file, extra_args=""):
         """
-        Report the build result to the main builder controller
+        Returns a list of arguments to run the compiler with an argument file
+
+        @param build_args: a list of build command arguments
+        @param argument_file: a path to an argument file
+        @param extra_args: a string of additional build arguments
         """
-        self.builds -= 1
-        self.controller.on_builder_complete(
-            total_files, elapse_time, data, ret, self.params
+        return (
+            [build_args[0], "@" + argument_file] + shlex.split(extra_args)
         )
 
+    def write_argument_file(self, args):
+        """
+        Writes the specified arguments to a temporary argument file and
+            returns its path
+
+        Argument file keeps the build command short regardless of the number
+            of files, it must be removed after the build
+
+        @param args: a list of compiler arguments
+        """
+        with tempfile.NamedTemporaryFile(
+                mode="w", prefix="javatar-", suffix=".args", delete=False
+        ) as argument_file:
+            for arg in args:
+                argument_file.write("\"%s\"\n" % (
+                    arg.replace("\\", "\\\\").replace("\"", "\\\"")
+                ))
+        return argument_file.name
+
+    def run(self):
+        """
+        Build the file batches from the scheduler until no batch left
+        """
+        build_args = self.get_build_args()
+        if not build_args:
+            return
+        server_args = self.get_compile_server_args()
+
+        while self.running:
+            files = self.scheduler.next_batch()
+            if files is None:
+                break
+            start_time = time()
+            data, ret = self.compile(build_args, server_args, files)
+            if not self.running and ret is None:
+                break
+            self.scheduler.on_batch_complete(
+                files, time() - start_time, data, ret
+            )
+
     def cancel(self):
         """
         Cancel the build process
         """
-        self.running = False
+        from ..core import CompileServer
+        with self.proc_lock:
+            self.running = False
+            if self.runner:
+                self.runner.cancel()
+        CompileServer().cancel(self.index)
@@ -1,12 +1,11 @@
 import sublime
 import os
 import threading
-import shlex
 from ..core import (
     ActionHistory,
-    GenericBlockShell,
     JavatarDict,
     Logger,
+    ProcessRunner,
     RE,
     Settings
 )
@@ -45,10 +44,25 @@ class JDKDetectorThread(threading.Thread):
                 elif not output_version:
                     output_version = version
             return output_version
+        from ..core import JDKProbe
         executable = os.path.join(path, executable)
-        output = GenericBlockShell().run(shlex.quote(executable) + " -version")
-        if output["data"]:
-            match = RE().search("java_version_match", output["data"])
+        return JDKProbe().get(
+            executable, "version", lambda: cls.probe_jdk_version(executable)
+        )
+
+    @classmethod
+    def probe_jdk_version(cls, executable):
+        """
+        Runs a specified executable and returns its version
+
+        @param executable: a Java executable path
+        """
+        result = ProcessRunner(
+            [executable, "-version"],
+            timeout=Settings().get("jdk_probe_timeout")
+        ).run()
+        if result.data:
+            match = RE().search("java_version_match", result.data)
             if match:
                 version = {}
                 if match.lastindex > 0:
@@ -105,18 +119,33 @@ class JDKDetectorThread(threading.Thread):
         exes = Settings().get("java_executables")
         if "script" not in exes:
             return None
+        from ..core import JDKProbe
         executable = os.path.join(path, exes["script"])
+        return JDKProbe().get(
+            executable,
+            "java_home",
+            lambda: self.probe_java_home(executable, path)
+        )
+
+    def probe_java_home(self, executable, path=None):
+        """
+        Runs a specified script executable and returns the Java home
+            directory
+
+        @param executable: a Java script executable path
+        @param path: a path to Java executable files
+        """
         gather_script = (
             "java.lang.System.out.println(" +
             "java.lang.System.getProperty(\"java.home\"));"
         )
-        output = GenericBlockShell().run((
-            shlex.quote(executable) +
-            " -e " +
-            shlex.quote(gather_script)
-        ))
-        if output["data"] and os.path.exists(output["data"]):
-            return output["data"]
+        result = ProcessRunner(
+            [executable, "-e", gather_script],
+            timeout=Settings().get("jdk_probe_timeout")
+        ).run()
+        java_home = (result.data or "").strip()
+        if java_home and os.path.exists(java_home):
+            return java_home
         if path:
             # Move one level up, so we ends up on the JDK root directory
             return self.find_java_home(os.path.dirname(path))
@@ -156,32 +185,69 @@ class JDKDetectorThread(threading.Thread):
             v += "u" + jdk["update"]
         return v
 
+    def find_jdk_paths(self, path, depth=None):
+        """
+        Find all subfolder of specified path and returns a list of JDK
+            executable directories
+
+        @param path: a path to find
+        @param depth: a maximum depth of subfolders to find
+        """
+        if depth is None:
+            depth = Settings().get("jdk_detection_depth", 5)
+        if depth <= 0:
+            return []
+        jdk_paths = []
+        try:
+            names = os.listdir(path)
+        except OSError:
+            return []
+        for name in names:
+            path_name = os.path.join(path, name)
+            if os.path.isdir(path_name):
+                if self.is_jdk_path(path_name):
+                    jdk_paths.append(path_name)
+                jdk_paths += self.find_jdk_paths(path_name, depth - 1)
+        return jdk_paths
+
+    def probe_jdk(self, path):
+        """
+        Returns a JDK dict of a specified JDK executable directory, or None
+            if it is not a working JDK
+
+        @param path: a JDK executable directory
+        """
+        version = self.get_jdk_version(path)
+        if not version:
+            return None
+        java_home = self.get_java_home(path)
+        if not java_home:
+            return None
+        jdk = {
+            "bin": path,
+            "home": java_home,
+            "version": version["version"]
+        }
+        if "update" in version:
+            jdk["update"] = version["update"]
+        return jdk
+
     def find_jdk_dirs(self, path):
         """
         Find all subfolder of specified path and returns all JDK installation
             directories
 
+        JDKs will be probed in parallel, results are cached across sessions
+            until the JDK executables are changed
+
         @param path: a path to find
         """
+        from ..core import JDKProbe
         jdk_dirs = {}
-        for name in os.listdir(path):
-            path_name = os.path.join(path, name)
-            if os.path.isdir(path_name):
-                if self.is_jdk_path(path_name):
-                    version = self.get_jdk_version(path_name)
-                    java_home = self.get_java_home(path_name)
-                    if version and java_home:
-                        jdk = {
-                            "bin": path_name,
-                            "home": java_home,
-                            "version": version["version"]
-                        }
-                        if "update" in version:
-                            jdk["update"] = version["update"]
-                        jdk_dirs[self.to_readable_version(version)] = jdk
-                dirs = self.find_jdk_dirs(path_name)
-                for key in dirs:
-                    jdk_dirs[key] = dirs[key]
+        jdk_paths = self.find_jdk_paths(path)
+        for jdk in JDKProbe().run_probes(self.probe_jdk, jdk_paths):
+            if jdk:
+                jdk_dirs[self.to_readable_version(jdk)] = jdk
         return jdk_dirs
 
     def get_latest_jdk(self, jdks):
@@ -279,8 +345,10 @@ class JDKDetectorThread(threading.Thread):
         """
         Detect and update the JDK versions for projects
         """
+        from ..core import JDKProbe
         try:
             jdks = self.verify_jdks()
+            JDKProbe().save_cache()
             if jdks and jdks.get_dict():
                 if jdks.is_global_change():
                     Settings().set("jdk_version", jdks.get_global_dict(), True)
@@ -5,7 +5,9 @@ from ..core import (
     HelperService,
     JDKManager,
     Logger,
+    MainClassIndex,
     PluginManager,
+    ProjectIndex,
     ProjectRestoration,
     Settings,
     SnippetsManager,
@@ -103,6 +105,8 @@ class Constant:
         JavatarMenu
         JavatarProjectRestoration
         PluginManager().load_plugins()
+        ProjectIndex().startup()
+        MainClassIndex().startup()
 
     @staticmethod
     def check_upgrade():